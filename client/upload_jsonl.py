@@ -44,13 +44,16 @@ def get_info(directory_of_files, language, task):
             dataset[split_name]._info.languages = [language]
 
             raw_features = asdict(dataset[split_name]._info)["features"]
-            dataset[split_name] = dataset[split_name].apply(
-                tokenize, num_proc=multiprocessing.cpu_count(), mode="memory"
-            )
-            dataset[split_name] = dataset[split_name].apply(
-                text_classification_func,
-                num_proc=multiprocessing.cpu_count(),
+            # tokenize, featurize and calculate dataset-level features in one scan
+            dataset[split_name] = dataset[split_name].apply_pipeline(
+                [
+                    tokenize,
+                    text_classification_func,
+                    get_features_dataset_level_text_classification,
+                ],
                 mode="memory",
+                prefix=["", "", "avg"],
+                num_proc=multiprocessing.cpu_count(),
             )
 
             all_features = asdict(dataset[split_name]._info)["features"]
@@ -69,12 +72,6 @@ def get_info(directory_of_files, language, task):
                     feature_info["is_bucket"] = True
 
             features_mongodb.update(all_features)
-            # calculate dataset-level features
-            dataset[split_name] = dataset[split_name].apply(
-                get_features_dataset_level_text_classification,
-                mode="memory",
-                prefix="avg",
-            )
 
             features_dataset = get_features_dataset(dataset[split_name]._stat)
             for attr, feat_info in features_dataset.items():
@@ -59,10 +59,13 @@ from datalabs import config, utils
 from datalabs.arrow_reader import ArrowReader
 from datalabs.arrow_writer import ArrowWriter, OptimizedTypedSequence
 from datalabs.features import _ArrayXD, ClassLabel, Features, Sequence, Value
+from datalabs.features.features import get_nested_type
 from datalabs.filesystems import extract_path_from_uri, is_remote_filesystem
 from datalabs.fingerprint import (
     fingerprint_transform,
+    generate_augment_fingerprint,
     generate_fingerprint,
+    generate_operation_fingerprint,
     generate_random_fingerprint,
     get_temporary_cache_files_directory,
     is_caching_enabled,
@@ -77,6 +80,12 @@ from datalabs.formatting import (
 )
 from datalabs.info import DatasetInfo, MongoDBClient
 from datalabs.operations.data import TextData
+from datalabs.operations.executor import get_executor
+from datalabs.operations.operation import (
+    COLUMNS_OPERATION,
+    PER_SAMPLE_OPERATIONS,
+    STATISTICS_OPERATION,
+)
 from datalabs.search import IndexableMixin
 from datalabs.splits import NamedSplit, Split
 from datalabs.table import (
@@ -94,6 +103,13 @@ from datalabs.utils import logging
 from datalabs.utils.deprecation_utils import deprecated
 from datalabs.utils.file_utils import estimate_dataset_size
 from datalabs.utils.info_utils import is_small_dataset
+from datalabs.utils.profiling import (
+    OperationProfiler,
+    profile_iter,
+    profile_phase,
+    PROFILE_STAT_KEY,
+    write_profile_records,
+)
 from datalabs.utils.typing import PathLike
 
 # import tqdm
@@ -703,6 +719,361 @@ def _check_table(table) -> Table:
         )
 
 
+def _combine_chunks(column: pa.ChunkedArray) -> pa.Array:
+    """Turn a chunked column into a single contiguous array."""
+    if column.num_chunks == 1:
+        return column.chunk(0)
+    if column.num_chunks == 0:
+        return pa.array([], type=column.type)
+    return pa.concat_arrays(column.chunks)
+
+
+def _column_to_list(column) -> list:
+    if isinstance(column, (pa.Array, pa.ChunkedArray)):
+        return column.to_pylist()
+    if isinstance(column, np.ndarray):
+        return column.tolist()
+    return list(column)
+
+
+def _merge_column_chunks(chunks: list):
+    """Merge the per-batch outputs of an operation into one column, keeping
+    pyarrow and numpy outputs zero-copy where possible."""
+    if all(isinstance(chunk, (pa.Array, pa.ChunkedArray)) for chunk in chunks):
+        arrays = []
+        for chunk in chunks:
+            arrays.extend(
+                chunk.chunks if isinstance(chunk, pa.ChunkedArray) else [chunk]
+            )
+        return pa.chunked_array(arrays)
+    if all(isinstance(chunk, np.ndarray) for chunk in chunks):
+        return np.concatenate(chunks)
+    column = []
+    for chunk in chunks:
+        column.extend(_column_to_list(chunk))
+    return column
+
+
+def _rows_to_columns(rows: List[dict]) -> Dict[str, list]:
+    """Turn the per-sample outputs of an operation into columns."""
+    if len(rows) == 0:
+        return {}
+    return {attr_name: [row[attr_name] for row in rows] for attr_name in rows[0]}
+
+
+def _check_outputs(func, names, features: Features):
+    if set(names) != set(features):
+        raise ValueError(
+            f"Operation {func.name} generated the columns {sorted(names)}, but "
+            f"declares the outputs {sorted(features)}"
+        )
+
+
+def _rows_to_arrays(func, rows: List[dict]) -> Dict[str, pa.Array]:
+    """Turn the per-sample outputs of an operation into arrays of the types of
+    its declared ``outputs``, appended to typed builders without intermediate
+    lists."""
+    if len(rows) > 0:
+        _check_outputs(func, rows[0], func.outputs)
+    return {
+        name: pa.array(
+            (row[name] for row in rows), type=get_nested_type(feature), size=len(rows)
+        )
+        for name, feature in func.outputs.items()
+    }
+
+
+def _columns_to_arrays(func, columns: Dict[str, Any]) -> Dict[str, pa.Array]:
+    """Convert the columns generated by a batched operation to the types of its
+    declared ``outputs``."""
+    _check_outputs(func, columns, func.outputs)
+    arrays = {}
+    for name, feature in func.outputs.items():
+        column, pa_type = columns[name], get_nested_type(feature)
+        if isinstance(column, pa.ChunkedArray):
+            column = _combine_chunks(column)
+        if not isinstance(column, pa.Array):
+            column = pa.array(column, type=pa_type)
+        arrays[name] = column if column.type == pa_type else column.cast(pa_type)
+    return arrays
+
+
+def _declared_features(ops) -> Features:
+    """The features declared by the ``outputs`` of ``(operation, prefix)`` pairs,
+    named as their generated columns."""
+    features = Features()
+    for func, prefix in ops:
+        if not isinstance(func, str) and func.outputs is not None:
+            features.update(func.output_features(prefix))
+    return features
+
+
+class _ColumnBatch:
+    """A chunk of columns shared by the operations of a pipeline.
+
+    Columns are converted between pyarrow arrays and python lists on demand
+    and the conversions are kept, so that each column of a chunk is decoded
+    at most once whatever the number of operations reading it.
+    """
+
+    def __init__(self, columns: Dict[str, Any]):
+        self._columns = dict(columns)
+        self._python = {}
+        self._rows = None
+
+    def __len__(self):
+        return len(next(iter(self._columns.values()))) if self._columns else 0
+
+    def column(self, name: str, batch_format: str = "python"):
+        column = self._columns[name]
+        if batch_format == "arrow":
+            if not isinstance(column, (pa.Array, pa.ChunkedArray)):
+                column = pa.array(self.column(name))
+                self._columns[name] = column
+            return column
+        if name not in self._python:
+            self._python[name] = _column_to_list(column)
+        return self._python[name]
+
+    def columns(self, batch_format: str = "python") -> Dict[str, Any]:
+        return {name: self.column(name, batch_format) for name in self._columns}
+
+    def rows(self) -> List[dict]:
+        if self._rows is None:
+            columns = self.columns()
+            self._rows = [
+                dict(zip(columns.keys(), values)) for values in zip(*columns.values())
+            ]
+        return self._rows
+
+    def update(self, name: str, column):
+        self._columns[name] = column
+        self._python.pop(name, None)
+        if self._rows is not None:
+            for row, value in zip(self._rows, self.column(name)):
+                row[name] = value
+
+
+def _json_default(obj):
+    if isinstance(obj, np.generic):
+        return obj.item()
+    if isinstance(obj, np.ndarray):
+        return obj.tolist()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def _write_json_cache_file(result: dict, cache_file_name: str):
+    """Cache the statistics computed by an aggregating operation. Statistics that
+    can't be serialized to JSON are not cached."""
+    tmp_file = tempfile.NamedTemporaryFile(
+        "w", dir=os.path.dirname(cache_file_name), delete=False
+    )
+    try:
+        with tmp_file:
+            json.dump(result, tmp_file, default=_json_default)
+    except (TypeError, ValueError) as err:
+        logger.info(f"Statistics can't be cached: {err}")
+        os.remove(tmp_file.name)
+        return
+    shutil.move(tmp_file.name, cache_file_name)
+
+
+def _promote_type(type_a: pa.DataType, type_b: pa.DataType) -> pa.DataType:
+    if type_a == type_b or pa.types.is_null(type_b):
+        return type_a
+    if pa.types.is_null(type_a):
+        return type_b
+    if all(pa.types.is_integer(t) or pa.types.is_floating(t) for t in [type_a, type_b]):
+        return pa.float64()
+    if pa.types.is_list(type_a) and pa.types.is_list(type_b):
+        return pa.list_(_promote_type(type_a.value_type, type_b.value_type))
+    raise ValueError(f"Can't write values of types {type_a} and {type_b} together")
+
+
+def _promote_schema(schema: pa.Schema, other: pa.Schema) -> pa.Schema:
+    """Schema that can hold the values of both schemas (same column names)."""
+    return pa.schema(
+        [
+            pa.field(
+                field.name, _promote_type(field.type, other.field(field.name).type)
+            )
+            for field in schema
+        ]
+    )
+
+
+class _ColumnsFileWriter:
+    """Stream chunks of generated columns to an Arrow file.
+
+    The schema is inferred from the first chunk. If a later chunk needs a
+    wider schema (e.g. a column that was all None so far, or ints followed by
+    floats), what was written so far is copied to a new file with the wider
+    schema. The declared ``features`` of the columns matching their type are
+    stored in the metadata of the file.
+    """
+
+    def __init__(
+        self,
+        cache_file_name,
+        writer_batch_size=None,
+        fingerprint=None,
+        features: Optional[Features] = None,
+    ):
+        self.cache_file_name = cache_file_name
+        self.writer_batch_size = writer_batch_size
+        self.fingerprint = fingerprint
+        self.features = features
+        self.schema: Optional[pa.Schema] = None
+        self._tmp_file = None
+        self._writer = None
+
+    def _open(self, schema: pa.Schema):
+        self._tmp_file = tempfile.NamedTemporaryFile(
+            "wb", dir=os.path.dirname(self.cache_file_name), delete=False
+        )
+        self._writer = ArrowWriter(
+            path=self._tmp_file.name,
+            writer_batch_size=self.writer_batch_size,
+            fingerprint=self.fingerprint,
+            features=self.features,
+            update_features=self.features is not None,
+        )
+        self.schema = schema
+
+    def _close(self):
+        self._writer.finalize()
+        self._tmp_file.close()
+        return self._tmp_file.name
+
+    def _widen(self, schema: pa.Schema):
+        written = self._close()
+        self._open(schema)
+        with pa.memory_map(written) as source:
+            for batch in pa.ipc.open_stream(source):
+                self._writer.write_table(pa.Table.from_batches([batch]).cast(schema))
+        os.remove(written)
+
+    def write(self, columns: Dict[str, Any]):
+        pa_table = InMemoryTable.from_pydict(columns).table
+        if self.schema is None:
+            self._open(pa_table.schema)
+        else:
+            pa_table = pa_table.select(self.schema.names)
+            if pa_table.schema != self.schema:
+                schema = _promote_schema(self.schema, pa_table.schema)
+                if schema != self.schema:
+                    self._widen(schema)
+                pa_table = pa_table.cast(self.schema)
+        self._writer.write_table(pa_table)
+
+    def finalize(self) -> Optional[Table]:
+        """Move the written file to its final location and return it
+        memory-mapped, or None if nothing was written."""
+        if self.schema is None:
+            return None
+        shutil.move(self._close(), self.cache_file_name)
+        return MemoryMappedTable.from_file(self.cache_file_name)
+
+    def discard(self):
+        if self._tmp_file is not None:
+            self._tmp_file.close()
+            if os.path.exists(self._tmp_file.name):
+                os.remove(self._tmp_file.name)
+
+
+def _write_columns_to_file(
+    batches: Iterator[Dict[str, Any]],
+    cache_file_name: Optional[str],
+    writer_batch_size: Optional[int] = None,
+    fingerprint: Optional[str] = None,
+) -> Optional[Table]:
+    """Stream chunks of generated columns to an Arrow file and return them
+    memory-mapped from it. The file is written in the temporary cache directory
+    if ``cache_file_name`` is None. Returns None if no rows were generated."""
+    if cache_file_name is None:
+        cache_file_name = os.path.join(
+            get_temporary_cache_files_directory(),
+            "apply-" + generate_random_fingerprint() + ".arrow",
+        )
+    else:
+        logger.info(f"Caching generated columns at {cache_file_name}")
+    writer = _ColumnsFileWriter(cache_file_name, writer_batch_size, fingerprint)
+    try:
+        for columns in batches:
+            with profile_phase("convert"):
+                writer.write(columns)
+        with profile_phase("attach"):
+            return writer.finalize()
+    except (Exception, KeyboardInterrupt):
+        writer.discard()
+        raise
+
+
+def _write_columns_to_files(
+    batches: Iterator[Dict[str, Any]],
+    get_file_name: Callable[[str], str],
+    writer_batch_size: Optional[int] = None,
+    fingerprint: Optional[str] = None,
+    features: Optional[Features] = None,
+) -> Dict[str, Table]:
+    """Stream chunks of generated columns to one Arrow file per column, named
+    by ``get_file_name(column_name)``, and return them memory-mapped. The
+    declared ``features`` of the columns are stored in their files."""
+    writers: Dict[str, _ColumnsFileWriter] = {}
+    try:
+        for columns in batches:
+            with profile_phase("convert"):
+                for attr_name, column in columns.items():
+                    if attr_name not in writers:
+                        writers[attr_name] = _ColumnsFileWriter(
+                            get_file_name(attr_name),
+                            writer_batch_size,
+                            fingerprint,
+                            features=(
+                                Features({attr_name: features[attr_name]})
+                                if features is not None and attr_name in features
+                                else None
+                            ),
+                        )
+                    writers[attr_name].write({attr_name: column})
+        with profile_phase("attach"):
+            return {
+                attr_name: writer.finalize() for attr_name, writer in writers.items()
+            }
+    except (Exception, KeyboardInterrupt):
+        for writer in writers.values():
+            writer.discard()
+        raise
+
+
+def _features_from_table(table: Table) -> Features:
+    """The features stored in the metadata of ``table``, or inferred from its
+    schema."""
+    metadata = table.schema.metadata
+    if metadata is not None and "huggingface".encode("utf-8") in metadata:
+        metadata = json.loads(metadata["huggingface".encode("utf-8")].decode())
+        if "info" in metadata:
+            features = DatasetInfo.from_dict(metadata["info"]).features
+            if features is not None:
+                return features
+    return Features.from_arrow_schema(table.schema)
+
+
+def _operation_name(func) -> str:
+    if isinstance(func, str):
+        return func
+    return getattr(func, "name", None) or getattr(func, "__name__", repr(func))
+
+
+def _sanitize_column_name(name: str) -> str:
+    return re.sub(r"[^\w.-]", "_", name)
+
+
+def _derived_columns_manifest_path(table_path: str) -> str:
+    """Manifest of the columns added to a cache file by `apply(mode="local")`."""
+    return os.path.splitext(table_path)[0] + "-columns.json"
+
+
 class NonExistentDatasetError(Exception):
     """Used when we expect the existence of a dataset"""
 
@@ -723,6 +1094,8 @@ class Dataset(DatasetInfoMixin, IndexableMixin, TensorflowDatasetMixin, TextData
                 return {}
 
     def __schema_load(self):
+        if len(self.cache_files) == 0:
+            return
         filename = self.cache_files[0]["filename"]
         (filepath, filename) = os.path.split(filename)
         (filename, extent) = os.path.splitext(filename)
@@ -776,8 +1149,10 @@ class Dataset(DatasetInfoMixin, IndexableMixin, TensorflowDatasetMixin, TextData
             ):  # try to load fingerprint from the arrow file metadata
                 self._fingerprint = metadata["fingerprint"]
 
+        self.__load_derived_columns()
+
         # Infer features if None
-        inferred_features = Features.from_arrow_schema(arrow_table.schema)
+        inferred_features = Features.from_arrow_schema(self._data.schema)
         if self.info.features is None:
             self.info.features = inferred_features
         else:  # make sure the nested columns are in the right order
@@ -893,39 +1268,91 @@ class Dataset(DatasetInfoMixin, IndexableMixin, TensorflowDatasetMixin, TextData
         # elif func._type == 'Aggregating':
         #     yield func(self[func.processed_fields[0]])
 
-        elif func._type.find("Aggregating") != -1:
-            yield func(self)
+        elif func.kind not in PER_SAMPLE_OPERATIONS:
+            self._prepare_operation(func)
+            yield func.run(self)
 
-        elif func._type.find("AutoEval") != -1:
-            func.resources = {"dataset_info": self._info}
-            yield func(self)
-
-        elif func._type.find("Inference") != -1:
-            yield func(self)
+        elif func.batched:
+            for batch_columns in self._apply_batched(func):
+                batch_columns = {
+                    attr_name: _column_to_list(column)
+                    for attr_name, column in batch_columns.items()
+                }
+                num_examples = len(next(iter(batch_columns.values())))
+                for i in range(num_examples):
+                    yield {
+                        attr_name: column[i]
+                        for attr_name, column in batch_columns.items()
+                    }
 
-        elif func._type == "Preprocessing":
-            task = self._info.task_templates[0].task
-            language = self._info.languages[0]
-            func.resources = {"task_type": task, "language": language}
-            for sample in self.__iter__():
-                yield func(sample[func.processed_fields[0]])
-        elif func._type in ["Editing", "Featurizing", "OperationFunction"]:
-            for sample in self.__iter__():
-                yield func(sample[func.processed_fields[0]])
-        elif func._type in [
-            "TopicClassificationPrompting",
-            "SentimentClassificationPrompting",
-            "NLIPrompting",
-        ]:
-            for sample in self.__iter__():
-                labels = self._info.task_templates[0].labels
-                labels_to_answers = dict(zip(range(len(labels)), labels))
-                yield func(sample, labels_to_answers)
         else:
+            self._prepare_operation(func)
+            plan = func.plan()
+            labels_to_answers = self._labels_to_answers() if plan.with_labels else None
             for sample in self.__iter__():
-                yield func(sample)
+                yield plan.run(sample, labels_to_answers)
+
+    def apply(
+        self,
+        func,
+        mode="realtime",
+        prefix="",
+        num_proc=1,
+        load_from_cache_file: Optional[bool] = None,
+        writer_batch_size: Optional[int] = 1000,
+        profile: bool = False,
+    ):
+        """Apply an operation to the dataset.
+
+        In `"memory"` mode, the generated columns (or statistics for
+        aggregating operations) are cached next to the dataset's cache files,
+        under a key computed from the dataset fingerprint and the operation.
+        A later call with the same key reloads them instead of recomputing.
+
+        Args:
+            func: operation (or prompt name) to apply.
+            mode (:obj:`str`, default `"realtime"`): `"realtime"` (lazy
+                generator), `"memory"` or `"local"`.
+            prefix (:obj:`str`): prefix of the generated columns or statistics.
+            num_proc (:obj:`int`, default `1`): number of processes.
+            load_from_cache_file (:obj:`Optional[bool]`, default `True` if
+                caching is enabled): reload the cached outputs if they exist.
+            writer_batch_size (:obj:`int`, default `1000`): in `"memory"` mode,
+                number of rows of outputs held in memory before being written
+                to the Arrow file that backs the generated columns.
+            profile (:obj:`bool`, default `False`): record the time and memory
+                used by the call in the statistics of the resulting dataset, see
+                `datalabs.utils.profiling` and `Dataset.export_profile`. In
+                `"realtime"` mode, the record is added to this dataset once the
+                outputs have all been consumed.
+        """
+        if not profile:
+            return self._apply(
+                func, mode, prefix, num_proc, load_from_cache_file, writer_batch_size
+            )
+        profiler = OperationProfiler(
+            _operation_name(func), method="apply", mode=mode, num_proc=num_proc
+        )
+        with profiler:
+            result = self._apply(
+                func, mode, prefix, num_proc, load_from_cache_file, writer_batch_size
+            )
+        if isinstance(result, Dataset):
+            return self._add_profile_record(result, profiler.record(result.num_rows))
+        # "realtime" mode, the outputs are computed as the generator is consumed
+        return self._iter_profiled(result, profiler)
 
-    def apply(self, func, mode="realtime", prefix="", num_proc=1):
+    def _apply(
+        self,
+        func,
+        mode="realtime",
+        prefix="",
+        num_proc=1,
+        load_from_cache_file: Optional[bool] = None,
+        writer_batch_size: Optional[int] = 1000,
+    ):
+        if load_from_cache_file is None:
+            load_from_cache_file = is_caching_enabled()
 
         if isinstance(func, str):
             map = {
@@ -934,9 +1361,25 @@ class Dataset(DatasetInfoMixin, IndexableMixin, TensorflowDatasetMixin, TextData
                 "local": self.apply_local,
             }
             return map[mode](func, prefix=prefix, num_proc=num_proc)
-        elif func._type.find("Aggregating") != -1 or func._type.find("AutoEval") != -1:
-
-            result = next(self.apply_basic(func))
+        elif func.kind == STATISTICS_OPERATION:
+            self._prepare_operation(func)
+            cache_file_name = self._get_apply_cache_file_path(
+                generate_operation_fingerprint(self._fingerprint, func, prefix),
+                "json",
+            )
+            if (
+                load_from_cache_file
+                and cache_file_name is not None
+                and os.path.exists(cache_file_name)
+            ):
+                logger.warning(f"Loading cached statistics at {cache_file_name}")
+                with profile_phase("decode"), open(cache_file_name, "r") as obj_file:
+                    result = json.load(obj_file)
+            else:
+                with profile_phase("operation"):
+                    result = next(self.apply_basic(func))
+                if cache_file_name is not None:
+                    _write_json_cache_file(result, cache_file_name)
 
             result_new = {}
             for attr_name, value in result.items():
@@ -947,168 +1390,760 @@ class Dataset(DatasetInfoMixin, IndexableMixin, TensorflowDatasetMixin, TextData
             if mode == "local":
                 self.__write_stat()
             return self
+        elif mode == "memory":
+            return self.apply_memory(
+                func,
+                prefix=prefix,
+                num_proc=num_proc,
+                load_from_cache_file=load_from_cache_file,
+                writer_batch_size=writer_batch_size,
+            )
         else:
             map = {
                 "realtime": self.apply_basic,
-                "memory": self.apply_memory,
                 "local": self.apply_local,
             }
             return map[mode](func, prefix=prefix, num_proc=num_proc)
 
-    def apply_memory(self, func, prefix="", num_proc=1):
-        result = self
-        attr_columns = []
-        if func._type.find("Inference") != -1:
-            attr_columns = next(self.apply_basic(func))
+    def _iter_profiled(self, outputs: Iterator, profiler: OperationProfiler):
+        """Yield the outputs of a "realtime" `apply`. Only the time spent
+        computing them is profiled, the record is added once they're consumed."""
+        iterator = iter(outputs)
+        num_rows = 0
+        while True:
+            with profiler:
+                try:
+                    output = next(iterator)
+                except StopIteration:
+                    break
+            num_rows += 1
+            yield output
+        self._add_profile_record(self, profiler.record(num_rows))
+
+    def _add_profile_record(self, result: "Dataset", record: dict) -> "Dataset":
+        """Store the profile record of an operation applied to this dataset in
+        the statistics of ``result``, after the records of this dataset."""
+        records = list(self._stat.get(PROFILE_STAT_KEY, []))
+        records.append(record)
+        result._stat[PROFILE_STAT_KEY] = records
+        return result
+
+    def export_profile(self, path: str) -> int:
+        """Write the profile records of the operations applied to the dataset
+        with ``profile=True`` to ``path``, as JSON lines (one record per call).
+
+        Returns:
+            :obj:`int`: number of records written.
+        """
+        return write_profile_records(self._stat.get(PROFILE_STAT_KEY, []), path)
 
+    def apply_memory(
+        self,
+        func,
+        prefix="",
+        num_proc=1,
+        load_from_cache_file=None,
+        writer_batch_size: Optional[int] = 1000,
+    ):
+        if isinstance(func, str):
+            return self._apply_prompt_memory(func, prefix=prefix)
+
+        if load_from_cache_file is None:
+            load_from_cache_file = is_caching_enabled()
+        self._prepare_operation(func)
+        new_fingerprint = generate_operation_fingerprint(
+            self._fingerprint, func, prefix
+        )
+        cache_file_name = self._get_apply_cache_file_path(new_fingerprint, "arrow")
+        if (
+            load_from_cache_file
+            and cache_file_name is not None
+            and os.path.exists(cache_file_name)
+        ):
+            logger.warning(f"Loading cached columns at {cache_file_name}")
+            column_table = MemoryMappedTable.from_file(cache_file_name)
         else:
+            # the outputs are written to disk chunk by chunk, so that at most
+            # `writer_batch_size` rows of results are held in memory
+            batches = self._iter_apply_outputs(
+                func, prefix, num_proc, writer_batch_size
+            )
+            column_table = _write_columns_to_file(
+                batches,
+                cache_file_name,
+                writer_batch_size=writer_batch_size,
+                fingerprint=new_fingerprint,
+            )
+        if column_table is None:
+            return self
+        result = self.flatten_indices() if self._indices is not None else self
+        return result._attach_columns_memory(
+            column_table,
+            new_fingerprint=new_fingerprint,
+            features=_declared_features([(func, prefix)]),
+        )
 
-            if num_proc == 1:
-                attr_columns = [item for item in self.apply_basic(func)]
-            elif num_proc > 1:
-
-                def process_each(index):
-                    sample = self._getitem(index, decoded=False)
-                    if func._type in ["Editing", "Featurizing", "OperationFunction"]:
-                        return func(sample[func.processed_fields[0]])
-                    elif func._type == "Preprocessing":
-                        task = self._info.task_templates[0].task
-                        language = self._info.languages[0]
-                        func.resources = {"task_type": task, "language": language}
-                        return func(sample[func.processed_fields[0]])
-                    elif func._type in [
-                        "TopicClassificationPrompting",
-                        "SentimentClassificationPrompting",
-                        "NLIPrompting",
-                    ]:
-                        labels = self._info.task_templates[0].labels
-                        labels_to_answers = dict(zip(range(len(labels)), labels))
-                        return func(sample, labels_to_answers)
-                    else:
-                        return func(sample)
-
-                print("Calculating features ... ")
-                with Pool(processes=num_proc) as pool:
-                    attr_columns = pool.map(process_each, range(self.num_rows))
-
-                # attr_columns = p_map(process_each, range(self.num_rows),
-                # num_cpus=num_proc)
-
-                # with Pool(processes=num_proc) as pool:
-                #     progress_bar = tqdm(total=self.num_rows)
-                #     attr_columns = tqdm(pool.imap(process_each, range(self.num_rows)))
-                # import multiprocessing
-                # with multiprocessing.Pool() as p:
-                #     attr_columns = list(tqdm.tqdm(p.imap(process_each,
-                #     range(self.num_rows)), total=self.num_rows))
-                #     pool.close()
-                #     pool.join()
-                # for v in attr_columns:
-                #     print(v)
-
-                # from tqdm.contrib.concurrent import process_map  # or thread_map
-                # attr_columns = process_map(process_each,
-                # range(self.num_rows), max_workers=num_proc)
-
-        attr_names = attr_columns[0].keys()
-        for attr_name in attr_names:
+    def _apply_prompt_memory(self, prompt: str, prefix=""):
+        attr_columns = _rows_to_columns([item for item in self.apply_basic(prompt)])
+        result = self
+        for attr_name, column in attr_columns.items():
             if prefix == "":
-                result = result.add_column(
-                    attr_name, [item[attr_name] for item in attr_columns]
+                result = result.add_column(attr_name, column)
+            else:
+                result = result.add_column(prefix + "_" + attr_name, column)
+        return result
+
+    def apply_local(
+        self, func, prefix="", num_proc=1, writer_batch_size: Optional[int] = 1000
+    ):
+        if isinstance(func, str):
+            new_fingerprint = update_fingerprint(
+                self._fingerprint, "apply", {"prompt": func, "prefix": prefix}
+            )
+        else:
+            self._prepare_operation(func)
+            new_fingerprint = generate_operation_fingerprint(
+                self._fingerprint, func, prefix
+            )
+        return self._attach_columns_local(
+            self._iter_apply_outputs(func, prefix, num_proc, writer_batch_size),
+            new_fingerprint=new_fingerprint,
+            writer_batch_size=writer_batch_size,
+            features=_declared_features([(func, prefix)]),
+        )
+
+    def _iter_apply_outputs(
+        self, func, prefix="", num_proc=1, writer_batch_size=1000
+    ) -> Iterator[Dict[str, Any]]:
+        """Yield the (prefixed) columns generated by ``func``, chunk by chunk."""
+        writer_batch_size = writer_batch_size or config.DEFAULT_MAX_BATCH_SIZE
+        if isinstance(func, str) or func.kind == COLUMNS_OPERATION:
+            if isinstance(func, str):
+                attr_columns = _rows_to_columns(list(self.apply_basic(func)))
+            else:
+                attr_columns = next(self.apply_basic(func))
+            if prefix != "":
+                attr_columns = {
+                    prefix + "_" + attr_name: column
+                    for attr_name, column in attr_columns.items()
+                }
+            yield attr_columns
+            return
+
+        if func.batched:
+            batch_size = func.batch_size
+        elif num_proc > 1:
+            batch_size = min(writer_batch_size, self._parallel_batch_size(num_proc))
+        else:
+            batch_size = writer_batch_size
+        yield from self._iter_pipeline(
+            [(func, prefix)], num_proc=num_proc, batch_size=batch_size
+        )
+
+    def _iter_batches(
+        self,
+        columns: Optional[List[str]] = None,
+        batch_size: Optional[int] = None,
+        batch_format: str = "python",
+    ) -> Iterator[Dict[str, Any]]:
+        """Iterate over the dataset by chunks of columns read straight from the
+        underlying table, without building a python dict per row.
+
+        Args:
+            columns (`Optional[List[str]]`): columns to read, all if `None`.
+            batch_size (`Optional[int]`, default `1000`): number of rows per chunk.
+            batch_format (`str`, default `"python"`): `"python"` yields lists,
+                `"arrow"` yields `pyarrow.Array` objects.
+        """
+        if batch_size is None or batch_size <= 0:
+            batch_size = 1000
+        for offset in range(0, self.num_rows, batch_size):
+            pa_subtable = query_table(
+                self._data,
+                slice(offset, offset + batch_size),
+                indices=self._indices,
+            )
+            names = pa_subtable.column_names if columns is None else columns
+            if batch_format == "arrow":
+                yield {
+                    name: _combine_chunks(pa_subtable.column(name)) for name in names
+                }
+            else:
+                yield {name: pa_subtable.column(name).to_pylist() for name in names}
+
+    def _apply_batched(self, func, num_proc=1) -> Iterator[Dict[str, Any]]:
+        """Run a batched operation chunk by chunk and yield its output columns."""
+        self._prepare_operation(func)
+        plan = func.plan()
+        columns = None if plan.field is None else [plan.field]
+        batches = profile_iter(
+            "decode",
+            self._iter_batches(
+                columns=columns,
+                batch_size=func.batch_size,
+                batch_format=func.batch_format,
+            ),
+        )
+        if num_proc > 1:
+            yield from profile_iter(
+                "operation",
+                get_executor(num_proc).imap(func.run, batches, operations=[func]),
+            )
+        else:
+            for batch in batches:
+                with profile_phase("operation"):
+                    outputs = plan.run(batch)
+                yield outputs
+
+    def _collect_batched(self, func, num_proc=1) -> Dict[str, Any]:
+        """Run a batched operation and merge its output chunks column-wise."""
+        chunks = {}
+        for batch_columns in self._apply_batched(func, num_proc=num_proc):
+            for attr_name, column in batch_columns.items():
+                chunks.setdefault(attr_name, []).append(column)
+        return {
+            attr_name: _merge_column_chunks(column_chunks)
+            for attr_name, column_chunks in chunks.items()
+        }
+
+    def apply_pipeline(
+        self,
+        funcs: List,
+        mode: str = "memory",
+        prefix: Union[str, List[str]] = "",
+        num_proc: int = 1,
+        batch_size: int = 1000,
+        load_from_cache_file: Optional[bool] = None,
+        chunksize: Optional[int] = None,
+        profile: bool = False,
+    ) -> "Dataset":
+        """Apply a list of operations to the dataset in a single scan.
+
+        All per-sample operations (featurizing, editing, preprocessing,
+        prompting...) run one after the other on each chunk of rows, so that
+        the table is read and decoded once. An operation can consume the
+        columns generated by the operations preceding it in ``funcs``. The
+        generated columns are attached to the dataset in one table
+        construction, then the aggregating operations are run on the result.
+
+        Args:
+            funcs (:obj:`List`): operations to apply, in order.
+            mode (:obj:`str`, default `"memory"`): `"memory"` or `"local"`.
+            prefix (:obj:`Union[str, List[str]]`): prefix of the generated
+                columns (or statistics), either shared or one per operation.
+            num_proc (:obj:`int`, default `1`): number of processes used for
+                the per-sample operations.
+            batch_size (:obj:`int`, default `1000`): number of rows per chunk.
+            load_from_cache_file (:obj:`Optional[bool]`, default `True` if
+                caching is enabled): reload the cached outputs of the
+                operations if they exist (`"memory"` mode).
+            chunksize (:obj:`Optional[int]`): number of chunks of rows sent to
+                a worker process at once when `num_proc > 1`, defaults to
+                `config.DEFAULT_APPLY_CHUNKSIZE`.
+            profile (:obj:`bool`, default `False`): record the time and memory
+                used by the whole pipeline in the statistics of the resulting
+                dataset, see `Dataset.apply`.
+        """
+        if profile:
+            profiler = OperationProfiler(
+                "+".join(_operation_name(func) for func in funcs),
+                method="apply_pipeline",
+                mode=mode,
+                num_proc=num_proc,
+            )
+            with profiler:
+                result = self.apply_pipeline(
+                    funcs,
+                    mode=mode,
+                    prefix=prefix,
+                    num_proc=num_proc,
+                    batch_size=batch_size,
+                    load_from_cache_file=load_from_cache_file,
+                    chunksize=chunksize,
                 )
+            return self._add_profile_record(result, profiler.record(result.num_rows))
+
+        if load_from_cache_file is None:
+            load_from_cache_file = is_caching_enabled()
+        if mode not in ["memory", "local"]:
+            raise ValueError(
+                f"apply_pipeline supports the 'memory' and 'local' modes, got {mode}"
+            )
+        prefixes = [prefix] * len(funcs) if isinstance(prefix, str) else list(prefix)
+        if len(prefixes) != len(funcs):
+            raise ValueError(
+                f"Got {len(prefixes)} prefixes for {len(funcs)} operations."
+            )
+
+        sample_ops, dataset_ops = [], []
+        for func, func_prefix in zip(funcs, prefixes):
+            if isinstance(func, str) or func.kind == COLUMNS_OPERATION:
+                raise ValueError(
+                    f"{func} can't be fused in a pipeline, use `Dataset.apply`."
+                )
+            if func.kind == STATISTICS_OPERATION:
+                dataset_ops.append((func, func_prefix))
             else:
-                result = result.add_column(
-                    prefix + "_" + attr_name, [item[attr_name] for item in attr_columns]
+                self._prepare_operation(func)
+                sample_ops.append((func, func_prefix))
+
+        result = self
+        if len(sample_ops) > 0:
+            if self._indices is not None:
+                result = self.flatten_indices()
+            new_fingerprint = self._fingerprint
+            for func, func_prefix in sample_ops:
+                new_fingerprint = generate_operation_fingerprint(
+                    new_fingerprint, func, func_prefix
                 )
+            if mode == "local":
+                result = result._attach_columns_local(
+                    result._iter_pipeline(sample_ops, num_proc, batch_size, chunksize),
+                    new_fingerprint=new_fingerprint,
+                    writer_batch_size=batch_size,
+                    features=_declared_features(sample_ops),
+                )
+            else:
+                cache_file_name = self._get_apply_cache_file_path(
+                    new_fingerprint, "arrow"
+                )
+                if (
+                    load_from_cache_file
+                    and cache_file_name is not None
+                    and os.path.exists(cache_file_name)
+                ):
+                    logger.warning(f"Loading cached columns at {cache_file_name}")
+                    column_table = MemoryMappedTable.from_file(cache_file_name)
+                else:
+                    column_table = _write_columns_to_file(
+                        result._iter_pipeline(
+                            sample_ops, num_proc, batch_size, chunksize
+                        ),
+                        cache_file_name,
+                        writer_batch_size=batch_size,
+                        fingerprint=new_fingerprint,
+                    )
+                if column_table is not None:
+                    result = result._attach_columns_memory(
+                        column_table,
+                        new_fingerprint=new_fingerprint,
+                        features=_declared_features(sample_ops),
+                    )
+
+        for func, func_prefix in dataset_ops:
+            result = result.apply(
+                func,
+                mode=mode,
+                prefix=func_prefix,
+                load_from_cache_file=load_from_cache_file,
+            )
         return result
 
-    def apply_local(self, func, prefix="", num_proc=1):
-        # result = self
+    def augment(
+        self,
+        func,
+        n_variants: int,
+        seed: int = 0,
+        prefix: str = "",
+        num_proc: int = 1,
+        batch_size: int = 1000,
+        load_from_cache_file: Optional[bool] = None,
+    ) -> "Dataset":
+        """Generate up to ``n_variants`` variants of each sample with a
+        per-sample operation (typically an editing one), in one scan.
 
-        attr_columns = []
+        Operations with a ``variants`` hook compute all the variants of a
+        sample in one call (e.g. parsing it once). The other ones are called
+        ``n_variants`` times per sample, with the seeds ``seed``,
+        ``seed + 1``...
 
-        if func._type.find("Inference") != -1:
-            attr_columns = next(self.apply_basic(func))
+        The variants are returned in long format, as a new dataset with one row
+        per variant: ``source_index`` (the index of the sample in this
+        dataset), ``variant_id`` (from 0) and the columns generated by the
+        operation. The columns of this dataset aren't copied, they can be
+        joined on ``source_index``. The variants are cached next to the
+        dataset's cache files, as the outputs of `Dataset.apply(mode="memory")`.
+
+        Args:
+            func: per-sample operation generating the variants.
+            n_variants (:obj:`int`): maximum number of variants per sample, some
+                operations generate fewer (e.g. when nothing can be replaced).
+            seed (:obj:`int`, default `0`): seed of the variants.
+            prefix (:obj:`str`): prefix of the generated columns.
+            num_proc (:obj:`int`, default `1`): number of processes.
+            batch_size (:obj:`int`, default `1000`): number of samples per chunk,
+                unless the operation is batched with its own `batch_size`.
+            load_from_cache_file (:obj:`Optional[bool]`, default `True` if
+                caching is enabled): reload the cached variants if they exist.
+        """
+        if isinstance(func, str) or func.kind not in PER_SAMPLE_OPERATIONS:
+            raise ValueError(
+                f"{_operation_name(func)} isn't a per-sample operation, it can't "
+                f"generate variants."
+            )
+        if n_variants < 1:
+            raise ValueError(f"n_variants must be positive, got {n_variants}")
+        if load_from_cache_file is None:
+            load_from_cache_file = is_caching_enabled()
+        self._prepare_operation(func)
+        # fails early if the operation can't generate variants
+        func.variants_plan(n_variants, seed)
+
+        new_fingerprint = generate_augment_fingerprint(
+            self._fingerprint, func, n_variants, seed, prefix
+        )
+        cache_file_name = self._get_apply_cache_file_path(new_fingerprint, "arrow")
+        if (
+            load_from_cache_file
+            and cache_file_name is not None
+            and os.path.exists(cache_file_name)
+        ):
+            logger.warning(f"Loading cached variants at {cache_file_name}")
+            table = MemoryMappedTable.from_file(cache_file_name)
         else:
-            if num_proc == 1:
-                attr_columns = [item for item in self.apply_basic(func)]
-            elif num_proc > 1:
-                batch_count = ceil(self.num_rows / num_proc)
-
-                def process_batch(index):
-                    range_limit = range(
-                        index * batch_count,
-                        min((index + 1) * batch_count, self.num_rows),
-                    )
+            table = _write_columns_to_file(
+                self._iter_variants(
+                    func, n_variants, seed, prefix, num_proc, batch_size
+                ),
+                cache_file_name,
+                writer_batch_size=batch_size,
+                fingerprint=new_fingerprint,
+            )
+        if table is None:
+            table = InMemoryTable.from_pydict(
+                {
+                    "source_index": pa.array([], pa.int64()),
+                    "variant_id": pa.array([], pa.int32()),
+                }
+            )
+        features = Features.from_arrow_schema(table.schema)
+        features.update(
+            {
+                name: feature
+                for name, feature in _declared_features([(func, prefix)]).items()
+                if name in table.column_names
+            }
+        )
+        return Dataset(
+            update_metadata_with_features(table, features),
+            info=DatasetInfo(features=features),
+            split=self.split,
+            fingerprint=new_fingerprint,
+        )
 
-                    if func._type in ["Editing", "Featurizing", "OperationFunction"]:
-                        return [
-                            func(
-                                self._getitem(index, decoded=False)[
-                                    func.processed_fields[0]
-                                ]
-                            )
-                            for index in range_limit
-                        ]
-                    elif func._type == "Preprocessing":
-                        task = self._info.task_templates[0].task
-                        language = self._info.languages[0]
-                        func.resources = {"task_type": task, "language": language}
-                        return [
-                            func(
-                                self._getitem(index, decoded=False)[
-                                    func.processed_fields[0]
-                                ]
-                            )
-                            for index in range_limit
-                        ]
-                    elif func._type in [
-                        "TopicClassificationPrompting",
-                        "SentimentClassificationPrompting",
-                        "NLIPrompting",
-                    ]:
-                        labels = self._info.task_templates[0].labels
-                        labels_to_answers = dict(zip(range(len(labels)), labels))
-                        return [
-                            func(self._getitem(index, decoded=False), labels_to_answers)
-                            for index in range_limit
-                        ]
+    def _iter_variants(
+        self, func, n_variants, seed, prefix="", num_proc=1, batch_size=1000
+    ) -> Iterator[Dict[str, Any]]:
+        """Generate the variants of the samples chunk by chunk, and yield them
+        in long format."""
+        plan = func.plan()
+        columns = None if plan.field is None else [plan.field]
+        labels_to_answers = self._labels_to_answers() if plan.with_labels else None
+        if func.batched and func.batch_size is not None:
+            batch_size = func.batch_size
+        elif num_proc > 1:
+            batch_size = min(batch_size, self._parallel_batch_size(num_proc))
+
+        batches = profile_iter(
+            "decode",
+            self._iter_batches(
+                columns=columns, batch_size=batch_size, batch_format="arrow"
+            ),
+        )
+        chunks = zip(range(0, self.num_rows, batch_size), batches)
+        augment_chunk = partial(
+            Dataset._augment_batch,
+            func,
+            n_variants,
+            seed,
+            prefix,
+            labels_to_answers=labels_to_answers,
+        )
+        if num_proc > 1:
+            outputs = profile_iter(
+                "operation",
+                get_executor(num_proc).imap(augment_chunk, chunks, operations=[func]),
+            )
+        else:
+            outputs = map(augment_chunk, chunks)
+        for generated in outputs:
+            # chunks without any variant add no rows
+            if len(generated["source_index"]) > 0:
+                yield generated
+
+    @staticmethod
+    def _augment_batch(
+        func, n_variants, seed, prefix, chunk, labels_to_answers=None
+    ) -> Dict[str, Any]:
+        offset, columns = chunk
+        batch = _ColumnBatch(columns)
+        plan = func.variants_plan(n_variants, seed)
+        with profile_phase("decode"):
+            if plan.field is not None:
+                inputs = batch.column(plan.field, func.batch_format)
+            elif func.batched:
+                inputs = batch.columns(func.batch_format)
+            else:
+                inputs = batch.rows()
+        with profile_phase("operation"):
+            if func.batched:
+                variants = plan.invoke(inputs, labels_to_answers)
+            else:
+                variants = plan.invoke_many(inputs, labels_to_answers)
+
+        with profile_phase("convert"):
+            source_index, variant_id, rows = [], [], []
+            for index, outputs in enumerate(variants, offset):
+                for variant, output in enumerate(outputs[:n_variants]):
+                    source_index.append(index)
+                    variant_id.append(variant)
+                    rows.append(output)
+            generated = {
+                "source_index": pa.array(source_index, pa.int64()),
+                "variant_id": pa.array(variant_id, pa.int32()),
+            }
+            if func.outputs is not None:
+                outputs = _rows_to_arrays(func, rows)
+            else:
+                outputs = _rows_to_columns(rows)
+            for attr_name, column in outputs.items():
+                if prefix != "":
+                    attr_name = prefix + "_" + attr_name
+                generated[attr_name] = column
+        return generated
+
+    def _parallel_batch_size(self, num_proc: int) -> int:
+        """Number of rows per chunk so that each worker gets at least one chunk."""
+        return max(1, min(1000, ceil(self.num_rows / num_proc)))
+
+    def _iter_pipeline(
+        self, sample_ops, num_proc=1, batch_size=1000, chunksize=None
+    ) -> Iterator[Dict[str, Any]]:
+        """Run per-sample operations in one scan and yield the columns they
+        generate, chunk by chunk."""
+        plans = [func.plan() for func, _ in sample_ops]
+        if all(plan.field is not None for plan in plans):
+            columns = sorted({plan.field for plan in plans} & set(self.column_names))
+        else:
+            columns = None
+        labels_to_answers = None
+        if any(plan.with_labels for plan in plans):
+            labels_to_answers = self._labels_to_answers()
+
+        batches = profile_iter(
+            "decode",
+            self._iter_batches(
+                columns=columns, batch_size=batch_size, batch_format="arrow"
+            ),
+        )
+        if num_proc > 1:
+            yield from profile_iter(
+                "operation",
+                get_executor(num_proc).imap(
+                    partial(
+                        Dataset._run_pipeline_on_batch,
+                        sample_ops,
+                        labels_to_answers=labels_to_answers,
+                    ),
+                    batches,
+                    operations=[func for func, _ in sample_ops],
+                    chunksize=chunksize,
+                ),
+            )
+        else:
+            for batch in batches:
+                yield self._run_pipeline_on_batch(sample_ops, batch, labels_to_answers)
+
+    def _run_pipeline(
+        self, sample_ops, num_proc=1, batch_size=1000, chunksize=None
+    ) -> Dict[str, Any]:
+        """Run per-sample operations in one scan and return the generated columns."""
+        chunks = {}
+        for batch_columns in self._iter_pipeline(
+            sample_ops, num_proc, batch_size, chunksize
+        ):
+            for attr_name, column in batch_columns.items():
+                chunks.setdefault(attr_name, []).append(column)
+        return {
+            attr_name: _merge_column_chunks(column_chunks)
+            for attr_name, column_chunks in chunks.items()
+        }
+
+    @staticmethod
+    def _run_pipeline_on_batch(
+        sample_ops, columns: Dict[str, Any], labels_to_answers=None
+    ) -> Dict[str, Any]:
+        batch = _ColumnBatch(columns)
+        generated = {}
+        for func, func_prefix in sample_ops:
+            plan = func.plan()
+            if func.batched:
+                with profile_phase("decode"):
+                    if plan.field is not None:
+                        inputs = batch.column(plan.field, func.batch_format)
                     else:
-                        return [
-                            func(self._getitem(index, decoded=False))
-                            for index in range_limit
-                        ]
+                        inputs = batch.columns(func.batch_format)
+                with profile_phase("operation"):
+                    outputs = plan.invoke(inputs, labels_to_answers)
+                if func.outputs is not None:
+                    with profile_phase("convert"):
+                        outputs = _columns_to_arrays(func, outputs)
+            else:
+                with profile_phase("decode"):
+                    if plan.field is not None:
+                        inputs = batch.column(plan.field)
+                    else:
+                        inputs = batch.rows()
+                with profile_phase("operation"):
+                    results = plan.invoke_many(inputs, labels_to_answers)
+                with profile_phase("convert"):
+                    if func.outputs is not None:
+                        outputs = _rows_to_arrays(func, results)
+                    else:
+                        outputs = _rows_to_columns(results)
+
+            for attr_name, column in outputs.items():
+                if func_prefix != "":
+                    attr_name = func_prefix + "_" + attr_name
+                batch.update(attr_name, column)
+                generated[attr_name] = column
+        return generated
+
+    def _prepare_operation(self, func):
+        """Set the resources that depend on the dataset before running ``func``."""
+        func.prepare(self._info)
+
+    def _labels_to_answers(self) -> Dict[int, str]:
+        """Label id -> label name mapping passed to the prompting operations."""
+        labels = self._info.task_templates[0].labels
+        return dict(zip(range(len(labels)), labels))
+
+    def _get_apply_cache_file_path(self, fingerprint, extension) -> Optional[str]:
+        """Path of the cached outputs of an operation, next to the dataset's cache
+        files. Returns None if caching is disabled or the dataset is in memory."""
+        if not (is_caching_enabled() and self.cache_files):
+            return None
+        cache_directory = os.path.dirname(self.cache_files[0]["filename"])
+        return os.path.join(cache_directory, f"apply-{fingerprint}.{extension}")
+
+    def _attach_columns_memory(
+        self,
+        columns: Union[Dict[str, Any], Table],
+        new_fingerprint: Optional[str] = None,
+        features: Optional[Features] = None,
+    ) -> "Dataset":
+        """Add all the given columns to the dataset with one horizontal
+        concatenation. Existing columns with the same names are replaced, the
+        features of the columns are inferred unless declared in ``features``."""
+        with profile_phase("attach"):
+            column_table = (
+                columns
+                if isinstance(columns, Table)
+                else InMemoryTable.from_pydict(columns)
+            )
+            data = self._data
+            replaced = [
+                name for name in column_table.column_names if name in data.column_names
+            ]
+            if len(replaced) > 0:
+                data = data.drop(replaced)
+            table = ConcatenationTable.from_tables([data, column_table], axis=1)
+            info = self.info.copy()
+            for name in replaced:
+                del info.features[name]
+            info.features.update(Features.from_arrow_schema(column_table.schema))
+            if features is not None:
+                info.features.update(
+                    {
+                        name: feature
+                        for name, feature in features.items()
+                        if name in column_table.column_names
+                    }
+                )
+            table = update_metadata_with_features(table, info.features)
+            return Dataset(
+                table,
+                info=info,
+                split=self.split,
+                indices_table=self._indices,
+                fingerprint=new_fingerprint,
+            )
 
-                with Pool(processes=num_proc) as pool:
-                    attr_columns = []
-                    temp_columns = pool.map(
-                        process_batch, range(num_proc)
-                    )  # TODO(Pengfei): this is a little strange
-                    for items in temp_columns:
-                        attr_columns += items
-
-        attr_names = attr_columns[0].keys()
-        pa_table = self.__load_disk()
-        column_dict = {}
-
-        for attr_name in attr_names:
-            attr_name_origin = attr_name
-            attr_name = prefix + "_" + attr_name if prefix != "" else attr_name
-            if attr_name in pa_table.column_names:
-                pa_table = pa_table.drop([attr_name])
-            items = [item[attr_name_origin] for item in attr_columns]
-            pa_table = pa_table.append_column(attr_name, pa.array(items))
-            column_dict[attr_name] = items
-        self.__write_disk(pa_table)
-
-        column_table = InMemoryTable.from_pydict(column_dict)
-        inferred_feature = Features.from_arrow_schema(column_table.schema)
-        table = MemoryMappedTable(pa_table, self.__table_path())
-        info = self.info.copy()
-        info.features.update(inferred_feature)
-        self.__schema_backup(attr_name, inferred_feature[attr_name].dtype)
+    def _attach_columns_local(
+        self,
+        batches: Iterator[Dict[str, Any]],
+        new_fingerprint: Optional[str] = None,
+        writer_batch_size: Optional[int] = None,
+        features: Optional[Features] = None,
+    ) -> "Dataset":
+        """Add the generated columns to the dataset and persist them next to its
+        cache file, one Arrow file per column, registered in a manifest. The
+        cache file itself is never rewritten."""
+        table_path = self.__table_path()
+        if table_path is None:
+            raise ValueError(
+                "The 'local' mode needs a dataset backed by a cache file, "
+                "use the 'memory' mode instead."
+            )
+        if self._indices is not None:
+            raise ValueError(
+                "The 'local' mode can't be used on a dataset with an indices "
+                "mapping, call `flatten_indices` first."
+            )
+        stem = os.path.splitext(table_path)[0]
+        column_tables = _write_columns_to_files(
+            batches,
+            lambda attr_name: f"{stem}-column-{_sanitize_column_name(attr_name)}.arrow",
+            writer_batch_size=writer_batch_size,
+            fingerprint=new_fingerprint,
+            features=features,
+        )
+        if len(column_tables) == 0:
+            return self
+
+        manifest_path = _derived_columns_manifest_path(table_path)
+        with profile_phase("attach"):
+            manifest = self.__load_json(manifest_path)
+            for attr_name, column_table in column_tables.items():
+                manifest[attr_name] = os.path.basename(column_table.path)
+            tmp_file = tempfile.NamedTemporaryFile(
+                "w", dir=os.path.dirname(manifest_path), delete=False
+            )
+            with tmp_file:
+                json.dump(manifest, tmp_file)
+            shutil.move(tmp_file.name, manifest_path)
 
-        return Dataset(table, info=info, split=self.split, indices_table=self._indices)
+        return self._attach_columns_memory(
+            ConcatenationTable.from_tables(list(column_tables.values()), axis=1),
+            new_fingerprint=new_fingerprint,
+            features=features,
+        )
+
+    def __load_derived_columns(self):
+        """Join the columns persisted by `apply(mode="local")` to the table of a
+        dataset loaded from its cache file (zero-copy, each column stays
+        memory-mapped from its own file)."""
+        if not isinstance(self._data, MemoryMappedTable) or self._data.replays:
+            return
+        manifest_path = _derived_columns_manifest_path(self._data.path)
+        if not os.path.exists(manifest_path):
+            return
+        manifest = self.__load_json(manifest_path)
+        if len(manifest) == 0:
+            return
+        dirname = os.path.dirname(self._data.path)
+        column_tables = [
+            MemoryMappedTable.from_file(os.path.join(dirname, file_name))
+            for file_name in manifest.values()
+        ]
+        replaced = [name for name in manifest if name in self._data.column_names]
+        data = self._data.drop(replaced) if len(replaced) > 0 else self._data
+        self._data = ConcatenationTable.from_tables([data] + column_tables, axis=1)
+        if self.info.features is not None:
+            for name in replaced:
+                del self.info.features[name]
+            for column_table in column_tables:
+                self.info.features.update(_features_from_table(column_table))
 
     def __table_path(self):
         return None if len(self.cache_files) == 0 else self.cache_files[0]["filename"]
@@ -1128,42 +2163,6 @@ class Dataset(DatasetInfoMixin, IndexableMixin, TensorflowDatasetMixin, TextData
         with open(path, "w") as obj_file:
             json.dump(self._stat, obj_file)
 
-    def __load_disk(self):
-        filename = self.__table_path()
-        mapfile = pa.memory_map(filename, "r")
-        return pa.ipc.open_stream(mapfile).read_all()
-
-    def __write_disk(self, pa_table):
-        filename = self.__table_path()
-        schema = pa_table.schema.serialize()
-        batches = list(map(lambda batch: batch.serialize(), pa_table.to_batches()))
-        eof = b"\xFF\xFF\xFF\xFF\x00\x00\x00\x00"
-
-        total = schema.size + len(eof)
-        for batch in batches:
-            total += batch.size
-        mapfile = pa.memory_map(filename, "r+")
-        mapfile.resize(total)
-        mapfile.seek(0)
-
-        mapfile.write(schema)
-        for batch in batches:
-            mapfile.write(batch)
-        mapfile.write(eof)
-
-    def __schema_backup(self, field, dtype=None):
-        filename = self.__table_path()
-        (filepath, filename) = os.path.split(filename)
-        (filename, extent) = os.path.splitext(filename)
-        path = os.path.join(filepath, filename + ".json")
-        obj = self.__load_json(path)
-        if dtype is not None:
-            obj[field] = dtype
-        else:
-            del obj[field]
-        with open(path, "w") as obj_file:
-            json.dump(obj, obj_file)
-
     def write_arrow(self, path: str):
         with open(path, "wb") as file_obj:
             with ArrowWriter(stream=file_obj) as writer:
@@ -2753,6 +3752,7 @@ class Dataset(DatasetInfoMixin, IndexableMixin, TensorflowDatasetMixin, TextData
         suffix_template: str = "_{rank:05d}_of_{num_proc:05d}",
         new_fingerprint: Optional[str] = None,
         desc: Optional[str] = None,
+        profile: bool = False,
     ) -> "Dataset":
         """Apply a function to all the elements in the table (individually or in
          batches)
@@ -2839,7 +3839,38 @@ class Dataset(DatasetInfoMixin, IndexableMixin, TensorflowDatasetMixin, TextData
             desc (`Optional[str]`, defaults to `None`): Meaningful
             description to be displayed alongside with the progress bar while
              mapping examples.
+            profile (`bool`, defaults to `False`): record the time and memory
+            used by the call in the statistics of the resulting dataset, see
+            `Dataset.apply`.
         """
+        if profile:
+            profiler = OperationProfiler(
+                _operation_name(function), method="map", num_proc=num_proc or 1
+            )
+            with profiler:
+                result = self.map(
+                    function=function,
+                    with_indices=with_indices,
+                    with_rank=with_rank,
+                    input_columns=input_columns,
+                    batched=batched,
+                    batch_size=batch_size,
+                    drop_last_batch=drop_last_batch,
+                    remove_columns=remove_columns,
+                    keep_in_memory=keep_in_memory,
+                    load_from_cache_file=load_from_cache_file,
+                    cache_file_name=cache_file_name,
+                    writer_batch_size=writer_batch_size,
+                    features=features,
+                    disable_nullable=disable_nullable,
+                    fn_kwargs=fn_kwargs,
+                    num_proc=num_proc,
+                    suffix_template=suffix_template,
+                    new_fingerprint=new_fingerprint,
+                    desc=desc,
+                )
+            return self._add_profile_record(result, profiler.record(result.num_rows))
+
         assert (
             not keep_in_memory or cache_file_name is None
         ), "Please use either `keep_in_memory` or `cache_file_name` but not both."
@@ -3268,7 +4299,8 @@ class Dataset(DatasetInfoMixin, IndexableMixin, TensorflowDatasetMixin, TextData
                 additional_args += (effective_indices,)
             if with_rank:
                 additional_args += (rank,)
-            processed_inputs = function(*fn_args, *additional_args, **fn_kwargs)
+            with profile_phase("operation"):
+                processed_inputs = function(*fn_args, *additional_args, **fn_kwargs)
             if update_data is None:
                 # Check if the function returns updated examples
                 update_data = isinstance(processed_inputs, (Mapping, pa.Table))
@@ -3378,7 +4410,7 @@ class Dataset(DatasetInfoMixin, IndexableMixin, TensorflowDatasetMixin, TextData
                     desc=pbar_desc,
                 )
                 if not batched:
-                    for i, example in enumerate(pbar):
+                    for i, example in enumerate(profile_iter("decode", pbar)):
                         example = apply_function_on_filtered_inputs(
                             example, i, offset=offset
                         )
@@ -3386,18 +4418,20 @@ class Dataset(DatasetInfoMixin, IndexableMixin, TensorflowDatasetMixin, TextData
                             if i == 0:
                                 buf_writer, writer, tmp_file = init_buffer_and_writer()
                                 stack.enter_context(writer)
-                            if isinstance(example, pa.Table):
-                                writer.write_row(example)
-                            else:
-                                writer.write(example)
+                            with profile_phase("convert"):
+                                if isinstance(example, pa.Table):
+                                    writer.write_row(example)
+                                else:
+                                    writer.write(example)
                 else:
                     for i in pbar:
                         if drop_last_batch and i + batch_size > input_dataset.num_rows:
                             continue
-                        batch = input_dataset._getitem(
-                            slice(i, i + batch_size),
-                            decoded=False,
-                        )
+                        with profile_phase("decode"):
+                            batch = input_dataset._getitem(
+                                slice(i, i + batch_size),
+                                decoded=False,
+                            )
                         indices = list(
                             range(
                                 *(
@@ -3429,12 +4463,14 @@ class Dataset(DatasetInfoMixin, IndexableMixin, TensorflowDatasetMixin, TextData
                             if i == 0:
                                 buf_writer, writer, tmp_file = init_buffer_and_writer()
                                 stack.enter_context(writer)
-                            if isinstance(batch, pa.Table):
-                                writer.write_table(batch)
-                            else:
-                                writer.write_batch(batch)
+                            with profile_phase("convert"):
+                                if isinstance(batch, pa.Table):
+                                    writer.write_table(batch)
+                                else:
+                                    writer.write_batch(batch)
                 if update_data and writer is not None:
-                    writer.finalize()  # close_stream=bool(buf_writer is None))
+                    with profile_phase("convert"):
+                        writer.finalize()  # close_stream=bool(buf_writer is None))
                     # We only close if we are writing in a file
             except (Exception, KeyboardInterrupt):
                 if update_data:
@@ -3458,12 +4494,15 @@ class Dataset(DatasetInfoMixin, IndexableMixin, TensorflowDatasetMixin, TextData
             info = self.info.copy()
             info.features = writer._features
             info.task_templates = None
-            if buf_writer is None:
-                return Dataset.from_file(cache_file_name, info=info, split=self.split)
-            else:
-                return Dataset.from_buffer(
-                    buf_writer.getvalue(), info=info, split=self.split
-                )
+            with profile_phase("attach"):
+                if buf_writer is None:
+                    return Dataset.from_file(
+                        cache_file_name, info=info, split=self.split
+                    )
+                else:
+                    return Dataset.from_buffer(
+                        buf_writer.getvalue(), info=info, split=self.split
+                    )
         else:
             return self
 
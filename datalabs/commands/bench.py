@@ -0,0 +1,135 @@
+# coding=utf-8
+# Copyright 2020 The HuggingFace Datasets Authors and the DataLab Datasets Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from argparse import ArgumentParser, Namespace
+from typing import List, Optional
+
+from datalabs.commands import BaseDatasetsCLICommand
+from datalabs.utils.benchmark import run_benchmarks, SUITES, write_results
+
+
+def _int_list(value: str) -> List[int]:
+    return [int(item) for item in value.split(",")]
+
+
+def bench_command_factory(args: Namespace):
+    return BenchCommand(
+        args.suite,
+        args.sizes,
+        args.num_proc,
+        args.corpus,
+        args.operations,
+        args.repeat,
+        args.output,
+    )
+
+
+class BenchCommand(BaseDatasetsCLICommand):
+    @staticmethod
+    def register_subcommand(parser: ArgumentParser):
+        bench_parser = parser.add_parser(
+            "bench", help="Benchmark the operations and the core Dataset methods."
+        )
+        bench_parser.add_argument(
+            "--suite",
+            choices=SUITES,
+            action="append",
+            help="Benchmark suite to run, can be repeated. All of them by default.",
+        )
+        bench_parser.add_argument(
+            "--sizes",
+            type=_int_list,
+            default=[100, 1000],
+            help="Comma-separated numbers of rows of the corpora.",
+        )
+        bench_parser.add_argument(
+            "--num_proc",
+            type=_int_list,
+            default=[1],
+            help="Comma-separated numbers of processes to run the operations with.",
+        )
+        bench_parser.add_argument(
+            "--corpus",
+            type=str,
+            default=None,
+            help="Fixture corpus (json or csv file) used instead of the synthetic "
+            "one, repeated or truncated to each size.",
+        )
+        bench_parser.add_argument(
+            "--operations",
+            type=str,
+            default=None,
+            help="Glob on the names of the operations to run, e.g. 'featurize.*'.",
+        )
+        bench_parser.add_argument(
+            "--repeat",
+            type=int,
+            default=1,
+            help="Number of runs of each benchmark, the best one is kept.",
+        )
+        bench_parser.add_argument(
+            "--output",
+            type=str,
+            default="datalabs_bench.json",
+            help="Path of the JSON file the results are written to.",
+        )
+        bench_parser.set_defaults(func=bench_command_factory)
+
+    def __init__(
+        self,
+        suites: Optional[List[str]],
+        sizes: List[int],
+        num_procs: List[int],
+        corpus: Optional[str],
+        operations: Optional[str],
+        repeat: int,
+        output: str,
+    ):
+        self._suites = suites or SUITES
+        self._sizes = sizes
+        self._num_procs = num_procs
+        self._corpus = corpus
+        self._operations = operations
+        self._repeat = repeat
+        self._output = output
+
+    def run(self):
+        results = run_benchmarks(
+            suites=self._suites,
+            sizes=self._sizes,
+            num_procs=self._num_procs,
+            corpus_path=self._corpus,
+            pattern=self._operations,
+            repeat=self._repeat,
+            callback=self.print_record,
+        )
+        write_results(results, self._output)
+        print(f"\nResults written to {self._output}")
+        return results
+
+    @staticmethod
+    def print_record(record: dict):
+        name = f"{record['suite']}/{record['name']}"
+        setting = f"rows={record['num_rows']} num_proc={record['num_proc']}"
+        if record["error"] is not None:
+            error = " ".join(record["error"].split())[:120]
+            print(f"{name:<60} {setting:<24} ERROR {error}")
+        else:
+            print(
+                f"{name:<60} {setting:<24} {record['wall_time']:.4f}s"
+                + (
+                    f" {record['rows_per_second']:.0f} rows/s"
+                    if record["rows_per_second"]
+                    else ""
+                )
+            )
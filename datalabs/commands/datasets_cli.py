@@ -14,11 +14,11 @@
 
 from argparse import ArgumentParser
 
+from datalabs.commands.bench import BenchCommand
 from datalabs.commands.convert import ConvertCommand
 from datalabs.commands.dummy_data import DummyDataCommand
 from datalabs.commands.env import EnvironmentCommand
 from datalabs.commands.run_beam import RunBeamCommand
-from datalabs.commands.test import TestCommand
 from datalabs.utils.logging import set_verbosity_info
 
 
@@ -31,9 +31,9 @@ def main():
     # Register commands
     ConvertCommand.register_subcommand(commands_parser)
     EnvironmentCommand.register_subcommand(commands_parser)
-    TestCommand.register_subcommand(commands_parser)
     RunBeamCommand.register_subcommand(commands_parser)
     DummyDataCommand.register_subcommand(commands_parser)
+    BenchCommand.register_subcommand(commands_parser)
 
     # Let's go
     args = parser.parse_args()
@@ -194,6 +194,17 @@ HF_UPDATE_DOWNLOAD_COUNTS = (
 # source/cpp/arrays.rst#size-limitations-and-recommendations)
 DEFAULT_MAX_BATCH_SIZE = 10_000
 
+# Number of row chunks sent at once to a worker process by a parallel
+# `Dataset.apply`
+DEFAULT_APPLY_CHUNKSIZE = 1
+
+# Memory (in bytes) of the tokens cached by the tokenizers of
+# `datalabs.operations.tokenizer`, shared by the operations of a process
+DEFAULT_TOKEN_CACHE_MAX_SIZE = 256 << 20
+TOKEN_CACHE_MAX_SIZE = int(
+    os.environ.get("HF_DATASETS_TOKEN_CACHE_MAX_SIZE", DEFAULT_TOKEN_CACHE_MAX_SIZE)
+)
+
 # Pickling tables works only for small tables (<4GiB)
 # For big tables, we write them on disk instead
 MAX_TABLE_NBYTES_FOR_PICKLING = 4 << 30
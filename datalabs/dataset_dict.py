@@ -25,6 +25,7 @@ from datalabs import config
 from datalabs.arrow_dataset import Dataset
 from datalabs.features import Features
 from datalabs.filesystems import extract_path_from_uri, is_remote_filesystem
+from datalabs.operations.operation import STATISTICS_OPERATION
 from datalabs.splits import NamedSplit, Split
 from datalabs.table import Table
 from datalabs.tasks import TaskTemplate
@@ -558,6 +559,81 @@ class DatasetDict(dict):
         )
         return dataset
 
+    def apply(
+        self,
+        func,
+        mode: str = "realtime",
+        prefix: str = "",
+        num_proc: int = 1,
+        load_from_cache_file: Optional[bool] = None,
+        profile: bool = False,
+    ) -> Union["DatasetDict", Dict[str, Any]]:
+        """Apply an operation to every split of the dataset dictionary.
+
+        The worker processes used when `num_proc > 1` are shared by all the
+        splits (and by the later calls).
+
+        Args:
+            func: operation (or prompt name) to apply.
+            mode (`str`, default `"realtime"`): `"realtime"`, `"memory"` or
+             `"local"`. In `"realtime"` mode a dict of generators is returned.
+             Aggregating operations add their statistics to each split, a
+             dict of the splits is returned.
+            prefix (`str`): prefix of the generated columns or statistics.
+            num_proc (`int`, default `1`): number of processes.
+            load_from_cache_file (`Optional[bool]`): reload the cached outputs
+             of the operation if they exist, see :meth:`Dataset.apply`.
+            profile (`bool`, default `False`): record the time and memory used
+             on each split, see :meth:`Dataset.apply`.
+        """
+        self._check_values_type()
+        results = {
+            k: dataset.apply(
+                func,
+                mode=mode,
+                prefix=prefix,
+                num_proc=num_proc,
+                load_from_cache_file=load_from_cache_file,
+                profile=profile,
+            )
+            for k, dataset in self.items()
+        }
+        if mode == "realtime" or (
+            not isinstance(func, str) and func.kind == STATISTICS_OPERATION
+        ):
+            return results
+        return DatasetDict(results)
+
+    def apply_pipeline(
+        self,
+        funcs: List,
+        mode: str = "memory",
+        prefix: Union[str, List[str]] = "",
+        num_proc: int = 1,
+        batch_size: int = 1000,
+        load_from_cache_file: Optional[bool] = None,
+        chunksize: Optional[int] = None,
+        profile: bool = False,
+    ) -> "DatasetDict":
+        """Apply a list of operations to every split of the dataset dictionary,
+        see :meth:`Dataset.apply_pipeline`."""
+        self._check_values_type()
+        return DatasetDict(
+            {
+                k: dataset.apply_pipeline(
+                    funcs,
+                    mode=mode,
+                    prefix=prefix,
+                    num_proc=num_proc,
+                    batch_size=batch_size,
+                    load_from_cache_file=load_from_cache_file,
+                    chunksize=chunksize,
+                    profile=profile,
+                )
+                for k, dataset in self.items()
+            }
+        )
+
     def map(
         self,
         function,
@@ -370,6 +370,47 @@ def update_fingerprint(fingerprint, transform, transform_args):
     return hasher.hexdigest()
 
 
+def generate_operation_fingerprint(fingerprint, func, prefix="") -> str:
+    """Fingerprint of the output of ``Dataset.apply(func, prefix=prefix)`` on a
+    dataset with the given fingerprint.
+
+    The function of the operation is hashed with :class:`Hasher`, i.e. its code
+    along with the globals and closure variables it reads (so that editing a
+    module-level table it uses invalidates the cache). So are its ``preload``
+    and ``variants`` hooks, its resources, its processed fields, its batching
+    parameters and its declared outputs.
+    """
+    return update_fingerprint(
+        fingerprint,
+        func.func,
+        {
+            "type": func._type,
+            "name": func.name,
+            "resources": func.resources,
+            "preload": func.preload,
+            "variants": func.variants,
+            "processed_fields": func.processed_fields,
+            "batched": func.batched,
+            "batch_size": func.batch_size,
+            "batch_format": func.batch_format,
+            "outputs": func.outputs,
+            "prefix": prefix,
+        },
+    )
+
+
+def generate_augment_fingerprint(
+    fingerprint, func, n_variants: int, seed: int, prefix=""
+) -> str:
+    """Fingerprint of the output of ``Dataset.augment(func, n_variants, seed,
+    prefix=prefix)`` on a dataset with the given fingerprint."""
+    return update_fingerprint(
+        generate_operation_fingerprint(fingerprint, func, prefix),
+        "augment",
+        {"n_variants": n_variants, "seed": seed},
+    )
+
+
 def fingerprint_transform(
     inplace: bool,
     use_kwargs: Optional[List[str]] = None,
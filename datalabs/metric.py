@@ -1,9 +1,9 @@
 from random import choices
 
 import numpy as np
-import scipy
-import sklearn.metrics
-from sklearn.metrics import accuracy_score
+
+# scipy and scikit-learn are imported when a metric is used, they are slow to
+# import and `import datalabs` pulls this module in
 
 
 class Metric:
@@ -17,11 +17,13 @@ class Metric:
         self._is_print_confidence_interval = False
 
     def get_confidence_interval(self, *args, **kwargs):
+        from scipy import stats
+
         def mean_confidence_interval(data, confidence=0.95):
             a = 1.0 * np.array(data)
             n = len(a)
-            m, se = np.mean(a), scipy.stats.sem(a)
-            h = se * scipy.stats.t.ppf((1 + confidence) / 2.0, n - 1)
+            m, se = np.mean(a), stats.sem(a)
+            h = se * stats.t.ppf((1 + confidence) / 2.0, n - 1)
             return m - h, m + h
 
         n_sampling = int(self._n_samples * self._sampling_rate)
@@ -78,6 +80,8 @@ class Accuracy(Metric):
         self._name = self.__class__.__name__
         self._true_labels = true_labels
         self._predicted_labels = predicted_labels
+        from sklearn.metrics import accuracy_score
+
         self._eval_function = accuracy_score
         self._is_print_confidence_interval = is_print_confidence_interval
         self._n_samples = len(self._true_labels)
@@ -96,7 +100,9 @@ class F1score(Metric):
         self._name = self.__class__.__name__
         self._true_labels = true_labels
         self._predicted_labels = predicted_labels
-        self._eval_function = sklearn.metrics.f1_score
+        from sklearn.metrics import f1_score
+
+        self._eval_function = f1_score
         self._is_print_confidence_interval = is_print_confidence_interval
         self._n_samples = len(self._true_labels)
 
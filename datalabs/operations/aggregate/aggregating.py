@@ -1,7 +1,9 @@
-from operation import text_operation, TextOperation
+from operation import STATISTICS_OPERATION, text_operation, TextOperation
 
 
 class Aggregating(TextOperation):
+    kind = STATISTICS_OPERATION
+
     def __init__(
         self,
         *args,
@@ -45,6 +45,9 @@ class AutoEval(Aggregating, DatasetOperation):
         self.generated_field = generated_field
         self._data_type = "Dataset"
 
+    def prepare(self, dataset_info) -> None:
+        self.resources = {"dataset_info": dataset_info}
+
 
 class auto_eval(aggregating, dataset_operation):
     def __init__(
@@ -3,9 +3,6 @@ from typing import Dict, Iterator
 # nltk package for
 import numpy as np
 
-# sklearn is used for tfidf
-from sklearn.feature_extraction.text import TfidfVectorizer
-
 from datalabs.operations.aggregate.aggregating import aggregating
 
 
@@ -89,6 +86,9 @@ def get_tfidf(texts: Iterator) -> int:
     Output:
         dict
     """
+    # sklearn is used for tfidf
+    from sklearn.feature_extraction.text import TfidfVectorizer
+
     vectorizer = TfidfVectorizer()
     tfidf = vectorizer.fit_transform(texts)
     words = vectorizer.get_feature_names()
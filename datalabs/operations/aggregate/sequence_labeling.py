@@ -1,6 +1,4 @@
 from collections import Counter
-import json
-import os
 from typing import Any, Callable, Iterator, List, Mapping, Optional
 
 import numpy as np
@@ -9,6 +7,7 @@ from tqdm import tqdm
 from datalabs.operations.aggregate.aggregating import Aggregating, aggregating
 from datalabs.operations.featurize import get_gender_bias
 from datalabs.operations.operation import dataset_operation, DatasetOperation
+from datalabs.operations.resources import load_resource
 
 
 class SequenceLabelingAggregating(Aggregating, DatasetOperation):
@@ -112,11 +111,7 @@ def get_statistics(samples: Iterator):
 
     """
 
-    scriptpath = os.path.dirname(__file__)
-    with open(
-        os.path.join(scriptpath, "../edit/resources/spell_corrections.json"), "r"
-    ) as file:
-        COMMON_MISSPELLINGS_DICT = json.loads(file.read())
+    COMMON_MISSPELLINGS_DICT = load_resource("spell_corrections")
 
     # for hate speech
     # from hatesonar import Sonar
@@ -1,5 +1,3 @@
-import json
-import os
 from typing import Any, Callable, Iterator, List, Mapping, Optional
 
 import numpy as np
@@ -8,6 +6,7 @@ from tqdm import tqdm
 from datalabs.operations.aggregate.aggregating import Aggregating, aggregating
 from datalabs.operations.featurize.general import get_gender_bias
 from datalabs.operations.operation import dataset_operation, DatasetOperation
+from datalabs.operations.resources import load_resource
 
 
 class TextClassificationAggregating(Aggregating, DatasetOperation):
@@ -187,11 +186,7 @@ def get_statistics(samples: Iterator):
     # spell = SpellChecker()
     # spell = SpellChecker(distance=1)  # set at initialization
 
-    scriptpath = os.path.dirname(__file__)
-    with open(
-        os.path.join(scriptpath, "../edit/resources/spell_corrections.json"), "r"
-    ) as file:
-        COMMON_MISSPELLINGS_DICT = json.loads(file.read())
+    COMMON_MISSPELLINGS_DICT = load_resource("spell_corrections")
 
     # print(COMMON_MISSPELLINGS_DICT)
     # exit()
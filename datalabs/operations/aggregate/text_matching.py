@@ -1,12 +1,16 @@
-from typing import Any, Callable, Iterator, List, Mapping, Optional
+import itertools
+from typing import Any, Callable, Iterable, Iterator, List, Mapping, Optional, Tuple
 
 import numpy as np
-import sacrebleu
 from tqdm import tqdm
 
 from datalabs.operations.aggregate.aggregating import Aggregating, aggregating
 from datalabs.operations.featurize import get_gender_bias
 from datalabs.operations.operation import dataset_operation, DatasetOperation
+from datalabs.utils.text_similarity import sentence_bleu
+
+# number of text pairs whose similarities are computed at once
+SIMILARITY_BATCH_SIZE = 10000
 
 
 class TextMatchingAggregating(Aggregating, DatasetOperation):
@@ -82,6 +86,8 @@ class text_matching_aggregating(aggregating, dataset_operation):
 
 def get_similarity_by_sacrebleu(text1, text2):
     # pip install sacrebleu
+    import sacrebleu
+
     references = [text1]
     hypothesis = text2
     score = sacrebleu.sentence_bleu(hypothesis, references).score
@@ -89,6 +95,23 @@ def get_similarity_by_sacrebleu(text1, text2):
     return score
 
 
+def iter_similarities_by_sacrebleu(
+    samples: Iterable[Mapping[str, str]]
+) -> Iterator[Tuple[Mapping[str, str], float]]:
+    """The samples with the `get_similarity_by_sacrebleu` of their text pair,
+    computed over chunks of `SIMILARITY_BATCH_SIZE` samples as they are read."""
+    samples = iter(samples)
+    while True:
+        chunk = list(itertools.islice(samples, SIMILARITY_BATCH_SIZE))
+        if not chunk:
+            return
+        similarities = sentence_bleu(
+            [sample["text1"] for sample in chunk],
+            [sample["text2"] for sample in chunk],
+        )
+        yield from zip(chunk, similarities)
+
+
 @text_matching_aggregating(
     name="get_statistics",
     contributor="datalab",
@@ -133,25 +156,31 @@ def get_statistics(samples: Iterator):
     #                     "offensive_language":{"ratio":0,"texts":[]},
     #                     "neither":{"ratio":0,"texts":[]}}
     text1_divided_text2 = []
-    similarities = []
 
-    for sample in tqdm(samples):
+    number_of_samples = 0
+    total_similarity = 0.0
 
-        text1, text2, label = sample["text1"], sample["text2"], sample["label"]
+    # the similarities of the pairs are computed by chunks of samples
+    for sample, similarity_of_text_pair in iter_similarities_by_sacrebleu(
+        tqdm(samples)
+    ):
 
-        similarity_of_text_pair = get_similarity_by_sacrebleu(text1, text2)
-        similarities.append(similarity_of_text_pair)
+        text1, text2, label = sample["text1"], sample["text2"], sample["label"]
+        similarity_of_text_pair = float(similarity_of_text_pair)
+        number_of_samples += 1
+        total_similarity += similarity_of_text_pair
+        words1, words2 = text1.split(" "), text2.split(" ")
 
         # average length of text1
-        text1_length = len(text1.split(" "))
+        text1_length = len(words1)
         text1_lengths.append(text1_length)
 
         # average length of text2
-        text2_length = len(text2.split(" "))
+        text2_length = len(words2)
         text2_lengths.append(text2_length)
 
         # text1/text2
-        text1_divided_text2.append(len(text1.split(" ")) / len(text2.split(" ")))
+        text1_divided_text2.append(text1_length / text2_length)
 
         # label info
         if label in labels_to_number.keys():
@@ -212,7 +241,7 @@ def get_statistics(samples: Iterator):
             "text2_gender": gender_result2,
             # "text1_hate_speech_class":class_1,
             # "text2_hate_speech_class":class_2,
-            "text1_divided_text2": len(text1.split(" ")) / len(text2.split(" ")),
+            "text1_divided_text2": text1_length / text2_length,
             "similarity_of_text_pair": similarity_of_text_pair,
         }
         if len(sample_infos) < 10000:
@@ -273,10 +302,10 @@ def get_statistics(samples: Iterator):
                 "distribution": labels_to_number,
             },
             "vocabulary_info": vocab_sorted,
-            "number_of_samples": len(samples),
+            "number_of_samples": number_of_samples,
             "number_of_tokens": number_of_tokens,
             "gender_info": gender_ratio,
-            "average_similarity": np.average(similarities),
+            "average_similarity": total_similarity / number_of_samples,
             # "hatespeech_info": hatespeech,
         },
         "sample-level": sample_infos,
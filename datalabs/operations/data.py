@@ -1,6 +1,12 @@
 from typing import Iterator
 
-from datalabs.operations.operation import OperationFunction, TextOperation
+import pyarrow as pa
+
+from datalabs.operations.operation import (
+    OperationFunction,
+    PER_SAMPLE_OPERATIONS,
+    TextOperation,
+)
 
 
 class Data:
@@ -23,19 +29,28 @@ class TextData(Data):
 
     def apply(self, func: TextOperation):
 
-        if func._type == "Aggregating":
-            yield func([text["text"] for text in self.data])
-        elif func._type in [
-            "Editing",
-            "Preprocessing",
-            "Featurizing",
-            "OperationFunction",
-        ]:
-            for sample in self.data:
-                yield func(sample[func.processed_fields[0]])
+        if func.kind not in PER_SAMPLE_OPERATIONS:
+            # statistics and columns operations take all the texts at once
+            texts = [sample[func.processed_fields[0]] for sample in self.data]
+            yield func.plan().run(texts)
+        elif func.batched:
+            texts = [sample[func.processed_fields[0]] for sample in self.data]
+            batch_size = func.batch_size or len(texts)
+            for offset in range(0, len(texts), batch_size):
+                chunk = texts[offset : offset + batch_size]
+                if func.batch_format == "arrow":
+                    chunk = pa.array(chunk, type=pa.string())
+                columns = func(chunk)
+                columns = {
+                    name: column.to_pylist() if hasattr(column, "to_pylist") else column
+                    for name, column in columns.items()
+                }
+                for i in range(len(next(iter(columns.values())))):
+                    yield {name: column[i] for name, column in columns.items()}
         else:
+            plan = func.plan()
             for sample in self.data:
-                yield func(sample)
+                yield plan.run(sample)
 
 
 class StructuredData(Data):
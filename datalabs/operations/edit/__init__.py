@@ -1,64 +1,39 @@
-from datalabs.operations.edit.general import (  # noqa
-    add_typos_checklist,
-    strip_punctuation_checklist,
-)
-from datalabs.operations.edit.plugins.general.abbreviate.transformation import (  # noqa; noqa
-    abbreviate,
-)
-from datalabs.operations.edit.plugins.general.abbreviate_country_state.transformation import (  # noqa; noqa
-    abbreviate_country_state,
-)
-from datalabs.operations.edit.plugins.general.abbreviate_weekday_month.transformation import (  # noqa; noqa
-    abbreviate_weekday_month,
-)
-from datalabs.operations.edit.plugins.general.add_filler_words.transformation import (  # noqa; noqa
-    add_filler_words,
-)
-from datalabs.operations.edit.plugins.general.add_typo.transformation import (  # noqa
-    add_typo,
-)
-from datalabs.operations.edit.plugins.general.britishize_americanize.transformation import (  # noqa; noqa
-    britishize_americanize,
-)
-from datalabs.operations.edit.plugins.general.change_city_name.transformation import (  # noqa; noqa
-    change_city_name,
-)
-from datalabs.operations.edit.plugins.general.change_color.transformation import (  # noqa; noqa
-    change_color,
-)
+from datalabs.operations.registry import register_operations
 
-# from .plugins.general.change_person_name_by_culture.transformation import *
-from datalabs.operations.edit.plugins.general.change_person_name.transformation import (  # noqa; noqa
-    change_person_name,
-)
-from datalabs.operations.edit.plugins.general.correct_typo.transformation import (  # noqa; noqa
-    correct_typo,
-)
-
-# from .plugins.general.factive_verb.transformation import *
-from datalabs.operations.edit.plugins.general.emojify.transformation import (  # noqa
-    emojify,
-)
-from datalabs.operations.edit.plugins.general.replace_acronyms.transformation import (  # noqa; noqa
-    replace_acronyms,
-)
-from datalabs.operations.edit.plugins.general.replace_greetings.transformation import (  # noqa; noqa
-    replace_greetings,
-)
-from datalabs.operations.edit.plugins.general.replace_hypernyms.transformation import (  # noqa; noqa
-    replace_hypernyms,
-)
-from datalabs.operations.edit.plugins.general.replace_hyponyms.transformation import (  # noqa; noqa
-    replace_hyponyms,
-)
-from datalabs.operations.edit.plugins.general.replace_synonym.transformation import (  # noqa; noqa
-    replace_synonym,
-)
-from datalabs.operations.edit.plugins.general.simple_cipher.transformation import (  # noqa; noqa
-    simple_cipher,
-)
+_plugin = "datalabs.operations.edit.plugins.general.{}.transformation".format
 
-# function from modified xl-augmenter
-from datalabs.operations.edit.plugins.general.slangificator.transformation import (  # noqa; noqa
-    slangificator,
+# operation modules are imported on first access, see datalabs.operations.registry
+__getattr__, __dir__, __all__ = register_operations(
+    __name__,
+    {
+        "add_typos_checklist": "datalabs.operations.edit.general",
+        "strip_punctuation_checklist": "datalabs.operations.edit.general",
+        "strip_punctuation_checklist_batched": "datalabs.operations.edit.general",
+        "abbreviate": _plugin("abbreviate"),
+        "abbreviate_batched": _plugin("abbreviate"),
+        "abbreviate_country_state": _plugin("abbreviate_country_state"),
+        "abbreviate_weekday_month": _plugin("abbreviate_weekday_month"),
+        "add_filler_words": _plugin("add_filler_words"),
+        "add_typo": _plugin("add_typo"),
+        "britishize_americanize": _plugin("britishize_americanize"),
+        "change_city_name": _plugin("change_city_name"),
+        "change_city_name_batched": _plugin("change_city_name"),
+        "change_color": _plugin("change_color"),
+        "change_person_name": _plugin("change_person_name"),
+        "change_person_name_batched": _plugin("change_person_name"),
+        "correct_typo": _plugin("correct_typo"),
+        "correct_typo_batched": _plugin("correct_typo"),
+        "emojify": _plugin("emojify"),
+        "replace_acronyms": _plugin("replace_acronyms"),
+        "replace_greetings": _plugin("replace_greetings"),
+        "replace_hypernyms": _plugin("replace_hypernyms"),
+        "replace_hypernyms_batched": _plugin("replace_hypernyms"),
+        "replace_hyponyms": _plugin("replace_hyponyms"),
+        "replace_hyponyms_batched": _plugin("replace_hyponyms"),
+        "replace_synonym": _plugin("replace_synonym"),
+        "replace_synonym_batched": _plugin("replace_synonym"),
+        "simple_cipher": _plugin("simple_cipher"),
+        "slangificator": _plugin("slangificator"),
+        "slangificator_batched": _plugin("slangificator"),
+    },
 )
@@ -1,7 +1,9 @@
-from operation import text_operation, TextOperation
+from operation import FIELD_OPERATION, text_operation, TextOperation
 
 
 class Editing(TextOperation):
+    kind = FIELD_OPERATION
+
     def __init__(
         self,
         *args,
@@ -29,5 +31,11 @@ class editing(text_operation):
                 contributor=self.contributor,
                 task=self.task,
                 description=self.description,
+                batched=self.batched,
+                batch_size=self.batch_size,
+                batch_format=self.batch_format,
+                preload=self.preload,
+                outputs=self.outputs,
+                variants=self.variants,
             )
             return tf_cls
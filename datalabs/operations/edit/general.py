@@ -1,10 +1,10 @@
+from typing import List, Optional
+
 # checklist package for editing
 from checklist.perturb import Perturb
 
-# spacy package for editing
-import spacy
-
 from datalabs.operations.edit.editing import editing
+from datalabs.utils.spacy_loader import spacy_loader
 
 
 @editing(
@@ -15,10 +15,27 @@ from datalabs.operations.edit.editing import editing
     "Input: I love this movie. How about you? Output: I love this movie. How about you",
 )
 def strip_punctuation_checklist(text: str):
+    doc = spacy_loader.parse(text, pipes=("tagger", "attribute_ruler"))
+    return {"text_strip_punctuation": Perturb.strip_punctuation(doc)}
 
-    nlp = spacy.load("en_core_web_sm")
-    pdata = nlp(text)
-    return {"text_strip_punctuation": Perturb.strip_punctuation(pdata)}
+
+@editing(
+    name="strip_punctuation_checklist_batched",
+    contributor="checklist",
+    task="Any",
+    description="strip the punctuation of a batch of texts, parsed together.",
+    batched=True,
+)
+def strip_punctuation_checklist_batched(
+    texts: List[str], batch_size: Optional[int] = None, n_process: int = 1
+):
+    docs = spacy_loader.pipe(
+        texts,
+        pipes=("tagger", "attribute_ruler"),
+        batch_size=batch_size,
+        n_process=n_process,
+    )
+    return {"text_strip_punctuation": [Perturb.strip_punctuation(doc) for doc in docs]}
 
 
 @editing(
@@ -1,44 +1,32 @@
-import json
 import os
 import os.path
 import random
 import sys
-
-import spacy
+from typing import List
 
 from datalabs.operations.edit.editing import editing
+from datalabs.operations.resources import preload_resources
+from datalabs.utils.phrase_replacer import get_phrase_replacer
+from datalabs.utils.spacy_loader import spacy_loader
 
 sys.path.append(
     os.path.abspath(os.path.join(os.path.dirname(__file__), "../../../../"))
 )
 
 
-@editing(
-    name="abbreviate",
-    contributor="xl_augmenter",
-    task="Any",
-    description="Replaces a word or phrase with its abbreviated counterpart",
-)
-def abbreviate(text, prob=0.5, seed=0, max_outputs=1):
-    scriptpath = os.path.dirname(__file__)
-    with open(
-        os.path.join(scriptpath, "../../../resources/phrase_abbrev_dict.json"), "r"
-    ) as file:
-        phrase_abbrev_dict = json.loads(file.read())
-    with open(
-        os.path.join(scriptpath, "../../../resources/word_abbrev_dict.json"), "r"
-    ) as file:
-        word_abbrev_dict = json.loads(file.read())
-
-    spacy_nlp = spacy.load("en_core_web_sm")
+def _abbreviate(
+    text, phrase_abbrev_dict, word_abbrev_dict, prob=0.5, seed=0, max_outputs=1
+):
     random.seed(seed)
+    replacer = get_phrase_replacer(phrase_abbrev_dict)
     transf = []
     for _ in range(max_outputs):
-        trans_text = text
-        for phrase in phrase_abbrev_dict:
-            if random.random() < prob:
-                trans_text = trans_text.replace(phrase, phrase_abbrev_dict[phrase])
-        doc = spacy_nlp(trans_text).doc
+        # each phrase is selected with probability `prob`, then the selected
+        # phrases are replaced in one pass, the longest first at each position
+        selected = {phrase for phrase in phrase_abbrev_dict if random.random() < prob}
+        trans_text = replacer.replace_selected(text, selected)
+        # the words are only tokenized, no pipe of the model is needed
+        doc = spacy_loader.parse(trans_text, pipes=())
         trans = []
         for token in doc:
             word = token.text
@@ -49,7 +37,58 @@ def abbreviate(text, prob=0.5, seed=0, max_outputs=1):
         trans1 = " ".join([str(word) for word in trans])
         transf.append(trans1)
     # return transf
-    return {"text_abbreviate": transf[0]}
+    return transf[0]
+
+
+@editing(
+    name="abbreviate",
+    contributor="xl_augmenter",
+    task="Any",
+    description="Replaces a word or phrase with its abbreviated counterpart",
+    preload=preload_resources("phrase_abbrev_dict", "word_abbrev_dict"),
+)
+def abbreviate(
+    text: str,
+    prob=0.5,
+    seed=0,
+    max_outputs=1,
+    *,
+    phrase_abbrev_dict,
+    word_abbrev_dict,
+):
+    return {
+        "text_abbreviate": _abbreviate(
+            text, phrase_abbrev_dict, word_abbrev_dict, prob, seed, max_outputs
+        )
+    }
+
+
+@editing(
+    name="abbreviate_batched",
+    contributor="xl_augmenter",
+    task="Any",
+    description="Replaces a word or phrase with its abbreviated counterpart, "
+    "in a batch of texts",
+    batched=True,
+    preload=preload_resources("phrase_abbrev_dict", "word_abbrev_dict"),
+)
+def abbreviate_batched(
+    texts: List[str],
+    prob=0.5,
+    seed=0,
+    max_outputs=1,
+    *,
+    phrase_abbrev_dict,
+    word_abbrev_dict,
+):
+    return {
+        "text_abbreviate": [
+            _abbreviate(
+                text, phrase_abbrev_dict, word_abbrev_dict, prob, seed, max_outputs
+            )
+            for text in texts
+        ]
+    }
 
 
 # sentence = "I will turn in the homework on Friday for sure!"
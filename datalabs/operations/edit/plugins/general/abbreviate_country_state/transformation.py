@@ -1,11 +1,11 @@
 from collections import defaultdict
-import json
 import os
 import random
 import re
 import sys
 
 from datalabs.operations.edit.editing import editing
+from datalabs.operations.resources import preload_resources
 
 sys.path.append(
     os.path.abspath(os.path.join(os.path.dirname(__file__), "../../../../"))
@@ -26,6 +26,7 @@ def dict_value_helper(d, key):
     task="Any",
     description="this function adds Country/State name/abbreviation with"
     " flexible options: Pennsylvania -> PA or PA -> Pennsylvania",
+    preload=preload_resources("country_state_abbreviation"),
 )
 def abbreviate_country_state(
     text: str,
@@ -35,15 +36,11 @@ def abbreviate_country_state(
     country_filter="USA",
     abbr=True,
     exp=True,
+    *,
+    country_state_abbreviation,
 ):
 
-    abbr_file_path = os.path.join(
-        os.path.dirname(os.path.abspath(__file__)),
-        "../../../resources/country_state_abbreviation.json",
-    )
-
-    with open(abbr_file_path, "r") as file:
-        abbr_json = json.loads(file.read())
+    abbr_json = country_state_abbreviation
 
     country_abbr = {country["name"]: country["abbr"] for country in abbr_json}
     country_exp = {country["abbr"]: country["name"] for country in abbr_json}
@@ -1,9 +1,9 @@
-import json
 import os
 import re
 import sys
 
 from datalabs.operations.edit.editing import editing
+from datalabs.operations.resources import preload_resources
 
 sys.path.append(
     os.path.abspath(os.path.join(os.path.dirname(__file__), "../../../../"))
@@ -35,27 +35,15 @@ def weekday_month_abbreviate(text, abbreviations, expansions, max_outputs=1):
     task="Any",
     description="this function adds noise to all types of text sources"
     " (sentence, paragraph, etc.) containing names of weekdays or months.",
+    preload=preload_resources("weekday_month_abb_en", "weekday_month_exp_en"),
 )
-def abbreviate_weekday_month(text: str, max_outputs=1):
-    abbreviations_path = os.path.join(
-        os.path.dirname(os.path.abspath(__file__)),
-        "../../../resources/weekday_month_abb_en.json",
-    )
-    expansions_path = os.path.join(
-        os.path.dirname(os.path.abspath(__file__)),
-        "../../../resources/weekday_month_exp_en.json",
-    )
-
-    with open(abbreviations_path, "r") as file:
-        abbreviations = json.loads(file.read())
-
-    with open(expansions_path, "r") as file:
-        expansions = json.loads(file.read())
-
+def abbreviate_weekday_month(
+    text: str, max_outputs=1, *, weekday_month_abb_en, weekday_month_exp_en
+):
     perturbed_texts = weekday_month_abbreviate(
         text=text,
-        abbreviations=abbreviations,
-        expansions=expansions,
+        abbreviations=weekday_month_abb_en,
+        expansions=weekday_month_exp_en,
         max_outputs=max_outputs,
     )
     # return perturbed_texts
@@ -1,9 +1,9 @@
-import json
 import os
 import random
 import sys
 
 from datalabs.operations.edit.editing import editing
+from datalabs.operations.resources import preload_resources
 
 sys.path.append(
     os.path.abspath(os.path.join(os.path.dirname(__file__), "../../../../"))
@@ -21,7 +21,7 @@ def generate_sentence(sentence, spell_errors, prob_of_typo, seed):
     for word in sentence.split():
         random.seed(seed)
         if (
-            word.lower() in list(spell_errors.keys())
+            word.lower() in spell_errors
             and random.choice(range(0, 100)) <= prob_of_typo
         ):
             output.append(random.choice(spell_errors[word.lower()]))
@@ -31,13 +31,7 @@ def generate_sentence(sentence, spell_errors, prob_of_typo, seed):
     return output
 
 
-def generate_sentences(text, prob=0.1, seed=0, max_outputs=1):
-
-    scriptpath = os.path.dirname(__file__)
-    with open(
-        os.path.join(scriptpath, "../../../resources/spell_errors.json"), "r"
-    ) as file:
-        spell_errors = json.loads(file.read())
+def generate_sentences(text, spell_errors, prob=0.1, seed=0, max_outputs=1):
 
     prob_of_typo = int(prob * 100)
 
@@ -48,16 +42,32 @@ def generate_sentences(text, prob=0.1, seed=0, max_outputs=1):
     return perturbed_texts
 
 
+def add_typo_variants(text: str, n_variants=1, seed=0, *, spell_errors):
+    return [
+        {"text_add_typo": perturbed_text}
+        for perturbed_text in generate_sentences(
+            text=text,
+            spell_errors=spell_errors,
+            prob=0.20,
+            seed=seed,
+            max_outputs=n_variants,
+        )
+    ]
+
+
 @editing(
     name="add_typo",
     contributor="xl_augmenter",
     task="Any",
     description="this function adds a typo into a text",
+    preload=preload_resources("spell_errors"),
+    variants=add_typo_variants,
 )
-def add_typo(text: str, seed=0, max_outputs=2):
+def add_typo(text: str, seed=0, max_outputs=2, *, spell_errors):
 
     perturbed_texts = generate_sentences(
         text=text,
+        spell_errors=spell_errors,
         prob=0.20,
         seed=seed,
         max_outputs=max_outputs,
@@ -2,10 +2,11 @@ import hashlib
 import os
 import random
 import sys
-
-import spacy
+from typing import List, Optional
 
 from datalabs.operations.edit.editing import editing
+from datalabs.operations.resources import preload_resources
+from datalabs.utils.spacy_loader import spacy_loader
 
 sys.path.append(
     os.path.abspath(os.path.join(os.path.dirname(__file__), "../../../../"))
@@ -71,35 +72,13 @@ def create_ents_dict(doc):
     return spans
 
 
-@editing(
-    name="change_city_name",
-    contributor="xl_augmenter",
-    task="Any",
-    description="replaces instances of populous and well-known cities in "
-    "a sentence with instances of less populous and less"
-    " well-known cities.",
-)
-def change_city_name(text: str, seed=None):
-
-    spacy_nlp = spacy.load("en_core_web_sm")
-    doc = spacy_nlp(text)
-
-    scriptpath = os.path.dirname(__file__)
-    f_pop = open(os.path.join(scriptpath, "../../../resources/Eng_Pop.txt"))
-    f_scarce = open(os.path.join(scriptpath, "../../../resources/Eng_Scarce.txt"))
-
-    populous_cities = f_pop.read().split("\n")
-    scarce_cities = f_scarce.read().split("\n")
-
-    f_pop.close()
-    f_scarce.close()
-
+def _change_city_name(doc, populous_cities, scarce_cities, seed=None):
     if seed is not None:
         random.seed(seed)
     ents_dict = create_ents_dict(doc)
     sent_words = []
     for i in ents_dict:
-        if i["Word"] in list(populous_cities) and (
+        if i["Word"] in populous_cities and (
             i["Entity"] == "GPE" or i["Entity"] == "LOC"
         ):
             sent_words.append("<CITY>")
@@ -109,9 +88,61 @@ def change_city_name(text: str, seed=None):
     while "<CITY>" in new_sentence:
         rand_city = scarce_cities[random.randint(0, len(scarce_cities))]
         new_sentence = new_sentence.replace("<CITY>", rand_city, 1)
+    return new_sentence
 
+
+@editing(
+    name="change_city_name",
+    contributor="xl_augmenter",
+    task="Any",
+    description="replaces instances of populous and well-known cities in "
+    "a sentence with instances of less populous and less"
+    " well-known cities.",
+    preload=preload_resources("populous_cities", "scarce_cities"),
+)
+def change_city_name(
+    text: str,
+    seed=None,
+    *,
+    populous_cities,
+    scarce_cities,
+):
+    doc = spacy_loader.parse(text, pipes=("ner",))
     # return new_sentence
-    return {"text_change_city_name": new_sentence}
+    return {
+        "text_change_city_name": _change_city_name(
+            doc, populous_cities, scarce_cities, seed
+        )
+    }
+
+
+@editing(
+    name="change_city_name_batched",
+    contributor="xl_augmenter",
+    task="Any",
+    description="replaces instances of populous and well-known cities in "
+    "a batch of sentences with instances of less populous and less"
+    " well-known cities.",
+    batched=True,
+    preload=preload_resources("populous_cities", "scarce_cities"),
+)
+def change_city_name_batched(
+    texts: List[str],
+    seed=None,
+    batch_size: Optional[int] = None,
+    n_process: int = 1,
+    *,
+    populous_cities,
+    scarce_cities,
+):
+    docs = spacy_loader.pipe(
+        texts, pipes=("ner",), batch_size=batch_size, n_process=n_process
+    )
+    return {
+        "text_change_city_name": [
+            _change_city_name(doc, populous_cities, scarce_cities, seed) for doc in docs
+        ]
+    }
 
 
 # sentence = "The team was established in Dallas in 1898 and was a
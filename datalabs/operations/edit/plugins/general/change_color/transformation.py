@@ -1,4 +1,3 @@
-import json
 import os
 import random
 import sys
@@ -7,6 +6,7 @@ import nltk
 from nltk.tokenize.treebank import TreebankWordDetokenizer
 
 from datalabs.operations.edit.editing import editing
+from datalabs.operations.resources import preload_resources
 
 sys.path.append(
     os.path.abspath(os.path.join(os.path.dirname(__file__), "../../../../"))
@@ -26,14 +26,11 @@ def get_(big_list, small_list):
     task="Any",
     description="This transformation augments the input sentence"
     " by randomly replacing colors.",
+    preload=preload_resources("color_names"),
 )
-def change_color(text: str, max_outputs=1, seed=0, mapping: dict = None):
-
-    scriptpath = os.path.dirname(__file__)
-    with open(os.path.join(scriptpath, "../../../resources/colors.json"), "r") as file:
-        colors_dict = json.loads(file.read())
-
-    color_names = [color["name"] for color in colors_dict.values()]
+def change_color(
+    text: str, max_outputs=1, seed=0, mapping: dict = None, *, color_names
+):
 
     if mapping is None:
         mapping = {}
@@ -1,16 +1,28 @@
 import os
 import sys
+from typing import List, Optional
 
 from checklist.perturb import Perturb
-import spacy
 
 from datalabs.operations.edit.editing import editing
+from datalabs.utils.spacy_loader import spacy_loader
 
 sys.path.append(
     os.path.abspath(os.path.join(os.path.dirname(__file__), "../../../../"))
 )
 
 
+def _change_person_name(text, doc, max_outputs=1):
+    perturbed = Perturb.perturb([doc], Perturb.change_names, nsamples=1)
+
+    # print(perturbed.data)
+    perturbed_texts = (
+        perturbed.data[0][1 : max_outputs + 1] if len(perturbed.data) > 0 else [text]
+    )
+    # return perturbed_texts
+    return perturbed_texts[0]
+
+
 @editing(
     name="change_person_name",
     contributor="xl_augmenter",
@@ -18,16 +30,32 @@ sys.path.append(
     description="Changes person named entities",
 )
 def change_person_name(text: str, max_outputs=1):
+    doc = spacy_loader.parse(text, pipes=("ner",))
+    return {"text_change_person_name": _change_person_name(text, doc, max_outputs)}
 
-    spacy_nlp = spacy.load("en_core_web_sm")
-    perturbed = Perturb.perturb([spacy_nlp(text)], Perturb.change_names, nsamples=1)
 
-    # print(perturbed.data)
-    perturbed_texts = (
-        perturbed.data[0][1 : max_outputs + 1] if len(perturbed.data) > 0 else [text]
+@editing(
+    name="change_person_name_batched",
+    contributor="xl_augmenter",
+    task="Any",
+    description="Changes person named entities of a batch of texts",
+    batched=True,
+)
+def change_person_name_batched(
+    texts: List[str],
+    max_outputs=1,
+    batch_size: Optional[int] = None,
+    n_process: int = 1,
+):
+    docs = spacy_loader.pipe(
+        texts, pipes=("ner",), batch_size=batch_size, n_process=n_process
     )
-    # return perturbed_texts
-    return {"text_change_person_name": perturbed_texts[0]}
+    return {
+        "text_change_person_name": [
+            _change_person_name(text, doc, max_outputs)
+            for text, doc in zip(texts, docs)
+        ]
+    }
 
 
 # sentence = "Andrew finally returned the French book to Chris that I bought last week"
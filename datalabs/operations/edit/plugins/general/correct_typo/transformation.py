@@ -1,43 +1,62 @@
-import json
 import os
 import sys
-
-import spacy
+from typing import List, Optional
 
 from datalabs.operations.edit.editing import editing
+from datalabs.operations.resources import preload_resources
+from datalabs.utils.spacy_loader import spacy_loader
 
 sys.path.append(
     os.path.abspath(os.path.join(os.path.dirname(__file__), "../../../../"))
 )
 
 
+def _correct_typo(doc, spell_corrections):
+    perturbed_text = [
+        spell_corrections.get(token.text, token.text) + " "
+        if token.whitespace_
+        else spell_corrections.get(token.text, token.text)
+        for token in doc
+    ]
+    # return ["".join(perturbed_text)]
+    return "".join(perturbed_text)
+
+
 @editing(
     name="correct_typo",
     contributor="xl_augmenter",
     task="Any",
     description="This transformation perturbs text to correct common misspellings",
+    preload=preload_resources("spell_corrections"),
 )
-def correct_typo(text: str):
-
-    scriptpath = os.path.dirname(__file__)
-    with open(
-        os.path.join(scriptpath, "../../../resources/spell_corrections.json"), "r"
-    ) as file:
-        COMMON_MISSPELLINGS_DICT = json.loads(file.read())
-
-    spacy_nlp = spacy.load("en_core_web_sm")
+def correct_typo(text: str, *, spell_corrections):
+    # the words are only tokenized, no pipe of the model is needed
+    doc = spacy_loader.parse(text, pipes=())
+    return {"text_correct_typo": _correct_typo(doc, spell_corrections)}
 
-    doc = spacy_nlp(text)
 
-    perturbed_text = [
-        COMMON_MISSPELLINGS_DICT.get(token.text, token.text) + " "
-        if token.whitespace_
-        else COMMON_MISSPELLINGS_DICT.get(token.text, token.text)
-        for token in doc
-    ]
-    # return ["".join(perturbed_text)]
-
-    return {"text_correct_typo": "".join(perturbed_text)}
+@editing(
+    name="correct_typo_batched",
+    contributor="xl_augmenter",
+    task="Any",
+    description="This transformation perturbs a batch of texts to correct common "
+    "misspellings",
+    batched=True,
+    preload=preload_resources("spell_corrections"),
+)
+def correct_typo_batched(
+    texts: List[str],
+    batch_size: Optional[int] = None,
+    n_process: int = 1,
+    *,
+    spell_corrections,
+):
+    docs = spacy_loader.pipe(
+        texts, pipes=(), batch_size=batch_size, n_process=n_process
+    )
+    return {
+        "text_correct_typo": [_correct_typo(doc, spell_corrections) for doc in docs]
+    }
 
 
 # sentence = "Andrew andd Alice finally returnd the French
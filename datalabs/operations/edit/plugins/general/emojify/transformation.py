@@ -1,10 +1,10 @@
-import json
 import os
 import random
 import sys
 from typing import List
 
 from datalabs.operations.edit.editing import editing
+from datalabs.operations.resources import preload_resources
 
 sys.path.append(
     os.path.abspath(os.path.join(os.path.dirname(__file__), "../../../../"))
@@ -52,24 +52,17 @@ def emoji2icon(
     task="Any",
     description="augments the input sentence by swapping words into"
     " emojis with similar meanings.",
+    preload=preload_resources("text2emoji", "text2icon"),
 )
 def emojify(
-    text: str, seed: int = 42, max_outputs: int = 1, emoji_to_icon: bool = False
+    text: str,
+    seed: int = 42,
+    max_outputs: int = 1,
+    emoji_to_icon: bool = False,
+    *,
+    text2emoji,
+    text2icon,
 ):
-    text2emoji_path = os.path.join(
-        os.path.dirname(os.path.abspath(__file__)), "../../../resources/text2emoji.json"
-    )
-
-    text2icon_path = os.path.join(
-        os.path.dirname(os.path.abspath(__file__)), "../../../resources/text2icon.json"
-    )
-
-    with open(text2emoji_path, "r") as file:
-        text2emoji = json.loads(file.read())
-
-    with open(text2icon_path, "r") as file:
-        text2icon = json.loads(file.read())
-
     perturbed_texts = emoji2icon(
         text=text,
         text2emoji=text2emoji,
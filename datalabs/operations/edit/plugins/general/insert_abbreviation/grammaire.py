@@ -367,6 +367,30 @@ def indexonheadrgx(automate, w, head):
         automate[w] = [head]
 
 
+# ------------------------------------------------------------------------------
+# The rules of a first token are also indexed on the token their second element
+# requires, so that only the rules that can match the next token are tried.
+# Rules whose second element isn't a single token are kept for any next token
+# (under None), and the order of the rules is preserved.
+# ------------------------------------------------------------------------------
+def indexonnext(automate):
+    nexts = {}
+    for token, heads in automate["_++_"].items():
+        required = []
+        for head in heads:
+            rule = automate[head]
+            if len(rule) and rule[0][0] == regularone:
+                required.append(rule[0][1])
+            else:
+                required.append(None)
+        index = {None: [h for h, r in zip(heads, required) if r is None]}
+        for w in set(required):
+            if w is not None:
+                index[w] = [h for h, r in zip(heads, required) if r in (None, w)]
+        nexts[token] = index
+    return nexts
+
+
 # ------------------------------------------------------------------------------
 # The compiler itself
 # ------------------------------------------------------------------------------
@@ -425,6 +449,7 @@ def compiling(v, functions):
                 else:
                     rule.append(e)
         automate[head] = rule[:]
+    automate["_+>_"] = indexonnext(automate)
     return automate
 
 
@@ -930,6 +955,7 @@ def checkrule(a, sz, ruleheads, tokens, i):
 def parse(txt, a):
     heads = a["_++_"]
     regs = a["_**_"]
+    nexts = a["_+>_"]
     # We tokenizing our own in-house tokenizer version...
     # The other version considers the text to be some kind of Python code
     tokens, offsets, rawtokens = tokenizing_sentence(txt)
@@ -939,7 +965,11 @@ def parse(txt, a):
     while i < sz:
         token = tokens[i]
         if token in heads:
-            ruleheads = heads[token]
+            ruleheads = nexts[token]
+            if i + 1 < sz and tokens[i + 1] in ruleheads:
+                ruleheads = ruleheads[tokens[i + 1]]
+            else:
+                ruleheads = ruleheads[None]
             ret = checkrule(a, sz, ruleheads, tokens, i)
             if ret:
                 p = [offsets[i][0], offsets[ret[1] - 1][1]]
@@ -1,14 +1,29 @@
+from functools import partial
+import hashlib
 import os
+import pickle
 import sys
 
-import grammaire
-
+from datalabs import config
 from datalabs.operations.edit.editing import editing
+from datalabs.operations.edit.plugins.general.insert_abbreviation import grammaire
+from datalabs.operations.resources import (
+    EDIT_RESOURCES_DIR,
+    preload_resources,
+    register_resource,
+)
+from datalabs.utils.logging import get_logger
 
 sys.path.append(
     os.path.abspath(os.path.join(os.path.dirname(__file__), "../../../../"))
 )
 
+logger = get_logger(__name__)
+
+# compiled grammars persisted across processes, named after the hash of their
+# rules file and of the grammar compiler
+GRAMMARS_CACHE = config.HF_DATASETS_CACHE / "grammars"
+
 
 def readfile(file):
     with open(file, encoding="utf8") as input:
@@ -22,27 +37,39 @@ def load_rules(file):
     return str_rules
 
 
-@editing(
-    name="insert_abbreviation",
-    contributor="xl_augmenter",
-    task="Any",
-    description="This perturbation replaces in texts some well"
-    " known words or expressions with (one of) their abbreviations.",
-)
-def insert_abbreviation(
-    text: str,
-    max_outputs=1,
-    seed=0,
-):
-
-    current_path = os.path.realpath(__file__).replace(
-        os.path.basename(__file__), "../../../resources/"
+def _load_grammar(file_name: str) -> dict:
+    rulefile = os.path.join(EDIT_RESOURCES_DIR, file_name)
+    rules = load_rules(rulefile)
+    fingerprint = hashlib.sha256(rules.encode("utf8"))
+    with open(grammaire.__file__, "rb") as compiler:
+        fingerprint.update(compiler.read())
+    cache_file = GRAMMARS_CACHE / (
+        f"{os.path.splitext(file_name)[0]}-{fingerprint.hexdigest()[:16]}.pkl"
     )
-    rulefile_en = f"{current_path}replacement_rules_en.txt"
-    rules_en = load_rules(rulefile_en)
-    # First we compile our rules...
-    grammar_en = grammaire.compile(rules_en)
+    if cache_file.exists():
+        try:
+            with open(cache_file, "rb") as input:
+                return pickle.load(input)
+        except Exception as err:
+            logger.warning(f"Couldn't load the compiled grammar {cache_file}: {err}")
+
+    grammar = grammaire.compile(rules)
+    try:
+        GRAMMARS_CACHE.mkdir(parents=True, exist_ok=True)
+        tmp_file = cache_file.with_suffix(f".{os.getpid()}.tmp")
+        with open(tmp_file, "wb") as output:
+            pickle.dump(grammar, output)
+        os.replace(tmp_file, cache_file)
+    except OSError as err:
+        logger.warning(f"Couldn't save the compiled grammar {cache_file}: {err}")
+    return grammar
 
+
+register_resource("grammar_en", partial(_load_grammar, "replacement_rules_en.txt"))
+
+
+def _insert_abbreviation(text: str, grammar_en) -> str:
+    # the rules are compiled once (see `_load_grammar`)
     results = grammaire.parse(text, grammar_en)
     # We now replace the strings with their label
     perturbed_texts = text
@@ -57,9 +84,31 @@ def insert_abbreviation(
         perturbed_texts = (
             perturbed_texts[:from_token] + v[0] + perturbed_texts[to_token:]
         )
-    # return [perturbed_texts]
+    return perturbed_texts
+
+
+def insert_abbreviation_variants(text: str, n_variants=1, seed=0, *, grammar_en):
+    # the rules are applied deterministically: a single variant
+    return [{"text_insert_abbreviation": _insert_abbreviation(text, grammar_en)}]
 
-    return {"text_insert_abbreviation": perturbed_texts}
+
+@editing(
+    name="insert_abbreviation",
+    contributor="xl_augmenter",
+    task="Any",
+    description="This perturbation replaces in texts some well"
+    " known words or expressions with (one of) their abbreviations.",
+    preload=preload_resources("grammar_en"),
+    variants=insert_abbreviation_variants,
+)
+def insert_abbreviation(
+    text: str,
+    max_outputs=1,
+    seed=0,
+    *,
+    grammar_en,
+):
+    return {"text_insert_abbreviation": _insert_abbreviation(text, grammar_en)}
 
 
 # sentence = "Make sure you've gone online to download one of
@@ -2,6 +2,8 @@ import os
 import sys
 
 from datalabs.operations.edit.editing import editing
+from datalabs.operations.resources import preload_resources
+from datalabs.utils.phrase_replacer import get_phrase_replacer
 
 sys.path.append(
     os.path.abspath(os.path.join(os.path.dirname(__file__), "../../../../"))
@@ -9,20 +11,9 @@ sys.path.append(
 
 
 def transformation(sentence, lowercase, acronyms):
-    new_sentence = sentence
-    lower_sentece = sentence.lower()
-    for key in acronyms.keys():
-        lower_key = key.lower()
-        if key in new_sentence:
-            new_sentence = new_sentence.replace(key, acronyms[key])
-        elif lowercase and (lower_key in lower_sentece):
-            key_index = lower_sentece.index(lower_key)
-            key_end = key_index + len(key)
-            new_sentence = (
-                new_sentence[:key_index] + acronyms[key] + new_sentence[key_end:]
-            )
-
-    return new_sentence
+    # one pass over the sentence, the longest acronym found at each position is
+    # replaced (whatever its case if `lowercase`)
+    return get_phrase_replacer(acronyms, ignore_case=lowercase).replace(sentence)
 
 
 @editing(
@@ -31,26 +22,9 @@ def transformation(sentence, lowercase, acronyms):
     task="Any",
     description="This transformation changes abbreviations and acronyms"
     " appearing in a text to their expanded form and respectively,",
+    preload=preload_resources("acronyms"),
 )
-def replace_acronyms(text: str, seed=0, max_outputs=1, lowercase=False):
-
-    acronyms_file_path = os.path.join(
-        os.path.dirname(os.path.abspath(__file__)), "../../../resources/acronyms.tsv"
-    )
-    # print(acronyms_file_path)
-    sep = "\t"
-
-    # Load acronyms from file
-    temp_acronyms = {}
-    with open(acronyms_file_path, "r") as file:
-        for line in file:
-            key, value = line.strip().split(sep)
-            temp_acronyms[key] = value
-    # Place long keys first to prevent overlapping
-    acronyms = {}
-    for k in sorted(temp_acronyms, key=len, reverse=True):
-        acronyms[k] = temp_acronyms[k]
-
+def replace_acronyms(text: str, seed=0, max_outputs=1, lowercase=False, *, acronyms):
     # return [transformation(text, lowercase, acronyms)]
 
     return {"text_replace_acronyms": transformation(text, lowercase, acronyms)}
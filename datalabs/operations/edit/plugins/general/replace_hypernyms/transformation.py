@@ -1,33 +1,24 @@
 import os
 import random
 import sys
+from typing import List, Optional
 
-from checklist.editor import Editor
 import numpy as np
-import spacy
 
 from datalabs.operations.edit.editing import editing
+from datalabs.operations.edit.substitutions import WORDNET_POS
+from datalabs.operations.resources import preload_resources
+from datalabs.utils.spacy_loader import spacy_loader
 
 sys.path.append(
     os.path.abspath(os.path.join(os.path.dirname(__file__), "../../../../"))
 )
 
 
-@editing(
-    name="replace_hypernyms",
-    contributor="xl_augmenter",
-    task="Any",
-    description=" This operation makes lexical substitutions using"
-    " hypernyms of the common nouns in a sentence when possible.",
-)
-def replace_hypernyms(text: str, n=1, seed=0, max_outputs=1):
-    nlp = spacy.load("en_core_web_sm")
-    editor = Editor()
-
+def _hypernyms_variants(text, tokens, table, seed=0, max_outputs=1):
     np.random.seed(seed)
     words = []
     perturbed_texts = []
-    tokens = nlp(text)
     # Shuffle the tokens list so that all noun (and not just the beginning nouns)
     # have a fair chance at being picked.
     shuf_tokens = list(tokens)
@@ -36,17 +27,110 @@ def replace_hypernyms(text: str, n=1, seed=0, max_outputs=1):
     for token in shuf_tokens:
         if token.pos_ == "NOUN":
             words.append(token)
-            hyp_list = editor.hypernyms(text, token.text)
+            hyp_list = table.get(
+                token.lemma_ or token.text, WORDNET_POS["NOUN"], "hypernyms"
+            )
             for hyp in hyp_list:
                 # Replace the noun with the hyponym
                 perturbed_texts.append(text.replace(token.text, hyp))
             if len(perturbed_texts) >= max_outputs:
                 break
-    perturbed_texts = (
-        perturbed_texts[:max_outputs] if len(perturbed_texts) > 0 else [text]
+    return perturbed_texts[:max_outputs] if len(perturbed_texts) > 0 else [text]
+
+
+def _replace_hypernyms(text, tokens, table, seed=0, max_outputs=1):
+    return _hypernyms_variants(text, tokens, table, seed, max_outputs)[0]
+
+
+def replace_hypernyms_variants(
+    text: str, n_variants=1, seed=0, *, wordnet_substitutions
+):
+    # the text is parsed once for all its variants
+    doc = spacy_loader.parse(text, pipes=("tagger", "attribute_ruler", "lemmatizer"))
+    return [
+        {"text_replace_hypernyms": perturbed_text}
+        for perturbed_text in _hypernyms_variants(
+            text, doc, wordnet_substitutions, seed, n_variants
+        )
+    ]
+
+
+@editing(
+    name="replace_hypernyms",
+    contributor="xl_augmenter",
+    task="Any",
+    description=" This operation makes lexical substitutions using"
+    " hypernyms of the common nouns in a sentence when possible.",
+    preload=preload_resources("wordnet_substitutions"),
+    variants=replace_hypernyms_variants,
+)
+def replace_hypernyms(text: str, n=1, seed=0, max_outputs=1, *, wordnet_substitutions):
+    doc = spacy_loader.parse(text, pipes=("tagger", "attribute_ruler", "lemmatizer"))
+    return {
+        "text_replace_hypernyms": _replace_hypernyms(
+            text, doc, wordnet_substitutions, seed, max_outputs
+        )
+    }
+
+
+def replace_hypernyms_batched_variants(
+    texts: List[str],
+    n_variants=1,
+    seed=0,
+    batch_size: Optional[int] = None,
+    n_process: int = 1,
+    *,
+    wordnet_substitutions,
+):
+    docs = spacy_loader.pipe(
+        texts,
+        pipes=("tagger", "attribute_ruler", "lemmatizer"),
+        batch_size=batch_size,
+        n_process=n_process,
+    )
+    return [
+        [
+            {"text_replace_hypernyms": perturbed_text}
+            for perturbed_text in _hypernyms_variants(
+                text, doc, wordnet_substitutions, seed, n_variants
+            )
+        ]
+        for text, doc in zip(texts, docs)
+    ]
+
+
+@editing(
+    name="replace_hypernyms_batched",
+    contributor="xl_augmenter",
+    task="Any",
+    description=" This operation makes lexical substitutions using"
+    " hypernyms of the common nouns in a batch of sentences when possible.",
+    batched=True,
+    preload=preload_resources("wordnet_substitutions"),
+    variants=replace_hypernyms_batched_variants,
+)
+def replace_hypernyms_batched(
+    texts: List[str],
+    n=1,
+    seed=0,
+    max_outputs=1,
+    batch_size: Optional[int] = None,
+    n_process: int = 1,
+    *,
+    wordnet_substitutions,
+):
+    docs = spacy_loader.pipe(
+        texts,
+        pipes=("tagger", "attribute_ruler", "lemmatizer"),
+        batch_size=batch_size,
+        n_process=n_process,
     )
-    # return perturbed_texts
-    return {"text_replace_hypernyms": perturbed_texts[0]}
+    return {
+        "text_replace_hypernyms": [
+            _replace_hypernyms(text, doc, wordnet_substitutions, seed, max_outputs)
+            for text, doc in zip(texts, docs)
+        ]
+    }
 
 
 # sentence = "Andrew finally returned the French book to Chris that I bought last week."
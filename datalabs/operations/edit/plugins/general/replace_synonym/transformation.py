@@ -1,13 +1,14 @@
 import os
 import re
 import sys
+from typing import List, Optional
 
-import nltk
-from nltk.corpus import wordnet
 import numpy as np
-import spacy
 
 from datalabs.operations.edit.editing import editing
+from datalabs.operations.edit.substitutions import WORDNET_POS
+from datalabs.operations.resources import preload_resources
+from datalabs.utils.spacy_loader import spacy_loader
 
 sys.path.append(
     os.path.abspath(os.path.join(os.path.dirname(__file__), "../../../../"))
@@ -32,39 +33,22 @@ def untokenize(words):
     return step6.strip()
 
 
-@editing(
-    name="replace_synonym",
-    contributor="xl_augmenter",
-    task="Any",
-    description="Inserting synonyms of random words excluding"
-    " punctuations and stopwords.",
-)
-def replace_synonym(text, seed=42, prob=0.5, max_outputs=1):
-    nlp = spacy.load("en_core_web_sm")
-    nltk.download("wordnet")
+def _synonym_variants(doc, table, seed=42, prob=0.5, max_outputs=1):
     np.random.seed(seed)
-    upos_wn_dict = {
-        "VERB": "v",
-        "NOUN": "n",
-        "ADV": "r",
-        "ADJ": "s",
-    }
 
-    doc = nlp(text)
     results = []
     for _ in range(max_outputs):
         result = []
         for token in doc:
             word = token.text
-            wn_pos = upos_wn_dict.get(token.pos_)
+            wn_pos = WORDNET_POS.get(token.pos_)
             if wn_pos is None:
                 result.append(word)
             else:
-                syns = wordnet.synsets(word, pos=wn_pos)
-                syns = [syn.name().split(".")[0] for syn in syns]
+                syns = table.get(token.lemma_ or word, wn_pos, "synonyms")
                 syns = [syn for syn in syns if syn.lower() != word.lower()]
                 if len(syns) > 0 and np.random.random() < prob:
-                    result.append(np.random.choice(syns).replace("_", " "))
+                    result.append(np.random.choice(syns))
                 else:
                     result.append(word)
 
@@ -74,8 +58,105 @@ def replace_synonym(text, seed=42, prob=0.5, max_outputs=1):
             # make sure there is no dup in results
             results.append(result)
 
-    return {"text_replace_synonym": results[0]}
-    # return results
+    return results
+
+
+def _replace_synonym(doc, table, seed=42, prob=0.5, max_outputs=1):
+    return _synonym_variants(doc, table, seed, prob, max_outputs)[0]
+
+
+def replace_synonym_variants(
+    text: str, n_variants=1, seed=42, prob=0.5, *, wordnet_substitutions
+):
+    # the text is parsed once for all its variants
+    doc = spacy_loader.parse(text, pipes=("tagger", "attribute_ruler", "lemmatizer"))
+    return [
+        {"text_replace_synonym": result}
+        for result in _synonym_variants(
+            doc, wordnet_substitutions, seed, prob, n_variants
+        )
+    ]
+
+
+@editing(
+    name="replace_synonym",
+    contributor="xl_augmenter",
+    task="Any",
+    description="Inserting synonyms of random words excluding"
+    " punctuations and stopwords.",
+    preload=preload_resources("wordnet_substitutions"),
+    variants=replace_synonym_variants,
+)
+def replace_synonym(
+    text: str, seed=42, prob=0.5, max_outputs=1, *, wordnet_substitutions
+):
+    doc = spacy_loader.parse(text, pipes=("tagger", "attribute_ruler", "lemmatizer"))
+    return {
+        "text_replace_synonym": _replace_synonym(
+            doc, wordnet_substitutions, seed, prob, max_outputs
+        )
+    }
+
+
+def replace_synonym_batched_variants(
+    texts: List[str],
+    n_variants=1,
+    seed=42,
+    prob=0.5,
+    batch_size: Optional[int] = None,
+    n_process: int = 1,
+    *,
+    wordnet_substitutions,
+):
+    docs = spacy_loader.pipe(
+        texts,
+        pipes=("tagger", "attribute_ruler", "lemmatizer"),
+        batch_size=batch_size,
+        n_process=n_process,
+    )
+    return [
+        [
+            {"text_replace_synonym": result}
+            for result in _synonym_variants(
+                doc, wordnet_substitutions, seed, prob, n_variants
+            )
+        ]
+        for doc in docs
+    ]
+
+
+@editing(
+    name="replace_synonym_batched",
+    contributor="xl_augmenter",
+    task="Any",
+    description="Inserting synonyms of random words excluding"
+    " punctuations and stopwords, in a batch of texts.",
+    batched=True,
+    preload=preload_resources("wordnet_substitutions"),
+    variants=replace_synonym_batched_variants,
+)
+def replace_synonym_batched(
+    texts: List[str],
+    seed=42,
+    prob=0.5,
+    max_outputs=1,
+    batch_size: Optional[int] = None,
+    n_process: int = 1,
+    *,
+    wordnet_substitutions,
+):
+    docs = spacy_loader.pipe(
+        texts,
+        pipes=("tagger", "attribute_ruler", "lemmatizer"),
+        batch_size=batch_size,
+        n_process=n_process,
+    )
+    return {
+        "text_replace_synonym": [
+            _replace_synonym(doc, wordnet_substitutions, seed, prob, max_outputs)
+            for doc in docs
+        ]
+    }
 
 
 # sentence = "The hooligans in balaclavas have attempted to steal jewellery."
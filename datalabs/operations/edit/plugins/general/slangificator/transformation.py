@@ -1,23 +1,44 @@
+from functools import partial
 import itertools
 import os
 import random
 import sys
-
-import spacy
+from typing import List, Optional
 
 from datalabs.operations.edit.editing import editing
+from datalabs.operations.resources import (
+    load_resource,
+    preload_resources,
+    register_resource,
+)
+from datalabs.utils.spacy_loader import spacy_loader
 
 sys.path.append(
     os.path.abspath(os.path.join(os.path.dirname(__file__), "../../../../"))
 )
 
 
+def _load_slang_index(name: str) -> dict:
+    # the rows of each word of a slang dictionary
+    index = {}
+    for row, word in enumerate(load_resource(name)[0]):
+        index.setdefault(word, []).append(row)
+    return index
+
+
+for _name in ["slang_nouns", "slang_adverbs", "slang_adjectives"]:
+    register_resource(_name + "_index", partial(_load_slang_index, _name))
+
+
 def slangifyPoS(
     token, modified_toks, Dictionary, PoS, probReplace, isCap, ReplPot, ReplMade
 ):  # performs transformation similar to all three PoS
+    # `Dictionary` is a slang dictionary (one tuple per column) and its index
+
+    Dictionary, index = Dictionary
 
     # Check if word is in the corresponding dictionary
-    if token.lemma_ in Dictionary[0]:
+    if token.lemma_ in index:
         ReplPot += 1  # increment potential replacements
 
         repDecision = (
@@ -29,9 +50,7 @@ def slangifyPoS(
 
             # Choose a new word for replacement
             # ind=Slang_Adverbs[0].index(token.lemma_)
-            indAllPosRepl = [
-                i for i, x in enumerate(Dictionary[0]) if x == token.lemma_
-            ]  # all possible replacements
+            indAllPosRepl = index[token.lemma_]  # all possible replacements
             indChosenRepl = random.randint(
                 0, len(indAllPosRepl) - 1
             )  # choose one of the replacements
@@ -64,57 +83,24 @@ def slangifyPoS(
         modified_toks.append(token.text + token.whitespace_)
 
 
-@editing(
-    name="slangificator",
-    contributor="xl_augmenter",
-    task="Any",
-    description="This transformation replaces some of the words (in particular,"
-    " nouns, adjectives, and adverbs) of the original text with their"
-    " corresponding slang. ",
-)
-def slangificator(
-    text,
+def _slangificator(
+    doc,
+    Slang_Nouns,
+    Slang_Adverbs,
+    Slang_Adjectives,
     probReplaceNoun=1.0,
     probReplaceAdjective=1.0,
     probReplaceAdverb=1.0,
     seed=0,
     max_outputs=1,
 ):
-    pathDic = os.path.dirname(os.path.abspath(__file__))
-
-    nlp = spacy.load("en_core_web_sm")  # get an instance of the tokenizer
-
-    # Load dictionaries
-    fin = open(os.path.join(pathDic, "../../../resources/Slang_Nouns.txt"), "r")
-    Slang_Nouns = [line.strip("\n\r").split(",") for line in fin]
-    fin.close()
-
-    fin = open(os.path.join(pathDic, "../../../resources/Slang_Adverbs.txt"), "r")
-    Slang_Adverbs = [line.strip("\n\r").split(",") for line in fin]
-    fin.close()
-
-    fin = open(os.path.join(pathDic, "../../../resources/Slang_Adjectives.txt"), "r")
-    Slang_Adjectives = [line.strip("\n\r").split(",") for line in fin]
-    fin.close()
-
     random.seed(seed)
 
     perturbed_texts = []  # output for all perturbed texts
 
-    # Load dictionaries
-    Slang_Nouns = Slang_Nouns
-    Slang_Nouns = list(map(list, zip(*Slang_Nouns)))
-    Slang_Adverbs = Slang_Adverbs
-    Slang_Adverbs = list(map(list, zip(*Slang_Adverbs)))
-    Slang_Adjectives = Slang_Adjectives
-    Slang_Adjectives = list(map(list, zip(*Slang_Adjectives)))
-
     # Tags for nouns
     noun_tag = ["NN", "NNS", "NNPS", "NNP"]
 
-    # Tokenize text
-    doc = nlp(text)
-
     for _ in itertools.repeat(None, max_outputs):
 
         ReplPot = 0  # counts potential replcacements, which could have been made
@@ -174,10 +160,110 @@ def slangificator(
 
         perturbed_texts.append(modified_toks)
 
-    return {"text_slangificator": perturbed_texts[0]}
-    # return perturbed_texts
+    return perturbed_texts[0]
+
+
+@editing(
+    name="slangificator",
+    contributor="xl_augmenter",
+    task="Any",
+    description="This transformation replaces some of the words (in particular,"
+    " nouns, adjectives, and adverbs) of the original text with their"
+    " corresponding slang. ",
+    preload=preload_resources(
+        "slang_nouns",
+        "slang_adverbs",
+        "slang_adjectives",
+        "slang_nouns_index",
+        "slang_adverbs_index",
+        "slang_adjectives_index",
+    ),
+)
+def slangificator(
+    text: str,
+    probReplaceNoun=1.0,
+    probReplaceAdjective=1.0,
+    probReplaceAdverb=1.0,
+    seed=0,
+    max_outputs=1,
+    *,
+    slang_nouns,
+    slang_adverbs,
+    slang_adjectives,
+    slang_nouns_index,
+    slang_adverbs_index,
+    slang_adjectives_index,
+):
+    # Tokenize text, the tags and lemmas are needed
+    doc = spacy_loader.parse(text, pipes=("tagger", "attribute_ruler", "lemmatizer"))
+    return {
+        "text_slangificator": _slangificator(
+            doc,
+            (slang_nouns, slang_nouns_index),
+            (slang_adverbs, slang_adverbs_index),
+            (slang_adjectives, slang_adjectives_index),
+            probReplaceNoun,
+            probReplaceAdjective,
+            probReplaceAdverb,
+            seed,
+            max_outputs,
+        )
+    }
 
 
-# sentence = "The hooligans in balaclavas have attempted to steal jewellery."
-# perturbed = slangificator(text=sentence)
-# print(perturbed)
+@editing(
+    name="slangificator_batched",
+    contributor="xl_augmenter",
+    task="Any",
+    description="This transformation replaces some of the words (in particular,"
+    " nouns, adjectives, and adverbs) of a batch of texts with their"
+    " corresponding slang. ",
+    batched=True,
+    preload=preload_resources(
+        "slang_nouns",
+        "slang_adverbs",
+        "slang_adjectives",
+        "slang_nouns_index",
+        "slang_adverbs_index",
+        "slang_adjectives_index",
+    ),
+)
+def slangificator_batched(
+    texts: List[str],
+    probReplaceNoun=1.0,
+    probReplaceAdjective=1.0,
+    probReplaceAdverb=1.0,
+    seed=0,
+    max_outputs=1,
+    batch_size: Optional[int] = None,
+    n_process: int = 1,
+    *,
+    slang_nouns,
+    slang_adverbs,
+    slang_adjectives,
+    slang_nouns_index,
+    slang_adverbs_index,
+    slang_adjectives_index,
+):
+    docs = spacy_loader.pipe(
+        texts,
+        pipes=("tagger", "attribute_ruler", "lemmatizer"),
+        batch_size=batch_size,
+        n_process=n_process,
+    )
+    return {
+        "text_slangificator": [
+            _slangificator(
+                doc,
+                (slang_nouns, slang_nouns_index),
+                (slang_adverbs, slang_adverbs_index),
+                (slang_adjectives, slang_adjectives_index),
+                probReplaceNoun,
+                probReplaceAdjective,
+                probReplaceAdverb,
+                seed,
+                max_outputs,
+            )
+            for doc in docs
+        ]
+    }
@@ -0,0 +1,196 @@
+"""WordNet lexical-substitution table of the editing operations.
+
+The synonyms, hypernyms and hyponyms of every WordNet lemma are extracted once
+(:func:`build_substitution_table`) into an Arrow file, one row per
+``(lemma, part of speech)`` sorted on that key. The editing operations read
+the file memory-mapped through a :class:`SubstitutionTable`, which looks rows
+up by binary search with an LRU cache in front, instead of traversing WordNet
+for each token::
+
+    table = load_resource("wordnet_substitutions")
+    table.get("dog", "n", "hypernyms")  # the hypernyms of all the senses of dog
+
+The table is built in the cache directory the first time it's needed (which
+requires the WordNet corpus of NLTK), then shared by all the processes.
+"""
+from functools import lru_cache
+import os
+from typing import Dict, Iterable, Iterator, Mapping, Optional, Tuple
+
+import pyarrow as pa
+
+from datalabs import config
+from datalabs.operations.resources import register_resource
+
+RELATIONS = ("synonyms", "hypernyms", "hyponyms")
+
+# WordNet parts of speech of the universal POS tags (adjective satellites are
+# indexed with the adjectives)
+WORDNET_POS = {"VERB": "v", "NOUN": "n", "ADV": "r", "ADJ": "a"}
+
+# bump to rebuild the tables of older versions
+SUBSTITUTION_TABLE_VERSION = 1
+SUBSTITUTION_TABLE_PATH = (
+    config.HF_DATASETS_CACHE
+    / "wordnet"
+    / f"substitutions-v{SUBSTITUTION_TABLE_VERSION}.arrow"
+)
+
+# rows kept decoded by a `SubstitutionTable`
+DEFAULT_LOOKUP_CACHE_SIZE = 1 << 16
+
+SCHEMA = pa.schema(
+    [("key", pa.string())]
+    + [(relation, pa.list_(pa.string())) for relation in RELATIONS]
+)
+
+
+def _key(lemma: str, pos: str) -> str:
+    return f"{lemma}\t{pos}"
+
+
+def _names(lemmas: Iterable[str], lemma: str) -> Tuple[str, ...]:
+    # distinct names, in WordNet order, other than the lemma itself
+    names = dict.fromkeys(name.replace("_", " ") for name in lemmas)
+    names.pop(lemma.replace("_", " "), None)
+    return tuple(names)
+
+
+def wordnet_rows() -> Iterator[Tuple[str, str, Mapping[str, Tuple[str, ...]]]]:
+    """The ``(lemma, pos, substitutions)`` of the lemmas of WordNet."""
+    import nltk
+    from nltk.corpus import wordnet
+
+    try:
+        wordnet.ensure_loaded()
+    except LookupError:
+        nltk.download("wordnet", quiet=True)
+
+    for pos in WORDNET_POS.values():
+        for lemma in wordnet.all_lemma_names(pos):
+            synsets = wordnet.synsets(lemma, pos=pos)
+            # the head words of the senses, as many times as they appear (they
+            # are drawn in proportion by `replace_synonym`)
+            synonyms = tuple(
+                synset.name().split(".")[0].replace("_", " ")
+                for synset in synsets
+                if synset.name().split(".")[0].lower() != lemma
+            )
+            hypernyms = _names(
+                (
+                    name
+                    for synset in synsets
+                    for hypernym in synset.hypernyms() + synset.instance_hypernyms()
+                    for name in hypernym.lemma_names()
+                ),
+                lemma,
+            )
+            hyponyms = _names(
+                (
+                    name
+                    for synset in synsets
+                    for hyponym in synset.hyponyms() + synset.instance_hyponyms()
+                    for name in hyponym.lemma_names()
+                ),
+                lemma,
+            )
+            if synonyms or hypernyms or hyponyms:
+                yield lemma, pos, {
+                    "synonyms": synonyms,
+                    "hypernyms": hypernyms,
+                    "hyponyms": hyponyms,
+                }
+
+
+def write_substitution_table(
+    rows: Iterable[Tuple[str, str, Mapping[str, Tuple[str, ...]]]], path: str
+):
+    """Write the ``(lemma, pos, substitutions)`` ``rows`` as a substitution
+    table at ``path``."""
+    table = {}
+    for lemma, pos, substitutions in rows:
+        table[_key(lemma, pos)] = substitutions
+    keys = sorted(table)
+    batch = pa.RecordBatch.from_arrays(
+        [pa.array(keys, pa.string())]
+        + [
+            pa.array(
+                [list(table[key].get(relation, ())) for key in keys],
+                SCHEMA.field(relation).type,
+            )
+            for relation in RELATIONS
+        ],
+        schema=SCHEMA,
+    )
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with pa.OSFile(tmp_path, "wb") as sink:
+        with pa.ipc.new_file(sink, SCHEMA) as writer:
+            writer.write_batch(batch)
+    os.replace(tmp_path, path)
+
+
+def build_substitution_table(path: Optional[str] = None) -> str:
+    """Extract the substitution table of WordNet to ``path`` (by default in
+    the cache directory) and return its path."""
+    path = str(SUBSTITUTION_TABLE_PATH) if path is None else path
+    write_substitution_table(wordnet_rows(), path)
+    return path
+
+
+class SubstitutionTable:
+    """A substitution table, memory-mapped.
+
+    Args:
+        path (`str`): path of a table written by
+            :func:`write_substitution_table`.
+        cache_size (`int`): number of rows kept decoded in the LRU cache of
+            :meth:`lookup`.
+    """
+
+    def __init__(self, path: str, cache_size: int = DEFAULT_LOOKUP_CACHE_SIZE):
+        self.path = path
+        batch = pa.ipc.open_file(pa.memory_map(path)).get_batch(0)
+        self._keys = batch.column(0)
+        self._relations = {relation: batch.column(relation) for relation in RELATIONS}
+        self.lookup = lru_cache(maxsize=cache_size)(self._lookup)
+
+    def __len__(self):
+        return len(self._keys)
+
+    def _find(self, key: str) -> int:
+        # binary search of the sorted keys
+        low, high = 0, len(self._keys)
+        while low < high:
+            middle = (low + high) // 2
+            if self._keys[middle].as_py() < key:
+                low = middle + 1
+            else:
+                high = middle
+        if low < len(self._keys) and self._keys[low].as_py() == key:
+            return low
+        return -1
+
+    def _lookup(self, lemma: str, pos: str) -> Dict[str, Tuple[str, ...]]:
+        row = self._find(_key(lemma, pos))
+        if row == -1:
+            return {relation: () for relation in RELATIONS}
+        return {
+            relation: tuple(column[row].as_py())
+            for relation, column in self._relations.items()
+        }
+
+    def get(self, lemma: str, pos: str, relation: str) -> Tuple[str, ...]:
+        """The ``relation`` words (synonyms, hypernyms or hyponyms) of the
+        WordNet ``lemma`` with the part of speech ``pos`` (n, v, a or r)."""
+        return self.lookup(lemma.lower().replace(" ", "_"), pos)[relation]
+
+
+def _load_substitution_table() -> SubstitutionTable:
+    path = str(SUBSTITUTION_TABLE_PATH)
+    if not os.path.exists(path):
+        build_substitution_table(path)
+    return SubstitutionTable(path)
+
+
+register_resource("wordnet_substitutions", _load_substitution_table)
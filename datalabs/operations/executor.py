@@ -0,0 +1,107 @@
+"""Worker processes shared by the parallel code paths of ``Dataset.apply``.
+
+Creating a process pool costs more than the work itself on medium-size
+splits, so pools are created once per number of processes and reused by every
+later ``apply`` call (including the ones made on the other splits of a
+``DatasetDict``). Each worker loads the resources declared by the ``preload``
+hook of an operation the first time it runs it, and keeps them afterwards; the
+resources of the operations run when the pool starts are loaded before the
+workers are forked, so that the workers share them.
+
+The workers are daemonic, so they can't start workers of their own: the
+executors used inside a worker (e.g. by an operation run by a parallel
+``apply``) run their tasks in that worker instead.
+"""
+import atexit
+from functools import partial
+from typing import Any, Callable, Dict, Iterable, Iterator, Optional, Sequence
+
+from multiprocess import current_process, Pool
+
+from datalabs import config
+from datalabs.utils.logging import get_logger
+
+logger = get_logger(__name__)
+
+
+def in_worker_process() -> bool:
+    """Whether this process is a worker of a pool (a daemonic process, which
+    can't start processes)."""
+    return current_process().daemon
+
+
+def _run_task(function: Callable, operations: Sequence, item: Any) -> Any:
+    for operation in operations:
+        operation.warm_up()
+    return function(item)
+
+
+class OperationExecutor:
+    """A pool of ``num_proc`` worker processes that lives across ``apply``
+    calls. Use :func:`get_executor` rather than instantiating it directly."""
+
+    def __init__(self, num_proc: int):
+        self.num_proc = num_proc
+        self._pool = None
+
+    @property
+    def pool(self):
+        if self._pool is None:
+            logger.info(f"Starting {self.num_proc} worker processes")
+            self._pool = Pool(processes=self.num_proc)
+        return self._pool
+
+    def imap(
+        self,
+        function: Callable,
+        iterable: Iterable,
+        operations: Sequence = (),
+        chunksize: Optional[int] = None,
+    ) -> Iterator:
+        """Lazily apply ``function`` to the items of ``iterable`` in the worker
+        processes, in order.
+
+        Args:
+            function (`Callable`): function run on each item; it's pickled, so
+                it shouldn't reference the whole dataset.
+            iterable (`Iterable`): items to process, typically chunks of rows.
+            operations (`Sequence`): operations run by ``function``, warmed up
+                once per worker.
+            chunksize (`Optional[int]`): number of items sent to a worker at
+                once, defaults to ``config.DEFAULT_APPLY_CHUNKSIZE``.
+        """
+        chunksize = chunksize or config.DEFAULT_APPLY_CHUNKSIZE
+        task = partial(_run_task, function, list(operations))
+        if in_worker_process():
+            # a pool can't be nested in a worker, the items are processed here
+            return map(task, iterable)
+        if self._pool is None:
+            for operation in operations:
+                operation.warm_up()
+        return self.pool.imap(task, iterable, chunksize=chunksize)
+
+    def shutdown(self):
+        if self._pool is not None:
+            self._pool.terminate()
+            self._pool.join()
+            self._pool = None
+
+
+_executors: Dict[int, OperationExecutor] = {}
+
+
+def get_executor(num_proc: int) -> OperationExecutor:
+    """Return the shared executor with ``num_proc`` worker processes."""
+    if num_proc not in _executors:
+        _executors[num_proc] = OperationExecutor(num_proc)
+    return _executors[num_proc]
+
+
+def shutdown_executors():
+    """Stop the worker processes of all the shared executors."""
+    for executor in _executors.values():
+        executor.shutdown()
+    _executors.clear()
+
+
+atexit.register(shutdown_executors)
@@ -1,4 +1,59 @@
-from datalabs.operations.featurize.general import *  # noqa
-from datalabs.operations.featurize.nlp_featurize import nlp_featurizing  # noqa
-from datalabs.operations.featurize.summarization import *  # noqa
-from datalabs.operations.featurize.text_classification import *  # noqa
+from datalabs.operations.registry import register_operations
+
+_general = "datalabs.operations.featurize.general"
+_nlp_featurize = "datalabs.operations.featurize.nlp_featurize"
+_summarization = "datalabs.operations.featurize.summarization"
+_text_classification = "datalabs.operations.featurize.text_classification"
+_util_model = "datalabs.operations.featurize.utils.util_model"
+
+# operation modules are imported on first access, see datalabs.operations.registry
+__getattr__, __dir__, __all__ = register_operations(
+    __name__,
+    {
+        "featurizing": "datalabs.operations.featurize.featurizing",
+        "Featurizing": "datalabs.operations.featurize.featurizing",
+        "dataset_operation": "datalabs.operations.operation",
+        "DatasetOperation": "datalabs.operations.operation",
+        # general
+        "load_gender_bias_data": _util_model,
+        "load_gender_bias_index": _util_model,
+        "get_length": _general,
+        "get_entities_spacy": _general,
+        "get_entities_spacy_batched": _general,
+        "get_postag_spacy": _general,
+        "get_postag_spacy_batched": _general,
+        "get_postag_nltk": _general,
+        "get_basic_words": _general,
+        "get_basic_words_batched": _general,
+        "get_lexical_richness": _general,
+        "get_gender_bias": _general,
+        "get_gender_bias_one_word": _general,
+        "get_features_sample_level_batched": _general,
+        "get_lexical_diversity": _general,
+        # nlp
+        "nlp_featurizing": _nlp_featurize,
+        # summarization
+        "SUMAttribute": _summarization,
+        "SummarizationFeaturizing": _summarization,
+        "summarization_featurizing": _summarization,
+        "get_density": _summarization,
+        "get_coverage": _summarization,
+        "get_compression": _summarization,
+        "get_repetition": _summarization,
+        "get_novelty": _summarization,
+        "get_copy_len": _summarization,
+        "get_all_features": _summarization,
+        "get_oracle_summary": _summarization,
+        "get_lead_k_summary": _summarization,
+        "get_oracle_labels": _summarization,
+        "get_schema_of_sample_level_features": _summarization,
+        "get_schema_of_sample_level_features_asap": _summarization,
+        "get_features_sample_level_asap": _summarization,
+        # text classification, its get_features_sample_level shadows the general one
+        "TextClassificationFeaturizing": _text_classification,
+        "text_classification_featurizing": _text_classification,
+        "get_text_length": _text_classification,
+        "get_features_sample_level": _text_classification,
+        "get_features_sample_level_general": _text_classification,
+    },
+)
@@ -1,7 +1,13 @@
-from datalabs.operations.operation import text_operation, TextOperation
+from datalabs.operations.operation import (
+    FIELD_OPERATION,
+    text_operation,
+    TextOperation,
+)
 
 
 class Featurizing(TextOperation):
+    kind = FIELD_OPERATION
+
     def __init__(
         self,
         *args,
@@ -29,5 +35,10 @@ class featurizing(text_operation):
                 contributor=self.contributor,
                 task=self.task,
                 description=self.description,
+                batched=self.batched,
+                batch_size=self.batch_size,
+                batch_format=self.batch_format,
+                preload=self.preload,
+                outputs=self.outputs,
             )
             return tf_cls
@@ -1,34 +1,53 @@
-from typing import List
+from typing import Dict, List, Optional
+
+import numpy as np
+import pyarrow as pa
+import pyarrow.compute as pc
 
 # pre_model_basic_words = load_pre_model(os.path.join(os.path.dirname(__file__),
 #                                                     './pre_models/basic_words.pkl'))
-# pip install lexicalrichness
-from lexicalrichness import LexicalRichness
-
-# nltk package for featurizing
-import nltk
-
-# spacy package for featurizing
-import spacy
-
+# nltk and spacy are imported by the operations using them,
+# so that importing the operations doesn't load these libraries
 from datalabs.operations.featurize.featurizing import featurizing
+from datalabs.operations.featurize.utils.text_analysis import TextAnalysis
 
 # pretrained models
 from datalabs.operations.featurize.utils.util_model import (
-    BASIC_WORDS,
-    load_gender_bias_data,
+    BASIC_WORDS_INDEX,
+    load_gender_bias_index,
 )
+from datalabs.utils import lexical_diversity
+from datalabs.utils.lexicon import (
+    count_types,
+    split_lower,
+    tokenize_lexical_richness,
+)
+from datalabs.utils.more_features import sample_level_feature
+from datalabs.utils.spacy_loader import spacy_loader
 
 # from hatesonar import Sonar
 # sonar = Sonar()
 # print(pre_model_basic_words)
 
+# outputs of `get_features_sample_level`, also computed by the task-specific
+# featurizers for each of their texts
+SAMPLE_LEVEL_FEATURES = {
+    "length": sample_level_feature("int32"),
+    "lexical_richness": sample_level_feature("float32"),
+    "basic_words": sample_level_feature("float32"),
+    "gender_bias_word_male": sample_level_feature("int32"),
+    "gender_bias_word_female": sample_level_feature("int32"),
+    "gender_bias_single_name_male": sample_level_feature("int32"),
+    "gender_bias_single_name_female": sample_level_feature("int32"),
+}
+
 
 @featurizing(
     name="get_length",
     contributor="datalab",
     task="Any",
     description="This function is used to calculate the length of a text",
+    outputs={"length": sample_level_feature("int32")},
 )
 def get_length(text: str) -> str:
     """
@@ -39,7 +58,7 @@ def get_length(text: str) -> str:
         integer
     """
     # text = sample["text"]
-    return {"length": len(text.split(" "))}
+    return {"length": len(TextAnalysis.of(text).words)}
     # return
 
 
@@ -49,13 +68,25 @@ def get_length(text: str) -> str:
     task="Any",
     description="Extract entities of a given text by using spacy library.",
 )
-def get_entities_spacy(text: str) -> List[str]:
+def get_entities_spacy(text: str) -> Dict[str, List]:
+    doc = spacy_loader.parse(text, pipes=("ner",))
+    return {"entities": [(ent.text, ent.label_) for ent in doc.ents]}
+
 
-    nlp = spacy.load("en_core_web_sm")  # this should be pre-reloaded
-    doc = nlp(text)
-    entities = [(ent.text, ent.label_) for ent in doc.ents]
-    return {"entities": entities}
-    # return entities
+@featurizing(
+    name="get_entities_spacy_batched",
+    contributor="spacy",
+    task="Any",
+    description="Extract entities of a batch of texts by using spacy library.",
+    batched=True,
+)
+def get_entities_spacy_batched(
+    texts: List[str], batch_size: Optional[int] = None, n_process: int = 1
+) -> Dict[str, List]:
+    docs = spacy_loader.pipe(
+        texts, pipes=("ner",), batch_size=batch_size, n_process=n_process
+    )
+    return {"entities": [[(ent.text, ent.label_) for ent in doc.ents] for doc in docs]}
 
 
 @featurizing(
@@ -64,13 +95,31 @@ def get_entities_spacy(text: str) -> List[str]:
     task="Any",
     description="Part-of-speech tagging of a given text by using spacy library.",
 )
-def get_postag_spacy(text: str) -> List[str]:
+def get_postag_spacy(text: str) -> Dict[str, List]:
+    doc = spacy_loader.parse(text, pipes=("tagger",))
+    return {
+        "tokens": [token.text for token in doc],
+        "pos_tags": [token.tag_ for token in doc],
+    }
 
-    nlp = spacy.load("en_core_web_sm")  # this should be pre-reloaded
-    doc = nlp(text)
-    # token_postags = [(token.text, token.tag_) for token in doc]
-    tokens = [token.text for token in doc]
-    tags = [token.tag_ for token in doc]
+
+@featurizing(
+    name="get_postag_spacy_batched",
+    contributor="spacy",
+    task="Any",
+    description="Part-of-speech tagging of a batch of texts by using spacy library.",
+    batched=True,
+)
+def get_postag_spacy_batched(
+    texts: List[str], batch_size: Optional[int] = None, n_process: int = 1
+) -> Dict[str, List]:
+    docs = spacy_loader.pipe(
+        texts, pipes=("tagger",), batch_size=batch_size, n_process=n_process
+    )
+    tokens, tags = [], []
+    for doc in docs:
+        tokens.append([token.text for token in doc])
+        tags.append([token.tag_ for token in doc])
     return {"tokens": tokens, "pos_tags": tags}
 
 
@@ -89,6 +138,7 @@ def get_postag_nltk(text: str) -> List:
         List
     """
 
+    import nltk
     from nltk import pos_tag
 
     try:
@@ -108,28 +158,37 @@ def get_postag_nltk(text: str) -> List:
     contributor="datalab",
     task="Any",
     description="Calculate the ratio of basic words in a given text",
+    outputs={"basic_word_ratio": sample_level_feature("float32")},
 )
 def get_basic_words(sentence: str):
 
     # the sentence must written in english
     # sample level
     # sentence : string  'XXX'
+    words = sentence.lower().split(" ")
+    n_basic_words = BASIC_WORDS_INDEX.count(words)
 
-    if BASIC_WORDS is None:
-        raise ValueError("basic word dictionary is none")
+    return {"basic_word_ratio": n_basic_words * 1.0 / len(words)}
 
-    value_list = sentence.split(" ")
-    n_words = len(value_list)
-    n_basic_words = 0
 
-    for word in value_list:
+@featurizing(
+    name="get_basic_words_batched",
+    contributor="datalab",
+    task="Any",
+    description="Calculate the ratio of basic words in a batch of texts",
+    batched=True,
+    batch_format="arrow",
+    outputs={"basic_word_ratio": sample_level_feature("float32")},
+)
+def get_basic_words_batched(sentences: pa.Array):
 
-        lower = word.lower()
-        if lower in BASIC_WORDS:
-            n_basic_words = n_basic_words + 1
+    # the sentences must written in english
+    # sentences : batch of strings  'XXX'
+    tokens = split_lower(sentences)
+    n_words = pc.list_value_length(tokens).to_numpy(zero_copy_only=False)
+    n_basic_words = BASIC_WORDS_INDEX.count_batch(tokens)
 
-    return {"basic_word_ratio": n_basic_words * 1.0 / n_words}
-    # return n_basic_words*1.0/n_words
+    return {"basic_word_ratio": pa.array(n_basic_words / n_words)}
 
 
 @featurizing(
@@ -137,30 +196,20 @@ def get_basic_words(sentence: str):
     contributor="lexicalrichness",
     task="Any",
     description="Calculate the lexical richness (i.e.lexical diversity)" " of a text",
+    outputs={"lexical_diversity": sample_level_feature("float32")},
 )
 def get_lexical_richness(sentence: str):
     # sample level
     # sentence : string  'XXX'
-
-    from lexicalrichness import LexicalRichness
-
-    # print(f"-------\n{sentence}\n")
-    lex = LexicalRichness(sentence)
-    results = 0
-
-    try:
-        results = lex.ttr
-    except ZeroDivisionError:
-        print(
-            f'the sentence "{sentence}" contain no effective words, we will'
-            f" return 0 instead!"
-        )
-    finally:
-        # return results
-        return {"lexical_diversity": results}
+    return {"lexical_diversity": _type_token_ratio(TextAnalysis.of(sentence))}
 
 
-gendered_dic = load_gender_bias_data()
+def _type_token_ratio(analysis: TextAnalysis) -> float:
+    # `LexicalRichness(text).ttr`, 0 if the text has no effective words
+    tokens = analysis.lexical_richness_tokens
+    if len(tokens) == 0:
+        return 0
+    return len(set(tokens)) / len(tokens)
 
 
 @featurizing(
@@ -171,14 +220,12 @@ gendered_dic = load_gender_bias_data()
 )
 def get_gender_bias(sentence: str):
 
-    # if gendered_dic is None:
-    #     gendered_dic = load_gender_bias_data()
-
+    gendered_index = load_gender_bias_index()
     one_words_results = get_gender_bias_one_word(
-        gendered_dic["words"]["male"],
-        gendered_dic["words"]["female"],
-        gendered_dic["single_name"]["male"],
-        gendered_dic["single_name"]["female"],
+        gendered_index["words"]["male"],
+        gendered_index["words"]["female"],
+        gendered_index["single_name"]["male"],
+        gendered_index["single_name"]["female"],
         sentence,
     )
 
@@ -198,7 +245,9 @@ def get_gender_bias(sentence: str):
 
 
 def get_gender_bias_one_word(words_m, words_f, single_name_m, single_name_f, sentence):
-    words_sentence = sentence.lower().split(" ")
+    # the lexicons are `LexiconIndex` objects (see `load_gender_bias_index`) or
+    # any other container, preferably hashed
+    words_sentence = TextAnalysis.of(sentence).lower_words
 
     results = {
         "words_m": 0,
@@ -235,50 +284,37 @@ res = dataset['test'].apply(get_features_sample_level, mode = "memory")
     contributor="datalab",
     task="Any",
     description="calculate a set of features for general text",
+    outputs=SAMPLE_LEVEL_FEATURES,
 )
 def get_features_sample_level(text: str):
+    # `text` can also be the `TextAnalysis` of the text, shared with the other
+    # features of its sample
 
     # for hate speech
     # from hatesonar import Sonar
     # sonar = Sonar()
+    analysis = TextAnalysis.of(text)
 
     # text length
-    length = len(text.split(" "))
+    length = len(analysis.words)
 
     # lexical_richness
-    lex = LexicalRichness(text)
-    lexical_richness = float(0.0)
-
-    try:
-        lexical_richness = lex.ttr
-    except ZeroDivisionError:
-        print(
-            f'the sentence "{text}" contain no effective words, we will'
-            f" return 0 instead!"
-        )
+    lexical_richness = float(_type_token_ratio(analysis))
 
     # ratio of basic words
-    if BASIC_WORDS is None:
-        raise ValueError("basic word dictionary is none")
-
-    value_list = text.split(" ")
-    n_words = len(value_list)
-    n_basic_words = 0
-
-    for word in value_list:
-        lower = word.lower()
-        if lower in BASIC_WORDS:
-            n_basic_words = n_basic_words + 1
+    n_words = length
+    n_basic_words = BASIC_WORDS_INDEX.count(analysis.lower_words)
 
     basic_words = n_basic_words * 1.0 / n_words if n_words != 0 else float(0)
 
     # Gender bias
+    gendered_index = load_gender_bias_index()
     one_words_results = get_gender_bias_one_word(
-        gendered_dic["words"]["male"],
-        gendered_dic["words"]["female"],
-        gendered_dic["single_name"]["male"],
-        gendered_dic["single_name"]["female"],
-        text,
+        gendered_index["words"]["male"],
+        gendered_index["words"]["female"],
+        gendered_index["single_name"]["male"],
+        gendered_index["single_name"]["female"],
+        analysis,
     )
 
     # # # hataspeech
@@ -304,3 +340,72 @@ def get_features_sample_level(text: str):
         "gender_bias_single_name_female": one_words_results["single_name_f"],
         # "hate_speech_detection":class_,
     }
+
+
+@featurizing(
+    name="get_features_sample_level_batched",
+    contributor="datalab",
+    task="Any",
+    description="calculate a set of features for general text, batched version of"
+    " get_features_sample_level",
+    batched=True,
+    batch_format="arrow",
+    outputs=SAMPLE_LEVEL_FEATURES,
+)
+def get_features_sample_level_batched(texts: pa.Array):
+    # same outputs as `get_features_sample_level`, computed over a chunk of texts
+
+    # text length and ratio of basic words
+    words = split_lower(texts)
+    length = pc.list_value_length(words).to_numpy(zero_copy_only=False)
+    basic_words = BASIC_WORDS_INDEX.count_batch(words) / length
+
+    # lexical_richness (type-token ratio), 0 for texts without effective words
+    tokens = tokenize_lexical_richness(texts)
+    n_tokens = pc.list_value_length(tokens).to_numpy(zero_copy_only=False)
+    n_types = count_types(tokens)
+    lexical_richness = np.divide(
+        n_types, n_tokens, out=np.zeros(len(n_tokens)), where=n_tokens != 0
+    )
+
+    # Gender bias
+    gendered_index = load_gender_bias_index()
+
+    # converted to the types of the declared outputs by `Dataset.apply`
+    return {
+        "length": length,
+        "lexical_richness": lexical_richness,
+        "basic_words": basic_words,
+        "gender_bias_word_male": gendered_index["words"]["male"].count_batch(words),
+        "gender_bias_word_female": gendered_index["words"]["female"].count_batch(words),
+        "gender_bias_single_name_male": gendered_index["single_name"][
+            "male"
+        ].count_batch(words),
+        "gender_bias_single_name_female": gendered_index["single_name"][
+            "female"
+        ].count_batch(words),
+    }
+
+
+@featurizing(
+    name="get_lexical_diversity",
+    contributor="datalab",
+    task="Any",
+    description="Calculate the lexical diversity (TTR, root TTR, MTLD and HD-D) of"
+    " texts, as lexicalrichness does",
+    batched=True,
+    batch_format="arrow",
+    outputs={
+        name: sample_level_feature("float32") for name in ["ttr", "rttr", "mtld", "hdd"]
+    },
+)
+def get_lexical_diversity(texts: pa.Array):
+    # batch of texts, the measures of texts without effective words are 0, HD-D is
+    # null for texts of less than 42 tokens
+    tokens = tokenize_lexical_richness(texts)
+    return {
+        "ttr": pa.array(lexical_diversity.ttr(tokens)),
+        "rttr": pa.array(lexical_diversity.root_ttr(tokens)),
+        "mtld": pa.array(lexical_diversity.mtld(tokens)),
+        "hdd": pa.array(lexical_diversity.hdd(tokens), from_pandas=True),
+    }
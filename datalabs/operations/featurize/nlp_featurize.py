@@ -1,10 +1,16 @@
 from typing import Any, Callable, List, Mapping, Optional
 
 from datalabs.operations.featurize.featurizing import Featurizing, featurizing
-from datalabs.operations.operation import dataset_operation, DatasetOperation
+from datalabs.operations.operation import (
+    dataset_operation,
+    DatasetOperation,
+    SAMPLE_OPERATION,
+)
 
 
 class NLPFeaturizing(Featurizing, DatasetOperation):
+    kind = SAMPLE_OPERATION
+
     def __init__(
         self,
         name: str = None,
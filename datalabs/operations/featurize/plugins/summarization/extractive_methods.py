@@ -2,20 +2,32 @@
 using compare_mt https://github.com/neulab/compare-mt for ROUGE
 """
 
+from functools import lru_cache
 from typing import List
 
-from compare_mt.rouge.rouge_scorer import RougeScorer
 from nltk import sent_tokenize, word_tokenize
 import numpy as np
 
-scorer = RougeScorer(["rouge1", "rouge2"], use_stemmer=True)
-_scorer = RougeScorer(["rouge1"], use_stemmer=True)
+from datalabs.operations.featurize.plugins.summarization.oracle import (
+    ext_oracle,
+    lead_k,
+    ROUGE1,
+    ROUGE12,
+)
+
+
+@lru_cache(maxsize=None)
+def get_scorer():
+    """The ROUGE-1/2 scorer, built on first use (loading the stemmer is slow)."""
+    from compare_mt.rouge.rouge_scorer import RougeScorer
+
+    return RougeScorer(["rouge1", "rouge2"], use_stemmer=True)
 
 
 def compute_rouge(cand, ref):
     ref = sent_tokenize(ref)
     cand = sent_tokenize(cand)
-    score = scorer.score("\n".join(ref), "\n".join(cand))
+    score = get_scorer().score("\n".join(ref), "\n".join(cand))
     rouge1 = score["rouge1"].fmeasure
     rouge2 = score["rouge2"].fmeasure
     return 2 * rouge1 * rouge2 / (rouge1 + rouge2 + 1e-20)
@@ -24,10 +36,15 @@ def compute_rouge(cand, ref):
 def _compute_rouge(cand, ref):
     ref = sent_tokenize(ref)
     cand = sent_tokenize(cand)
-    score = scorer.score("\n".join(ref), "\n".join(cand))
+    score = get_scorer().score("\n".join(ref), "\n".join(cand))
     return score["rouge1"].fmeasure
 
 
+# the similarities computed incrementally by `oracle.IncrementalRouge`, which
+# tokenizes and stems each source sentence once (same scores)
+_INCREMENTAL_METRICS = {_compute_rouge: ROUGE1, compute_rouge: ROUGE12}
+
+
 def _ext_oracle(
     src: List[str],
     ref: str,
@@ -46,6 +63,10 @@ def _ext_oracle(
     max_len: maximum length of the oracle summaries
     threshold: a predefined threshold for stoping creteria
     """
+    if sim_fn in _INCREMENTAL_METRICS:
+        return ext_oracle(
+            src, ref, _INCREMENTAL_METRICS[sim_fn], max_sent, max_len, threshold
+        )
     src = [x.strip() for x in src]
     ref = ref.strip()
     if len(src) == 0:
@@ -93,6 +114,8 @@ def _lead_k(src: List[str], ref: str, sim_fn, k: int = 3):
     k: the number of leading sentences to use as summaries
     sim_fn: sim_fn: similarity function between two strings
     """
+    if sim_fn in _INCREMENTAL_METRICS:
+        return lead_k(src, ref, _INCREMENTAL_METRICS[sim_fn], k)
     src = [x.strip() for x in src]
     doc = src
     ref = ref.strip()
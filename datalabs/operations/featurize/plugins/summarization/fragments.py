@@ -0,0 +1,119 @@
+"""
+Extractive fragments shared by a summary and its source document, the
+matches behind the density, coverage and copy length of `SUMAttribute`.
+main functions: greedy_fragments()
+"""
+
+from bisect import bisect_left
+from collections import defaultdict
+from typing import Dict, Hashable, List, Sequence, Tuple
+
+
+class SuffixAutomaton:
+    """
+    The suffix automaton of a sequence of tokens: the smallest automaton
+    accepting its substrings, built in linear time (Blumer et al., 1985).
+    """
+
+    def __init__(self, tokens: Sequence[Hashable]):
+        self.next: List[Dict[Hashable, int]] = [{}]
+        self.link = [-1]
+        self.length = [0]
+        last = 0
+        for token in tokens:
+            cur = self._add_state(self.length[last] + 1, {})
+            p = last
+            while p != -1 and token not in self.next[p]:
+                self.next[p][token] = cur
+                p = self.link[p]
+            if p != -1:
+                q = self.next[p][token]
+                if self.length[p] + 1 == self.length[q]:
+                    self.link[cur] = q
+                else:
+                    clone = self._add_state(self.length[p] + 1, dict(self.next[q]))
+                    self.link[clone] = self.link[q]
+                    while p != -1 and self.next[p].get(token) == q:
+                        self.next[p][token] = clone
+                        p = self.link[p]
+                    self.link[q] = clone
+                    self.link[cur] = clone
+            last = cur
+
+    def _add_state(self, length: int, transitions: Dict[Hashable, int]) -> int:
+        self.next.append(transitions)
+        self.link.append(0)
+        self.length.append(length)
+        return len(self.length) - 1
+
+    def matching_lengths(self, tokens: Sequence[Hashable]) -> List[int]:
+        """
+        For each position i of `tokens`, the length of the longest suffix of
+        `tokens[:i + 1]` that is a substring of the automaton's sequence.
+        """
+        lengths = []
+        state, length = 0, 0
+        for token in tokens:
+            while state != 0 and token not in self.next[state]:
+                state = self.link[state]
+                length = self.length[state]
+            if token in self.next[state]:
+                state = self.next[state][token]
+                length += 1
+            lengths.append(length)
+        return lengths
+
+
+def longest_prefix_matches(a: Sequence[Hashable], b: Sequence[Hashable]) -> List[int]:
+    """
+    For each position i of `a`, the length of the longest prefix of `a[i:]`
+    occurring in `b` (the matching statistics of `a` against `b`).
+    """
+    automaton = SuffixAutomaton(b[::-1])
+    return automaton.matching_lengths(a[::-1])[::-1]
+
+
+def greedy_fragments(
+    a: Sequence[Hashable], b: Sequence[Hashable]
+) -> List[Tuple[int, int, int]]:
+    """
+    The greedy extractive fragments of `a` (a summary) in `b` (its source), as
+    (start in a, start in b, length) tuples, identical to the fragments of the
+    quadratic scan of Grusky et al. (2018):
+        - from the current position of `a`, `b` is scanned from its start, each
+        match jumping the scan to its end; the first longest match is kept
+        - the position of `a` moves to the end of the kept match (or by one
+        token if there is no match)
+
+    Only the occurrences of the current token of `a` are visited, and a scan
+    stops once it found a match as long as the longest one possible.
+    """
+    occurrences = defaultdict(list)
+    for b_start, token in enumerate(b):
+        occurrences[token].append(b_start)
+    longest = longest_prefix_matches(a, b)
+
+    fragments = []
+    a_start = 0
+    while a_start < len(a):
+        best_match = None
+        best_match_length = 0
+        positions = occurrences.get(a[a_start], ())
+        k = 0
+        while k < len(positions) and best_match_length < longest[a_start]:
+            b_start = positions[k]
+            a_end, b_end = a_start + 1, b_start + 1
+            while a_end < len(a) and b_end < len(b) and a[a_end] == b[b_end]:
+                a_end += 1
+                b_end += 1
+            length = a_end - a_start
+            if length > best_match_length:
+                best_match = (a_start, b_start, length)
+                best_match_length = length
+            k = bisect_left(positions, b_end, k + 1)
+        if best_match:
+            fragments.append(best_match)
+            a_start += best_match_length
+        else:
+            a_start += 1
+    return fragments
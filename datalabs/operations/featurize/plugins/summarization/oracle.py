@@ -0,0 +1,256 @@
+"""
+Incremental ROUGE for extractive oracles and lead-k summaries
+dependency: compare_mt (ROUGE tokenization), nltk (stemmer)
+main functions: ext_oracle(), lead_k()
+
+The scores are the ROUGE F-measures computed by `compare_mt`'s RougeScorer
+(with stemming) between a concatenation of source sentences and the reference:
+the tokens of a concatenation are the tokens of its sentences, so each sentence
+is tokenized and stemmed once, and the n-gram counts of a candidate
+concatenation are the counts of the current selection plus the sentence's.
+"""
+
+from functools import lru_cache
+from typing import Dict, Hashable, List, Sequence
+
+import numpy as np
+
+# similarity metrics of the oracles
+ROUGE1 = "rouge1"  # ROUGE-1 F-measure, as `extractive_methods._compute_rouge`
+ROUGE12 = "rouge1+rouge2"  # harmonic mean of ROUGE-1/2, as `compute_rouge`
+METRICS = (ROUGE1, ROUGE12)
+
+
+@lru_cache(maxsize=None)
+def get_stem():
+    """The (memoized) Porter stemmer of the ROUGE scorer."""
+    from nltk.stem import porter
+
+    return lru_cache(maxsize=2**16)(porter.PorterStemmer().stem)
+
+
+class _Stemmer:
+    def stem(self, word: str) -> str:
+        return get_stem()(word)
+
+
+def rouge_tokenize(text: str) -> List[str]:
+    """The tokens ROUGE scores `text` with (lowercased, stemmed, alphanumeric)."""
+    from compare_mt.rouge import tokenize
+
+    return tokenize.tokenize(text, _Stemmer())
+
+
+def _count_vectors(
+    sequences: Sequence[Sequence[Hashable]], index: Dict[Hashable, int]
+) -> np.ndarray:
+    # counts of the items of each sequence found in `index`, one row per sequence
+    counts = np.zeros((len(sequences), len(index)), dtype=np.int64)
+    for row, sequence in enumerate(sequences):
+        for item in sequence:
+            column = index.get(item)
+            if column is not None:
+                counts[row, column] += 1
+    return counts
+
+
+def _fmeasure(intersection, prediction_count, target_count) -> np.ndarray:
+    # `compare_mt.rouge.scoring.fmeasure`, over arrays of candidates
+    precision = intersection / np.maximum(prediction_count, 1)
+    recall = intersection / max(target_count, 1)
+    total = precision + recall
+    with np.errstate(divide="ignore", invalid="ignore"):
+        fmeasure = 2 * precision * recall / total
+    return np.where(total > 0, fmeasure, 0.0)
+
+
+class IncrementalRouge:
+    """
+    Scores of the concatenations of a selection of source sentences and each
+    source sentence against a reference, the selection growing one sentence at
+    a time.
+    sentences: source sentences
+    reference: reference summary
+    metric: `ROUGE1` or `ROUGE12`
+    """
+
+    def __init__(self, sentences: List[str], reference: str, metric: str = ROUGE1):
+        if metric not in METRICS:
+            raise ValueError(f"metric should be one of {METRICS}, got {metric}")
+        self.metric = metric
+        tokens = [rouge_tokenize(sentence) for sentence in sentences]
+        reference_tokens = rouge_tokenize(reference)
+        self.n_tokens = np.array([len(x) for x in tokens], dtype=np.int64)
+
+        # unigram counts, over the vocabulary of the reference
+        unigram_index = {x: i for i, x in enumerate(dict.fromkeys(reference_tokens))}
+        self.reference_unigrams = _count_vectors([reference_tokens], unigram_index)[0]
+        self.unigrams = _count_vectors(tokens, unigram_index)
+        self.selected_unigrams = np.zeros_like(self.reference_unigrams)
+        self.n_selected_unigrams = 0
+
+        if metric == ROUGE12:
+            reference_bigrams = list(zip(reference_tokens, reference_tokens[1:]))
+            self.bigram_index = {
+                x: i for i, x in enumerate(dict.fromkeys(reference_bigrams))
+            }
+            self.reference_bigrams = _count_vectors(
+                [reference_bigrams], self.bigram_index
+            )[0]
+            self.bigrams = _count_vectors(
+                [list(zip(x, x[1:])) for x in tokens], self.bigram_index
+            )
+            self.n_bigrams = np.maximum(self.n_tokens - 1, 0)
+            self.selected_bigrams = np.zeros_like(self.reference_bigrams)
+            self.n_selected_bigrams = 0
+            # the concatenation adds a bigram across the two sentences
+            self.first_tokens = [x[0] if len(x) > 0 else None for x in tokens]
+            self.last_tokens = [x[-1] if len(x) > 0 else None for x in tokens]
+            self.last_token = None
+
+    def _boundary_bigrams(self) -> np.ndarray:
+        # index of the bigram (last selected token, first token) for each
+        # sentence, -1 if it's not a bigram of the reference, -2 if there's none
+        if self.last_token is None:
+            return np.full(len(self.first_tokens), -2)
+        return np.array(
+            [
+                -2
+                if first is None
+                else self.bigram_index.get((self.last_token, first), -1)
+                for first in self.first_tokens
+            ],
+            dtype=np.int64,
+        )
+
+    def candidate_scores(self) -> np.ndarray:
+        """The score of the selection followed by each sentence."""
+        intersection = np.minimum(
+            self.reference_unigrams, self.selected_unigrams + self.unigrams
+        ).sum(axis=1)
+        rouge1 = _fmeasure(
+            intersection,
+            self.n_selected_unigrams + self.n_tokens,
+            self.reference_unigrams.sum(),
+        )
+        if self.metric == ROUGE1:
+            return rouge1
+
+        counts = self.selected_bigrams + self.bigrams
+        intersection = np.minimum(self.reference_bigrams, counts).sum(axis=1)
+        boundary = self._boundary_bigrams()
+        rows = np.nonzero(boundary >= 0)[0]
+        columns = boundary[rows]
+        intersection[rows] += counts[rows, columns] < self.reference_bigrams[columns]
+        rouge2 = _fmeasure(
+            intersection,
+            self.n_selected_bigrams + self.n_bigrams + (boundary != -2),
+            self.reference_bigrams.sum(),
+        )
+        return 2 * rouge1 * rouge2 / (rouge1 + rouge2 + 1e-20)
+
+    def add(self, index: int):
+        """Append the sentence `index` to the selection."""
+        self.selected_unigrams += self.unigrams[index]
+        self.n_selected_unigrams += self.n_tokens[index]
+        if self.metric == ROUGE1:
+            return
+        self.selected_bigrams += self.bigrams[index]
+        self.n_selected_bigrams += self.n_bigrams[index]
+        if self.first_tokens[index] is not None:
+            if self.last_token is not None:
+                self.n_selected_bigrams += 1
+                column = self.bigram_index.get(
+                    (self.last_token, self.first_tokens[index])
+                )
+                if column is not None:
+                    self.selected_bigrams[column] += 1
+            self.last_token = self.last_tokens[index]
+
+
+def _prepare(src: List[str], ref: str):
+    src = [x.strip() for x in src]
+    ref = ref.strip()
+    if len(src) == 0:
+        src = ["#"]
+    if len(ref) == 0:
+        ref = "#"
+    return src, ref
+
+
+def ext_oracle(
+    src: List[str],
+    ref: str,
+    metric: str = ROUGE1,
+    max_sent: int = 3,
+    max_len: int = -1,
+    threshold: int = -1,
+) -> Dict:
+    """
+    The extractive oracle of a sample, greedily adding the sentence that
+    increases the most the score of the oracle, same outputs as
+    `extractive_methods._ext_oracle` with the corresponding similarity
+    src: source sentences
+    ref: reference summary
+    metric: `ROUGE1` or `ROUGE12`
+    max_sent: maximum number of oracle sentences
+    max_len: maximum length of the oracle summaries
+    threshold: a predefined threshold for stoping creteria
+    """
+    src, ref = _prepare(src, ref)
+    rouge = IncrementalRouge(src, ref, metric)
+    labels = np.zeros(len(src), dtype=np.int64)
+    # add the first sentence
+    scores = rouge.candidate_scores()
+    max_id = int(np.argmax(scores))
+    # updating
+    max_score = float(scores[max_id])
+    oracle = [src[max_id]]
+    labels[max_id] = 1
+    rouge.add(max_id)
+    # iterative search
+    max_sent = len(src) if max_sent < 0 else min(max_sent, len(src))
+    threshold = 0 if threshold < 0 else threshold
+    while len(oracle) < max_sent:
+        if max_len > 0:
+            from nltk import word_tokenize
+
+            if len(word_tokenize(" ".join(oracle))) > max_len:
+                break
+        scores = np.where(labels == 1, -np.inf, rouge.candidate_scores())
+        max_id = int(np.argmax(scores))
+        if scores[max_id] - max_score < threshold:
+            break
+        max_score = float(scores[max_id])
+        oracle.append(src[max_id])
+        labels[max_id] = 1
+        rouge.add(max_id)
+    return {
+        "source": src,
+        "reference": ref,
+        "oracle_summary": oracle,
+        "oracle_labels": labels.tolist(),
+        "oracle_score": max_score,
+    }
+
+
+def lead_k(src: List[str], ref: str, metric: str = ROUGE1, k: int = 3) -> Dict:
+    """
+    The lead-k summary of a sample, same outputs as
+    `extractive_methods._lead_k` with the corresponding similarity
+    src: source sentences
+    ref: reference summary
+    metric: `ROUGE1` or `ROUGE12`
+    k: the number of leading sentences to use as summaries
+    """
+    doc = [x.strip() for x in src]
+    src, ref = _prepare(src, ref)
+    rouge = IncrementalRouge(src[:k], ref, metric)
+    for index in range(len(src[:k]) - 1):
+        rouge.add(index)
+    return {
+        "source": doc,
+        "reference": ref,
+        "lead_k_summary": src[:k],
+        "lead_k_score": float(rouge.candidate_scores()[-1]),
+    }
@@ -1,14 +1,10 @@
 # %%
-from collections import Counter, namedtuple
+from collections import namedtuple
 
-import nltk
-from nltk import sent_tokenize, word_tokenize
-from nltk.util import ngrams
-
-try:
-    nltk.data.find("tokenizers/punkt")
-except LookupError:
-    nltk.download("punkt")
+from datalabs.operations.featurize.plugins.summarization.fragments import (
+    greedy_fragments,
+)
+from datalabs.operations.featurize.utils.text_analysis import TextAnalysis
 
 
 class SUMAttribute:
@@ -22,6 +18,9 @@ class SUMAttribute:
     * repetition
     * novelty
     * copy_len
+
+    The texts and summaries can be given as `TextAnalysis` objects, to share
+    their tokenizations with the other features of a sample.
     """
 
     Match = namedtuple("Match", ("summary", "text", "length"))
@@ -49,12 +48,14 @@ class SUMAttribute:
         }
 
     def cal_attributes_each(self, text, summary):
+        text = TextAnalysis.of(text)
+        summary = TextAnalysis.of(summary)
 
         # Normalize text
-        tokenized_text = word_tokenize(text)
-        tokenized_summary = word_tokenize(summary)
-        normalized_text = [str(t).lower() for t in tokenized_text]
-        normalized_summary = [str(t).lower() for t in tokenized_summary]
+        tokenized_text = text.word_tokens
+        tokenized_summary = summary.word_tokens
+        normalized_text = text.lower_word_tokens
+        normalized_summary = summary.lower_word_tokens
 
         # Calculate matches
         matches = self.overlap(normalized_summary, normalized_text)
@@ -93,13 +94,7 @@ class SUMAttribute:
         }
 
     def get_ngrams(self, doc, n):
-        doc = doc.lower()
-        doc_sents = sent_tokenize(doc)
-        _ngrams = []
-        for sent in doc_sents:
-            sent = word_tokenize(sent)
-            _ngrams.extend(list(ngrams(sent, n=n)))
-        return _ngrams
+        return TextAnalysis.of(doc).ngrams(n)
 
     def cal_novelty(self, text, summary, n=2):
         """Proportion of segments in the summaries that haven’t
@@ -108,10 +103,8 @@ class SUMAttribute:
         """
         cnt_all = 0
         cnt_nov = 0
-        _ngrams_text = self.get_ngrams(text, n=n)
-        _ngrams_summary = self.get_ngrams(summary, n=n)
-        counter_text = Counter(_ngrams_text)
-        counter_summary = Counter(_ngrams_summary)
+        counter_text = TextAnalysis.of(text).ngram_counts(n)
+        counter_summary = TextAnalysis.of(summary).ngram_counts(n)
         for k, v in counter_summary.items():
             cnt_all += v
             if k not in counter_text:
@@ -126,8 +119,7 @@ class SUMAttribute:
         We choose n-gram as segment unit."""
         cnt_all = 0
         cnt_rep = 0
-        _ngrams = self.get_ngrams(summary, n=n)
-        counter = Counter(_ngrams)
+        counter = TextAnalysis.of(summary).ngram_counts(n)
         for k, v in counter.items():
             cnt_all += v
             if v >= 2:
@@ -145,34 +137,7 @@ class SUMAttribute:
             - text (int): the start index of the match in the reference
             - length (int): the length of the extractive fragment
         """
-        matches = []
-        a_start = 0
-        b_start = 0
-        while a_start < len(a):
-            best_match = None
-            best_match_length = 0
-            while b_start < len(b):
-                if a[a_start] == b[b_start]:
-                    a_end = a_start
-                    b_end = b_start
-                    while a_end < len(a) and b_end < len(b) and b[b_end] == a[a_end]:
-                        b_end += 1
-                        a_end += 1
-                    length = a_end - a_start
-                    if length > best_match_length:
-                        best_match = SUMAttribute.Match(a_start, b_start, length)
-                        best_match_length = length
-                    b_start = b_end
-                else:
-                    b_start += 1
-            b_start = 0
-            if best_match:
-                if best_match_length > 0:
-                    matches.append(best_match)
-                a_start += best_match_length
-            else:
-                a_start += 1
-        return matches
+        return [SUMAttribute.Match(*fragment) for fragment in greedy_fragments(a, b)]
 
 
 # if __name__ == "__main__":
@@ -4,10 +4,17 @@ from datalabs.operations.featurize.featurizing import Featurizing, featurizing
 from datalabs.operations.featurize.general import (
     get_features_sample_level as get_features_sample_level_general,
 )
-from datalabs.operations.operation import dataset_operation, DatasetOperation
+from datalabs.operations.featurize.utils.text_analysis import TextAnalysis
+from datalabs.operations.operation import (
+    dataset_operation,
+    DatasetOperation,
+    SAMPLE_OPERATION,
+)
 
 
 class QuestionAnsweringMultipleChoicesFeaturizing(Featurizing, DatasetOperation):
+    kind = SAMPLE_OPERATION
+
     def __init__(
         self,
         name: str = None,
@@ -106,7 +113,7 @@ def get_schema_of_sample_level_features():
 def get_features_sample_level(sample: dict):
 
     # print(sample)
-    context = sample["context"]
+    context = TextAnalysis(sample["context"])
     options = sample["options"]
     answer = sample["answers"]["text"]
 
@@ -1,5 +1,7 @@
 # from ..operation import DatasetOperation, dataset_operation
-from typing import Any, Callable, Dict, List, Mapping, Optional
+from collections import OrderedDict
+import hashlib
+from typing import Any, Callable, Dict, List, Mapping, Optional, Tuple, Union
 
 from nltk import sent_tokenize
 
@@ -7,18 +9,47 @@ from datalabs.operations.featurize.featurizing import Featurizing, featurizing
 from datalabs.operations.featurize.general import (
     get_features_sample_level as get_features_sample_level_general,
 )
+from datalabs.operations.featurize.general import SAMPLE_LEVEL_FEATURES
 from datalabs.operations.featurize.plugins.summarization.extractive_methods import (
     _compute_rouge,
     _ext_oracle,
     _lead_k,
 )
+from datalabs.operations.featurize.plugins.summarization.oracle import (
+    ext_oracle,
+    ROUGE1,
+)
 from datalabs.operations.featurize.plugins.summarization.sum_attribute import (
     SUMAttribute,
 )
-from datalabs.operations.operation import dataset_operation, DatasetOperation
+from datalabs.operations.featurize.utils.text_analysis import (
+    _ensure_punkt,
+    TextAnalysis,
+)
+from datalabs.operations.operation import (
+    dataset_operation,
+    DatasetOperation,
+    SAMPLE_OPERATION,
+)
+from datalabs.utils.more_features import prefix_dict_key, sample_level_feature
+
+# outputs of `get_all_features`
+SUMMARIZATION_FEATURES = {
+    name: sample_level_feature("float32")
+    for name in [
+        "density",
+        "coverage",
+        "compression",
+        "repetition",
+        "novelty",
+        "copy_len",
+    ]
+}
 
 
 class SummarizationFeaturizing(Featurizing, DatasetOperation):
+    kind = SAMPLE_OPERATION
+
     def __init__(
         self,
         name: str = None,
@@ -29,6 +60,9 @@ class SummarizationFeaturizing(Featurizing, DatasetOperation):
         generated_field: str = None,
         task="summarization",
         description=None,
+        batched: bool = False,
+        batch_size: Optional[int] = None,
+        outputs: Optional[Mapping[str, Any]] = None,
     ):
         super().__init__(
             name=name,
@@ -36,6 +70,9 @@ class SummarizationFeaturizing(Featurizing, DatasetOperation):
             resources=resources,
             contributor=contributor,
             description=description,
+            batched=batched,
+            batch_size=batch_size,
+            outputs=outputs,
         )
         self._type = "SummarizationFeaturizing"
         self.processed_fields = processed_fields
@@ -54,6 +91,9 @@ class summarization_featurizing(featurizing, dataset_operation):
         generated_field: str = None,
         task="summarization",
         description=None,
+        batched: bool = False,
+        batch_size: Optional[int] = None,
+        outputs: Optional[Mapping[str, Any]] = None,
     ):
         super().__init__(
             name=name,
@@ -61,6 +101,9 @@ class summarization_featurizing(featurizing, dataset_operation):
             contributor=contributor,
             task=task,
             description=description,
+            batched=batched,
+            batch_size=batch_size,
+            outputs=outputs,
         )
         self.processed_fields = processed_fields
         self.generated_field = generated_field
@@ -81,22 +124,51 @@ class summarization_featurizing(featurizing, dataset_operation):
                 generated_field=self.generated_field,
                 task=self.task,
                 description=self.description,
+                batched=self.batched,
+                batch_size=self.batch_size,
+                outputs=self.outputs,
             )
             return tf_cls
 
 
+# attributes of the latest samples, shared by the getters below when they're
+# applied to the same samples (e.g. by `Dataset.apply_pipeline`, one batch of
+# samples after the other)
+_ATTRIBUTES_CACHE_SIZE = 1024
+_attributes_cache: "OrderedDict[Tuple[bytes, bytes], Dict]" = OrderedDict()
+
+
+def _digest(text: Union[str, TextAnalysis]) -> bytes:
+    # texts are keyed by their digest, so that long documents aren't kept
+    text = text.text if isinstance(text, TextAnalysis) else text
+    return hashlib.blake2b(text.encode("utf-8"), digest_size=16).digest()
+
+
+def _sample_attributes(
+    text: Union[str, TextAnalysis], summary: Union[str, TextAnalysis]
+) -> Dict:
+    """`SUMAttribute().cal_attributes_each(text, summary)`, memoized."""
+    key = (_digest(text), _digest(summary))
+    if key in _attributes_cache:
+        _attributes_cache.move_to_end(key)
+        return _attributes_cache[key]
+    attribute_info = SUMAttribute().cal_attributes_each(text, summary)
+    _attributes_cache[key] = attribute_info
+    if len(_attributes_cache) > _ATTRIBUTES_CACHE_SIZE:
+        _attributes_cache.popitem(last=False)
+    return attribute_info
+
+
 @summarization_featurizing(
     name="get_density",
     contributor="datalab",
     task="summarization",
     description="This function measures to what extent a summary "
     "covers the content in the source text.",
+    outputs={"density": SUMMARIZATION_FEATURES["density"]},
 )
 def get_density(sample: dict):
-    summary_attribute = SUMAttribute()
-    attribute_info = summary_attribute.cal_attributes_each(
-        sample["text"], sample["summary"]
-    )
+    attribute_info = _sample_attributes(sample["text"], sample["summary"])
     return {"density": attribute_info["attr_density"]}
 
 
@@ -106,12 +178,10 @@ def get_density(sample: dict):
     task="summarization",
     description="This function measures to what extent a summary covers "
     "the content in the source text.",
+    outputs={"coverage": SUMMARIZATION_FEATURES["coverage"]},
 )
 def get_coverage(sample: dict):
-    summary_attribute = SUMAttribute()
-    attribute_info = summary_attribute.cal_attributes_each(
-        sample["text"], sample["summary"]
-    )
+    attribute_info = _sample_attributes(sample["text"], sample["summary"])
     return {"coverage": attribute_info["attr_coverage"]}
 
 
@@ -121,12 +191,10 @@ def get_coverage(sample: dict):
     task="summarization",
     description="This function measures the compression ratio from the"
     " source text to the generated summary.",
+    outputs={"compression": SUMMARIZATION_FEATURES["compression"]},
 )
 def get_compression(sample: dict):
-    summary_attribute = SUMAttribute()
-    attribute_info = summary_attribute.cal_attributes_each(
-        sample["text"], sample["summary"]
-    )
+    attribute_info = _sample_attributes(sample["text"], sample["summary"])
     return {"compression": attribute_info["attr_compression"]}
 
 
@@ -136,12 +204,10 @@ def get_compression(sample: dict):
     task="summarization",
     description="This function measures the rate of repeated segments in "
     "summaries. The segments are instantiated as trigrams.",
+    outputs={"repetition": SUMMARIZATION_FEATURES["repetition"]},
 )
 def get_repetition(sample: dict):
-    summary_attribute = SUMAttribute()
-    attribute_info = summary_attribute.cal_attributes_each(
-        sample["text"], sample["summary"]
-    )
+    attribute_info = _sample_attributes(sample["text"], sample["summary"])
     return {"repetition": attribute_info["attr_repetition"]}
 
 
@@ -152,12 +218,10 @@ def get_repetition(sample: dict):
     description="This measures the proportion of segments in the summaries "
     "that haven’t appeared in source documents. The segments "
     "are instantiated as bigrams.",
+    outputs={"novelty": SUMMARIZATION_FEATURES["novelty"]},
 )
 def get_novelty(sample: dict):
-    summary_attribute = SUMAttribute()
-    attribute_info = summary_attribute.cal_attributes_each(
-        sample["text"], sample["summary"]
-    )
+    attribute_info = _sample_attributes(sample["text"], sample["summary"])
     return {"novelty": attribute_info["attr_novelty"]}
 
 
@@ -167,12 +231,10 @@ def get_novelty(sample: dict):
     task="summarization",
     description="Measures the average length of segments in summary "
     "copied from source document.",
+    outputs={"copy_len": SUMMARIZATION_FEATURES["copy_len"]},
 )
 def get_copy_len(sample: dict):
-    summary_attribute = SUMAttribute()
-    attribute_info = summary_attribute.cal_attributes_each(
-        sample["text"], sample["summary"]
-    )
+    attribute_info = _sample_attributes(sample["text"], sample["summary"])
     return {"copy_len": attribute_info["attr_copy_len"]}
 
 
@@ -182,12 +244,15 @@ def get_copy_len(sample: dict):
     task="summarization",
     description="Calculate all features for summarization datasets (density,"
     " coverage, compression, repetition, novelty, copy lenght)",
+    outputs=SUMMARIZATION_FEATURES,
 )
 def get_all_features(sample: dict):
-    summary_attribute = SUMAttribute()
-    attribute_info = summary_attribute.cal_attributes_each(
-        sample["text"], sample["summary"]
-    )
+    return _all_features(sample["text"], sample["summary"])
+
+
+def _all_features(text, summary):
+    # `text` and `summary` are strings or their `TextAnalysis`
+    attribute_info = _sample_attributes(text, summary)
     return {
         "density": attribute_info["attr_density"],
         "coverage": attribute_info["attr_coverage"],
@@ -247,6 +312,38 @@ def get_lead_k_summary(sample: dict) -> Dict:
     return lead_k_info
 
 
+@summarization_featurizing(
+    name="get_oracle_labels",
+    contributor="datalab",
+    task="summarization",
+    description="This function labels the sentences of the extractive oracle "
+    "summaries of a summarization dataset",
+    batched=True,
+    batch_size=256,
+)
+def get_oracle_labels(
+    samples: Dict[str, List], max_sent: int = 3, metric: str = ROUGE1
+) -> Dict[str, List]:
+    """
+    Batched, run it in parallel processes with `num_proc`:
+        dataset.apply(get_oracle_labels, mode="memory", num_proc=8)
+    Input:
+        columns of a batch of samples (with "text" and "summary")
+    Output:
+        return {"oracle_labels":labels of the sentences of each text,
+                "oracle_score":score of each oracle summary}
+    """
+    _ensure_punkt()
+    labels, scores = [], []
+    for text, summary in zip(samples["text"], samples["summary"]):
+        oracle_info = ext_oracle(
+            sent_tokenize(text), summary, metric=metric, max_sent=max_sent
+        )
+        labels.append(oracle_info["oracle_labels"])
+        scores.append(oracle_info["oracle_score"])
+    return {"oracle_labels": labels, "oracle_score": scores}
+
+
 def get_schema_of_sample_level_features():
     return {
         "text_length": 1,
@@ -278,11 +375,17 @@ def get_schema_of_sample_level_features():
     processed_fields="text",
     task="summarization",
     description="This function is used to calculate the text length",
+    outputs={
+        **prefix_dict_key(SAMPLE_LEVEL_FEATURES, "text"),
+        **prefix_dict_key(SAMPLE_LEVEL_FEATURES, "summary"),
+        **SUMMARIZATION_FEATURES,
+    },
 )
 def get_features_sample_level(sample: dict):
 
-    text = sample["text"]
-    summary = sample["summary"]
+    # each text is tokenized once for all the features
+    text = TextAnalysis(sample["text"])
+    summary = TextAnalysis(sample["summary"])
 
     res_info_general = get_features_sample_level_general.func(text)
     res_info_general_new = {}
@@ -294,7 +397,7 @@ def get_features_sample_level(sample: dict):
         res_info_general_new["summary" + "_" + k] = v
 
     # get task-dependent features
-    summary_features = get_all_features.func(sample)
+    summary_features = _all_features(text, summary)
 
     # update the res_info_general_new
     res_info_general_new.update(summary_features)
@@ -4,10 +4,17 @@ from datalabs.operations.featurize.featurizing import Featurizing, featurizing
 from datalabs.operations.featurize.general import (
     get_features_sample_level as get_features_sample_level_general,
 )
-from datalabs.operations.operation import dataset_operation, DatasetOperation
+from datalabs.operations.featurize.utils.text_analysis import TextAnalysis
+from datalabs.operations.operation import (
+    dataset_operation,
+    DatasetOperation,
+    SAMPLE_OPERATION,
+)
 
 
 class TextClassificationFeaturizing(Featurizing, DatasetOperation):
+    kind = SAMPLE_OPERATION
+
     def __init__(
         self,
         name: str = None,
@@ -100,7 +107,7 @@ def get_text_length(sample: dict):
 )
 def get_features_sample_level(sample: dict):
 
-    text = sample["text"]
+    text = TextAnalysis(sample["text"])
 
     res_info_general_new = {}
     res_info_general = get_features_sample_level_general.func(text)
@@ -1,13 +1,25 @@
-from typing import Any, Callable, List, Mapping, Optional
+from typing import Any, Callable, Dict, List, Mapping, Optional
+
+import numpy as np
 
 from datalabs.operations.featurize.featurizing import Featurizing, featurizing
 from datalabs.operations.featurize.general import (
     get_features_sample_level as get_features_sample_level_general,
 )
-from datalabs.operations.operation import dataset_operation, DatasetOperation
+from datalabs.operations.featurize.general import SAMPLE_LEVEL_FEATURES
+from datalabs.operations.featurize.utils.text_analysis import TextAnalysis
+from datalabs.operations.operation import (
+    dataset_operation,
+    DatasetOperation,
+    SAMPLE_OPERATION,
+)
+from datalabs.utils.more_features import prefix_dict_key, sample_level_feature
+from datalabs.utils.text_similarity import pair_similarities
 
 
 class TextMatchingFeaturizing(Featurizing, DatasetOperation):
+    kind = SAMPLE_OPERATION
+
     def __init__(
         self,
         name: str = None,
@@ -18,6 +30,9 @@ class TextMatchingFeaturizing(Featurizing, DatasetOperation):
         generated_field: str = None,
         task="text-matching",
         description=None,
+        batched: bool = False,
+        batch_size: Optional[int] = None,
+        outputs: Optional[Mapping[str, Any]] = None,
     ):
         super().__init__(
             name=name,
@@ -26,6 +41,9 @@ class TextMatchingFeaturizing(Featurizing, DatasetOperation):
             contributor=contributor,
             task=task,
             description=description,
+            batched=batched,
+            batch_size=batch_size,
+            outputs=outputs,
         )
         self._type = "TextMatchingFeaturizing"
         self.processed_fields = ["text"]
@@ -47,12 +65,18 @@ class text_matching_featurizing(featurizing, dataset_operation):
         generated_field: str = None,
         task="text-matching",
         description=None,
+        batched: bool = False,
+        batch_size: Optional[int] = None,
+        outputs: Optional[Mapping[str, Any]] = None,
     ):
         super().__init__(
             name=name,
             resources=resources,
             contributor=contributor,
             description=description,
+            batched=batched,
+            batch_size=batch_size,
+            outputs=outputs,
         )
         self.processed_fields = processed_fields
         self.generated_field = generated_field
@@ -74,6 +98,9 @@ class text_matching_featurizing(featurizing, dataset_operation):
                 generated_field=self.generated_field,
                 task=self.task,
                 description=self.description,
+                batched=self.batched,
+                batch_size=self.batch_size,
+                outputs=self.outputs,
             )
             return tf_cls
 
@@ -104,11 +131,17 @@ def get_schema_of_sample_level_features():
     processed_fields="text",
     task="text-matching",
     description="sample-level features",
+    outputs={
+        **prefix_dict_key(SAMPLE_LEVEL_FEATURES, "text1"),
+        **prefix_dict_key(SAMPLE_LEVEL_FEATURES, "text2"),
+        "text1_minus_text2": sample_level_feature("int32"),
+    },
 )
 def get_features_sample_level(sample: dict):
 
-    text1 = sample["text1"]
-    text2 = sample["text2"]
+    # each text is tokenized once for all the features
+    text1 = TextAnalysis(sample["text1"])
+    text2 = TextAnalysis(sample["text2"])
 
     res_info_general_new = {}
     res_info_general = get_features_sample_level_general.func(text1)
@@ -121,7 +154,7 @@ def get_features_sample_level(sample: dict):
 
     # get task-dependent features
     summary_features = {
-        "text1_minus_text2": len(text1.split(" ")) - len(text2.split(" ")),
+        "text1_minus_text2": len(text1.words) - len(text2.words),
     }
 
     # update the res_info_general_new
@@ -134,3 +167,29 @@ def get_features_sample_level(sample: dict):
     #                              })
 
     return res_info_general_new
+
+
+@text_matching_featurizing(
+    name="get_similarity",
+    contributor="datalab",
+    task="text-matching",
+    description="the similarity of the two texts of each pair (sentence-level BLEU,"
+    " chrF, Jaccard and overlap coefficients of their words)",
+    batched=True,
+    outputs={
+        name: sample_level_feature("float32")
+        for name in ["bleu", "chrf", "jaccard", "overlap"]
+    },
+)
+def get_similarity(samples: Dict[str, List]) -> Dict[str, np.ndarray]:
+    """
+    Batched, n-grams of the whole batch are counted with NumPy
+    Input:
+        columns of a batch of samples (with "text1" and "text2")
+    Output:
+        return {"bleu":sacrebleu.sentence_bleu(text2, [text1]).score of each pair,
+                "chrf":sacrebleu.sentence_chrf(text2, [text1]).score of each pair,
+                "jaccard":Jaccard coefficient of the sets of words of each pair,
+                "overlap":overlap coefficient of the sets of words of each pair}
+    """
+    return pair_similarities(samples["text1"], samples["text2"])
@@ -0,0 +1,118 @@
+"""Per-text analysis shared by the features computed on a text.
+
+The features of a sample field tokenize the same text several times (e.g.
+``text.split(" ")`` for its length, the ratio of basic words and the gender
+bias, ``word_tokenize`` and ``sent_tokenize`` for the summarization
+attributes). A :class:`TextAnalysis` is created once per (sample, field) and
+computes each tokenization on first use only::
+
+    summary = TextAnalysis(sample["summary"])
+    get_features_sample_level_general.func(summary)
+    SUMAttribute().cal_attributes_each(TextAnalysis(sample["text"]), summary)
+
+Feature functions taking a text also accept its ``TextAnalysis``.
+"""
+from collections import Counter
+from functools import lru_cache
+from typing import Any, Callable, Dict, List, Tuple, Union
+
+from datalabs.utils.lexicon import lexical_richness_tokens
+
+
+@lru_cache(maxsize=None)
+def _ensure_punkt():
+    # checked on first use rather than at import, it may download the model
+    import nltk
+
+    try:
+        nltk.data.find("tokenizers/punkt")
+    except LookupError:
+        nltk.download("punkt")
+
+
+class TextAnalysis:
+    """Lazily computed (and memoized) tokenizations of a text.
+
+    Args:
+        text (`str`): the analysed text.
+    """
+
+    def __init__(self, text: str):
+        self.text = text
+        self._cache: Dict[Any, Any] = {}
+
+    @classmethod
+    def of(cls, text: Union[str, "TextAnalysis"]) -> "TextAnalysis":
+        """The analysis of ``text``, itself if it's already analysed."""
+        return text if isinstance(text, TextAnalysis) else cls(text)
+
+    def _memoize(self, key: Any, compute: Callable[[], Any]) -> Any:
+        if key not in self._cache:
+            self._cache[key] = compute()
+        return self._cache[key]
+
+    @property
+    def words(self) -> List[str]:
+        """``text.split(" ")``"""
+        return self._memoize("words", lambda: self.text.split(" "))
+
+    @property
+    def lower_words(self) -> List[str]:
+        """``text.lower().split(" ")``"""
+        return self._memoize("lower_words", lambda: self.text.lower().split(" "))
+
+    @property
+    def lexical_richness_tokens(self) -> List[str]:
+        """The tokens of ``lexicalrichness.LexicalRichness(text)``."""
+        return self._memoize(
+            "lexical_richness_tokens", lambda: lexical_richness_tokens(self.text)
+        )
+
+    @property
+    def word_tokens(self) -> List[str]:
+        """``nltk.word_tokenize(text)``"""
+
+        def compute():
+            from nltk import word_tokenize
+
+            _ensure_punkt()
+            return word_tokenize(self.text)
+
+        return self._memoize("word_tokens", compute)
+
+    @property
+    def lower_word_tokens(self) -> List[str]:
+        """The lowercased ``word_tokens``."""
+        return self._memoize(
+            "lower_word_tokens", lambda: [str(t).lower() for t in self.word_tokens]
+        )
+
+    @property
+    def lower_sentence_tokens(self) -> List[List[str]]:
+        """The word tokens of each sentence of the lowercased text."""
+
+        def compute():
+            from nltk import sent_tokenize, word_tokenize
+
+            _ensure_punkt()
+            return [word_tokenize(sent) for sent in sent_tokenize(self.text.lower())]
+
+        return self._memoize("lower_sentence_tokens", compute)
+
+    def ngrams(self, n: int) -> List[Tuple[str, ...]]:
+        """The n-grams of the sentences of the lowercased text (n-grams don't
+        cross sentence boundaries)."""
+
+        def compute():
+            from nltk.util import ngrams
+
+            _ngrams = []
+            for sent in self.lower_sentence_tokens:
+                _ngrams.extend(ngrams(sent, n=n))
+            return _ngrams
+
+        return self._memoize(("ngrams", n), compute)
+
+    def ngram_counts(self, n: int) -> Counter:
+        """``Counter`` of :meth:`ngrams`."""
+        return self._memoize(("ngram_counts", n), lambda: Counter(self.ngrams(n)))
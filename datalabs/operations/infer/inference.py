@@ -1,7 +1,13 @@
-from datalabs.operations.operation import text_operation, TextOperation
+from datalabs.operations.operation import (
+    COLUMNS_OPERATION,
+    text_operation,
+    TextOperation,
+)
 
 
 class Inference(TextOperation):
+    kind = COLUMNS_OPERATION
+
     def __init__(
         self,
         *args,
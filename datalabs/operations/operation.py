@@ -1,8 +1,78 @@
+import copy
+from functools import partial
 import inspect
-from typing import Any, Callable, Mapping, Optional
+from typing import Any, Callable, Dict, Mapping, Optional
+
+from datalabs.features import Features
+
+# resources returned by the `preload` hook of the operations, loaded at most
+# once per process (including each worker of a parallel `Dataset.apply`)
+_preloaded_resources: Dict[str, Mapping[str, Any]] = {}
+
+# how `Dataset.apply` feeds an operation, see `OperationFunction.kind`
+FIELD_OPERATION = "field"  # the first processed field of each sample
+SAMPLE_OPERATION = "sample"  # each sample
+PROMPT_OPERATION = "prompt"  # each sample and the label id -> label name mapping
+STATISTICS_OPERATION = "statistics"  # the dataset, once; returns statistics
+COLUMNS_OPERATION = "columns"  # the dataset, once; returns generated columns
+PER_SAMPLE_OPERATIONS = (FIELD_OPERATION, SAMPLE_OPERATION, PROMPT_OPERATION)
+
+
+class CallPlan:
+    """How to invoke an operation: its function with the resources bound, and
+    which part of a sample (or batch of columns) it takes.
+
+    Plans are compiled once per operation and process by
+    :meth:`OperationFunction.plan` and never mutated, so they can be shared by
+    threads.
+    """
+
+    __slots__ = ("call", "field", "with_labels")
+
+    def __init__(
+        self, call: Callable, field: Optional[str] = None, with_labels: bool = False
+    ):
+        self.call = call
+        self.field = field
+        self.with_labels = with_labels
+
+    def invoke(self, inputs: Any, labels_to_answers=None) -> Any:
+        """Call the operation on inputs already extracted from the sample."""
+        if self.with_labels:
+            return self.call(inputs, labels_to_answers)
+        return self.call(inputs)
+
+    def invoke_many(self, inputs: list, labels_to_answers=None) -> list:
+        """Call the operation on each of the (extracted) inputs."""
+        call = self.call
+        if self.with_labels:
+            return [call(x, labels_to_answers) for x in inputs]
+        return [call(x) for x in inputs]
+
+    def run(self, sample: Any, labels_to_answers=None) -> Any:
+        """Call the operation on a sample, or a batch of columns for batched
+        operations."""
+        if self.field is not None:
+            sample = sample[self.field]
+        return self.invoke(sample, labels_to_answers)
+
+
+def _repeat_with_seeds(func: Callable, batched: bool, seeds, inputs, *args) -> list:
+    # the outputs of `func` with each seed, grouped by sample
+    outputs = [func(inputs, *args, seed=seed) for seed in seeds]
+    if not batched:
+        return outputs
+    num_samples = len(next(iter(outputs[0].values()))) if len(outputs[0]) else 0
+    return [
+        [{name: output[name][i] for name in output} for output in outputs]
+        for i in range(num_samples)
+    ]
 
 
 class OperationFunction:
+    # how `Dataset.apply` feeds the operation (one of the *_OPERATION kinds)
+    kind = FIELD_OPERATION
+
     def __init__(
         self,
         name: str = None,
@@ -12,9 +82,16 @@ class OperationFunction:
         processed_fields=["text"],
         task="Any",
         description=None,
+        batched: bool = False,
+        batch_size: Optional[int] = None,
+        batch_format: str = "python",
+        preload: Optional[Callable[[], Mapping[str, Any]]] = None,
+        outputs: Optional[Mapping[str, Any]] = None,
+        variants: Optional[Callable[..., Any]] = None,
     ):
         self.name = name
         self.func = func
+        self._plan = None
         self.resources = resources or {}
         self.contributor = contributor
         self._type = self.__class__.__name__
@@ -31,18 +108,140 @@ class OperationFunction:
         self._data_type = self.__class__.__name__
         self.description = description
 
-    def set(self, processed_fields):
-        # print(self._type)
-        return OperationFunction(
-            name=self.name,
-            func=self.func,
-            resources=self.resources,
-            contributor=self.contributor,
-            description=self.description,
-            processed_fields=processed_fields,
+        # batched operations receive whole column chunks (a list, or a pyarrow
+        # array if `batch_format="arrow"`) and return a dict of columns
+        self.batched = batched
+        self.batch_size = batch_size
+        self.batch_format = batch_format
+
+        # `preload` returns heavy resources (models, lexicons...) passed to
+        # `func` as extra keyword arguments; it's called lazily, once per process
+        self.preload = preload
+
+        # `Features` of the generated columns (e.g. {"length": Value("int32")}),
+        # the results are written with these types instead of inferred ones
+        self.outputs = None if outputs is None else Features(outputs)
+
+        # `variants` computes several outputs of `func` per sample in one call,
+        # for `Dataset.augment`: it takes the inputs of `func`, `n_variants`
+        # and `seed` keywords (and the resources), and returns a list of
+        # outputs per sample (a list of such lists if the operation is batched)
+        self.variants = variants
+
+    def output_features(self, prefix: str = "") -> Optional[Features]:
+        """The declared ``outputs``, named as the columns generated with
+        ``prefix``."""
+        if self.outputs is None or prefix == "":
+            return self.outputs
+        return Features(
+            {prefix + "_" + name: feature for name, feature in self.outputs.items()}
         )
 
-    def __call__(self, x: str) -> Any:  # str?
+    def warm_up(self) -> Mapping[str, Any]:
+        """Load the resources declared by ``preload`` if it's not done yet in
+        this process, and return them."""
+        if self.preload is None:
+            return {}
+        key = f"{self.func.__module__}.{self.func.__qualname__}:{self.name}"
+        if key not in _preloaded_resources:
+            _preloaded_resources[key] = self.preload()
+        return _preloaded_resources[key]
+
+    @property
+    def resources(self) -> Mapping[str, Any]:
+        return self._resources
+
+    @resources.setter
+    def resources(self, resources: Optional[Mapping[str, Any]]):
+        # the compiled plan binds the resources, rebuild it on the next call
+        self._resources = resources or {}
+        self._plan = None
+
+    def prepare(self, dataset_info) -> None:
+        """Set the resources that depend on the dataset the operation is
+        applied to. Called by ``Dataset.apply`` before running it."""
+
+    def plan(self) -> CallPlan:
+        """The compiled :class:`CallPlan` of the operation: the signature of
+        ``func`` is inspected and its resources (plus the ones returned by
+        ``preload``) are bound once, not on every call."""
+        if self._plan is None:
+            self._plan = self._compile()
+        return self._plan
+
+    def _compile(self) -> CallPlan:
+        return self._call_plan(self._bind(self.func))
+
+    def _call_plan(self, func: Callable) -> CallPlan:
+        if self.kind == FIELD_OPERATION:
+            return CallPlan(func, field=self.processed_fields[0])
+        return CallPlan(func, with_labels=self.kind == PROMPT_OPERATION)
+
+    def _bind(self, func: Callable) -> Callable:
+        """``func`` with the resources of the operation bound."""
+        resources = dict(self.resources)
+        resources.update(self.warm_up())
+        if "self" in inspect.getfullargspec(func).args:
+            # methods are registered unbound, their instance is the "cls" resource
+            if "cls" not in resources:
+                raise ValueError(
+                    f"Operation {self.name} is a method, its instance must be "
+                    f"passed as the 'cls' resource."
+                )
+            func = partial(func, resources.pop("cls"))
+        if len(resources) > 0:
+            func = partial(func, **resources)
+        return func
+
+    def variants_plan(self, n_variants: int, seed: int = 0) -> CallPlan:
+        """The :class:`CallPlan` computing up to ``n_variants`` outputs per
+        sample, a list of outputs per sample (a list of such lists if the
+        operation is batched). Operations without a ``variants`` hook are
+        called ``n_variants`` times, with the seeds ``seed``,
+        ``seed + 1``..."""
+        if self.variants is not None:
+            return self._call_plan(
+                partial(self._bind(self.variants), n_variants=n_variants, seed=seed)
+            )
+        spec = inspect.getfullargspec(self.func)
+        if "seed" not in spec.args + spec.kwonlyargs:
+            raise ValueError(
+                f"Operation {self.name} can't generate variants: it has neither "
+                f"a `variants` hook nor a `seed` parameter."
+            )
+        return self._call_plan(
+            partial(
+                _repeat_with_seeds,
+                self._bind(self.func),
+                self.batched,
+                range(seed, seed + n_variants),
+            )
+        )
+
+    def run(self, sample_or_batch: Any, labels_to_answers=None) -> Any:
+        """Run the operation on a sample (a batch of columns if it's batched,
+        the dataset for statistics and columns operations), taking the part of
+        it the operation expects."""
+        return self.plan().run(sample_or_batch, labels_to_answers)
+
+    def __getstate__(self):
+        # the plan may hold preloaded resources, workers compile their own
+        state = self.__dict__.copy()
+        state["_plan"] = None
+        return state
+
+    def set(self, processed_fields):
+        """A copy of the operation (of the same class, with the same hooks)
+        processing the fields ``processed_fields``."""
+        operation = copy.copy(self)
+        if isinstance(processed_fields, str):
+            processed_fields = [processed_fields]
+        operation.processed_fields = processed_fields
+        # the plan of the copy reads the new field
+        operation._plan = None
+        return operation
+
+    def __call__(self, x: str, *args) -> Any:  # str?
         """
         Parameters
         x: Text
@@ -50,14 +249,7 @@ class OperationFunction:
         Returns
         Transformed Text
         """
-        # return self.func(x, **self.resources)
-        # print(inspect.getfullargspec(self.func))
-        if "self" not in inspect.getfullargspec(self.func).args:
-            return self.func(x, **self.resources)
-        else:
-            cls_obj = self.resources["cls"]
-            del self.resources["cls"]
-            return self.func(cls_obj, x, **self.resources)
+        return self.plan().call(x, *args)
 
 
 class operation_function:
@@ -70,12 +262,24 @@ class operation_function:
         contributor: str = None,
         task="Any",
         description=None,
+        batched: bool = False,
+        batch_size: Optional[int] = None,
+        batch_format: str = "python",
+        preload: Optional[Callable[[], Mapping[str, Any]]] = None,
+        outputs: Optional[Mapping[str, Any]] = None,
+        variants: Optional[Callable[..., Any]] = None,
     ):
         self.name = name
         self.resources = resources or {}
         self.contributor = contributor
         self.task = task
         self.description = description
+        self.batched = batched
+        self.batch_size = batch_size
+        self.batch_format = batch_format
+        self.preload = preload
+        self.outputs = outputs
+        self.variants = variants
 
     def __call__(self, *param_arg):
         if callable(self.name):
@@ -90,10 +294,18 @@ class operation_function:
                 resources=self.resources,
                 task=self.task,
                 description=self.description,
+                batched=self.batched,
+                batch_size=self.batch_size,
+                batch_format=self.batch_format,
+                preload=self.preload,
+                outputs=self.outputs,
+                variants=self.variants,
             )
 
 
 class TextOperation(OperationFunction):
+    kind = SAMPLE_OPERATION
+
     def __init__(
         self,
         *args,
@@ -126,6 +338,12 @@ class text_operation(operation_function):
                 resources=self.resources,
                 task=self.task,
                 description=self.description,
+                batched=self.batched,
+                batch_size=self.batch_size,
+                batch_format=self.batch_format,
+                preload=self.preload,
+                outputs=self.outputs,
+                variants=self.variants,
             )
 
 
@@ -1,5 +1,17 @@
-from datalabs.operations.preprocess.general import lower  # noqa; noqa
-from datalabs.operations.preprocess.general import stem  # noqa
-from datalabs.operations.preprocess.general import tokenize  # noqa
-from datalabs.operations.preprocess.general import tokenize_huggingface  # noqa
-from datalabs.operations.preprocess.general import tokenize_nltk  # noqa
+from datalabs.operations.registry import register_operations
+
+# operation modules are imported on first access, see datalabs.operations.registry
+__getattr__, __dir__, __all__ = register_operations(
+    __name__,
+    {
+        name: "datalabs.operations.preprocess.general"
+        for name in [
+            "lower",
+            "stem",
+            "tokenize",
+            "tokenize_batched",
+            "tokenize_huggingface",
+            "tokenize_nltk",
+        ]
+    },
+)
@@ -1,7 +1,4 @@
-from typing import List, Optional
-
-# nltk package for preprocessing
-import nltk
+from typing import Dict, List, Optional
 
 from datalabs.operations.preprocess.preprocessing import preprocessing
 from datalabs.operations.tokenizer import get_tokenizer
@@ -48,6 +45,9 @@ def tokenize_nltk(
         List
     """
     # text = sample['text']
+    # nltk package for preprocessing
+    import nltk
+
     return {"text_tokenize": nltk.word_tokenize(text)}
 
 
@@ -121,3 +121,28 @@ def tokenize(
 
     tokenizer = get_tokenizer(tokenizer_name, task_type, language)
     return {"text_tokenized": " ".join(tokenizer(text))}
+
+
+@preprocessing(
+    name="tokenize_batched",
+    contributor="datalabs",
+    task="Any",
+    description="this function is used to tokenize a batch of texts, batched version"
+    " of tokenize",
+    batched=True,
+)
+def tokenize_batched(
+    texts: List[str],
+    tokenizer_name: Optional[str] = None,
+    task_type: str = None,
+    language: str = None,
+    num_proc: int = 1,
+) -> Dict[str, List[str]]:
+    # `num_proc` worker processes segment the texts (Jieba); when `Dataset.apply`
+    # already runs in parallel processes, each worker segments its texts itself
+    tokenizer = get_tokenizer(tokenizer_name, task_type, language)
+    return {
+        "text_tokenized": [
+            " ".join(tokens) for tokens in tokenizer.batch(texts, num_proc=num_proc)
+        ]
+    }
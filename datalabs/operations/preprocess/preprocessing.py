@@ -1,7 +1,13 @@
-from datalabs.operations.operation import text_operation, TextOperation
+from datalabs.operations.operation import (
+    FIELD_OPERATION,
+    text_operation,
+    TextOperation,
+)
 
 
 class Preprocessing(TextOperation):
+    kind = FIELD_OPERATION
+
     def __init__(
         self,
         *args,
@@ -10,6 +16,14 @@ class Preprocessing(TextOperation):
         super(Preprocessing, self).__init__(*args, **kwargs)
         self._data_type = "TextData"
 
+    def prepare(self, dataset_info) -> None:
+        # the other resources (e.g. `num_proc`) are kept
+        self.resources = {
+            **self.resources,
+            "task_type": dataset_info.task_templates[0].task,
+            "language": dataset_info.languages[0],
+        }
+
 
 class preprocessing(text_operation):
     def __init__(self, *args, **kwargs):
@@ -29,5 +43,10 @@ class preprocessing(text_operation):
                 contributor=self.contributor,
                 task=self.task,
                 description=self.description,
+                batched=self.batched,
+                batch_size=self.batch_size,
+                batch_format=self.batch_format,
+                preload=self.preload,
+                outputs=self.outputs,
             )
             return tf_cls
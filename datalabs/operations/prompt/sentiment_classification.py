@@ -1,10 +1,16 @@
 from typing import Any, Callable, Dict, List, Mapping, Optional
 
-from datalabs.operations.operation import dataset_operation, DatasetOperation
+from datalabs.operations.operation import (
+    dataset_operation,
+    DatasetOperation,
+    PROMPT_OPERATION,
+)
 from datalabs.operations.prompt.prompting import Prompting, prompting
 
 
 class SentimentClassificationPrompting(Prompting, DatasetOperation):
+    kind = PROMPT_OPERATION
+
     def __init__(
         self,
         name: str = None,
@@ -35,16 +41,6 @@ class SentimentClassificationPrompting(Prompting, DatasetOperation):
         self._data_type = "Dataset"
         self.template = template
 
-    def __call__(self, sample, labels_to_answers) -> Any:  # str?
-        """
-        Parameters
-        x: Text
-
-        Returns
-        Transformed Text
-        """
-        return self.func(sample, labels_to_answers, **self.resources)
-
 
 class sentiment_classification_prompting(prompting, dataset_operation):
     def __init__(
@@ -35,16 +35,6 @@ class SummarizationPrompting(Prompting, DatasetOperation):
         self._data_type = "Dataset"
         self.template = template
 
-    def __call__(self, sample) -> Any:  # str?
-        """
-        Parameters
-        x: Text
-
-        Returns
-        Transformed Text
-        """
-        return self.func(sample, **self.resources)
-
 
 class summarization_prompting(prompting, dataset_operation):
     def __init__(
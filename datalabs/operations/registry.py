@@ -0,0 +1,60 @@
+"""Lazy exports of the operations packages.
+
+Operation modules import heavy libraries (spaCy, NLTK, checklist, ...) at the
+top, so importing them eagerly from the ``__init__`` of their package makes
+``from datalabs.operations.featurize import get_length`` pay for all of them.
+Instead, a package registers which module defines each operation it exports,
+and the module is only imported the first time one of its operations is
+accessed (PEP 562 module ``__getattr__``)::
+
+    __getattr__, __dir__, __all__ = register_operations(
+        __name__, {"get_length": "datalabs.operations.featurize.general"}
+    )
+"""
+import importlib
+import sys
+from typing import Callable, Dict, List, Tuple
+
+# package name -> {exported name -> module defining it}
+_registry: Dict[str, Dict[str, str]] = {}
+
+
+def register_operations(
+    package_name: str, exports: Dict[str, str]
+) -> Tuple[Callable, Callable, List[str]]:
+    """Register the names exported lazily by a package.
+
+    Args:
+        package_name (`str`): ``__name__`` of the package.
+        exports (`Dict[str, str]`): exported name -> name of the module it's
+            imported from.
+
+    Returns:
+        the ``__getattr__``, ``__dir__`` and ``__all__`` of the package.
+    """
+    _registry.setdefault(package_name, {}).update(exports)
+    exports = _registry[package_name]
+
+    def __getattr__(name: str):
+        if name not in exports:
+            raise AttributeError(f"module {package_name!r} has no attribute {name!r}")
+        value = getattr(importlib.import_module(exports[name]), name)
+        # cache it on the package, later accesses don't go through __getattr__
+        setattr(sys.modules[package_name], name, value)
+        return value
+
+    def __dir__() -> List[str]:
+        return sorted(set(vars(sys.modules[package_name])) | set(exports))
+
+    return __getattr__, __dir__, list(exports)
+
+
+def list_operations(package_name: str = None) -> Dict[str, str]:
+    """Return the lazily exported names (``package.name``) and their modules,
+    optionally restricted to one package."""
+    return {
+        f"{package}.{name}": module
+        for package, exports in _registry.items()
+        if package_name is None or package == package_name
+        for name, module in exports.items()
+    }
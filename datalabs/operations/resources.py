@@ -0,0 +1,144 @@
+"""Registry of the resource files (lexicons, dictionaries, word lists...) of the
+operations.
+
+Each resource is declared once by name, with the function parsing it::
+
+    register_resource("spell_errors", json_resource("spell_errors.json"))
+
+and loaded lazily, the first time it's requested in a process, then kept for
+the lifetime of the process. The loaded resources are frozen (read-only
+mappings, tuples and frozensets) since all the operations of the process share
+them.
+
+Operations declare the resources they use with their ``preload`` hook, which
+passes them to the operation as keyword arguments::
+
+    @editing(name="add_typo", preload=preload_resources("spell_errors"))
+    def add_typo(text: str, seed=0, max_outputs=2, spell_errors=None):
+        ...
+
+The resources of the operations are loaded in the main process before the
+worker processes of :mod:`datalabs.operations.executor` are forked, so the
+workers inherit them instead of parsing the files again.
+"""
+from functools import partial
+import json
+import os
+from types import MappingProxyType
+from typing import Any, Callable, Dict, Mapping
+
+# resource files of the editing operations
+EDIT_RESOURCES_DIR = os.path.join(os.path.dirname(__file__), "edit", "resources")
+
+_loaders: Dict[str, Callable[[], Any]] = {}
+_resources: Dict[str, Any] = {}
+
+
+def freeze(value: Any) -> Any:
+    """Read-only copy of a parsed resource: dicts become read-only mappings,
+    lists tuples and sets frozensets, recursively."""
+    if isinstance(value, dict):
+        return MappingProxyType({key: freeze(item) for key, item in value.items()})
+    if isinstance(value, (list, tuple)):
+        return tuple(freeze(item) for item in value)
+    if isinstance(value, set):
+        return frozenset(value)
+    return value
+
+
+def register_resource(name: str, loader: Callable[[], Any]):
+    """Declare the resource ``name``, parsed by ``loader`` (and then frozen)."""
+    if name in _loaders and _loaders[name] is not loader:
+        raise ValueError(f"The resource {name} is already registered")
+    _loaders[name] = loader
+
+
+def load_resource(name: str) -> Any:
+    """The resource ``name``, loaded once per process."""
+    if name not in _resources:
+        if name not in _loaders:
+            raise KeyError(f"Unknown resource {name}")
+        _resources[name] = freeze(_loaders[name]())
+    return _resources[name]
+
+
+def _load_resources(names) -> Mapping[str, Any]:
+    return {name: load_resource(name) for name in names}
+
+
+def preload_resources(*names: str) -> Callable[[], Mapping[str, Any]]:
+    """``preload`` hook of an operation passing it the given resources, as
+    keyword arguments named after them."""
+    return partial(_load_resources, names)
+
+
+def _edit_resource_path(file_name: str) -> str:
+    return os.path.join(EDIT_RESOURCES_DIR, file_name)
+
+
+def _load_json(file_name: str) -> Any:
+    with open(_edit_resource_path(file_name), "r") as file:
+        return json.load(file)
+
+
+def _load_lines(file_name: str) -> list:
+    with open(_edit_resource_path(file_name), "r") as file:
+        return file.read().split("\n")
+
+
+def json_resource(file_name: str) -> Callable[[], Any]:
+    """Loader of a JSON file of the editing resources."""
+    return partial(_load_json, file_name)
+
+
+def lines_resource(file_name: str) -> Callable[[], list]:
+    """Loader of the lines of a text file of the editing resources."""
+    return partial(_load_lines, file_name)
+
+
+def _load_slang(file_name: str) -> list:
+    # one list per column of the comma-separated dictionary
+    with open(_edit_resource_path(file_name), "r") as file:
+        rows = [line.strip("\n\r").split(",") for line in file]
+    return list(map(list, zip(*rows)))
+
+
+def _load_acronyms() -> dict:
+    acronyms = {}
+    with open(_edit_resource_path("acronyms.tsv"), "r") as file:
+        for line in file:
+            key, value = line.strip().split("\t")
+            acronyms[key] = value
+    # long keys first to prevent overlapping
+    return {key: acronyms[key] for key in sorted(acronyms, key=len, reverse=True)}
+
+
+def _load_populous_cities() -> set:
+    return set(_load_lines("Eng_Pop.txt"))
+
+
+def _load_color_names() -> list:
+    return [color["name"] for color in load_resource("colors").values()]
+
+
+for _name in [
+    "american_spellings",
+    "british_spellings",
+    "colors",
+    "country_state_abbreviation",
+    "phrase_abbrev_dict",
+    "spell_corrections",
+    "spell_errors",
+    "text2emoji",
+    "text2icon",
+    "weekday_month_abb_en",
+    "weekday_month_exp_en",
+    "word_abbrev_dict",
+]:
+    register_resource(_name, json_resource(f"{_name}.json"))
+register_resource("acronyms", _load_acronyms)
+register_resource("color_names", _load_color_names)
+register_resource("populous_cities", _load_populous_cities)
+register_resource("scarce_cities", lines_resource("Eng_Scarce.txt"))
+for _name in ["Slang_Nouns", "Slang_Adverbs", "Slang_Adjectives"]:
+    register_resource(_name.lower(), partial(_load_slang, f"{_name}.txt"))
@@ -1,10 +1,12 @@
 from __future__ import annotations
 
 import abc
-from functools import lru_cache
-from typing import List, Optional
+from collections import OrderedDict
+import hashlib
+import sys
+from typing import List, Optional, Sequence, Tuple
 
-import jieba
+from datalabs import config
 
 tokenizer_registry = {}
 
@@ -45,14 +47,126 @@ def get_tokenizer(
             return tokenizer_registry[tokenizer_name]()
 
 
+# approximate memory of a cache entry besides its tokens (key, digest, links)
+_ENTRY_OVERHEAD = 200
+
+TokenCacheKey = Tuple[str, bytes]
+
+
+class TokenCache:
+    """
+    Least recently used cache of the tokens of texts, bounded by the approximate
+    memory of the tokens it holds (``config.TOKEN_CACHE_MAX_SIZE`` bytes by
+    default). Texts are keyed by the name of their tokenizer and their digest,
+    so that long texts aren't kept.
+    """
+
+    def __init__(self, max_size: Optional[int] = None):
+        self.max_size = config.TOKEN_CACHE_MAX_SIZE if max_size is None else max_size
+        self.size = 0
+        self._entries: OrderedDict[
+            TokenCacheKey, Tuple[Tuple[str, ...], int]
+        ] = OrderedDict()
+
+    @staticmethod
+    def key(namespace: str, text: str) -> TokenCacheKey:
+        return namespace, hashlib.blake2b(text.encode("utf-8"), digest_size=16).digest()
+
+    def get(self, key: TokenCacheKey) -> Optional[Tuple[str, ...]]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        self._entries.move_to_end(key)
+        return entry[0]
+
+    def put(self, key: TokenCacheKey, tokens: Sequence[str]) -> Tuple[str, ...]:
+        """Cache ``tokens``, evicting the least recently used entries beyond
+        the maximum size, and return them as a tuple."""
+        tokens = tuple(tokens)
+        size = _ENTRY_OVERHEAD + sys.getsizeof(tokens)
+        size += sum(sys.getsizeof(token) for token in tokens)
+        if key in self._entries:
+            self.size -= self._entries.pop(key)[1]
+        if size > self.max_size:
+            return tokens
+        self._entries[key] = (tokens, size)
+        self.size += size
+        while self.size > self.max_size:
+            _, (_, evicted_size) = self._entries.popitem(last=False)
+            self.size -= evicted_size
+        return tokens
+
+    def clear(self):
+        self._entries.clear()
+        self.size = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+# shared by the tokenizers (and so the operations) of the process
+token_cache = TokenCache()
+
+
 class Tokenizer:
-    @abc.abstractmethod
+    """
+    virtual base class of tokenizer, the tokens of texts are cached in the
+    `token_cache` shared by the tokenizers of the process
+    """
+
+    # tokenizers cheaper than a cache lookup don't cache their tokens
+    cached = True
+
     def __call__(self, text: str) -> list[str]:
+        if not self.cached:
+            return self.tokenize(text)
+        key = token_cache.key(self.cache_namespace, text)
+        tokens = token_cache.get(key)
+        if tokens is None:
+            tokens = token_cache.put(key, self.tokenize(text))
+        return list(tokens)
+
+    def batch(self, texts: Sequence[str], num_proc: int = 1) -> list[list[str]]:
+        """
+        Tokenize a batch of texts, the texts that aren't cached are tokenized
+        once each by `tokenize_batch`
+        """
+        if not self.cached:
+            return self.tokenize_batch(list(texts), num_proc=num_proc)
+        keys = [token_cache.key(self.cache_namespace, text) for text in texts]
+        results = [token_cache.get(key) for key in keys]
+        missing = {}
+        for key, text, tokens in zip(keys, texts, results):
+            if tokens is None:
+                missing.setdefault(key, text)
+        if missing:
+            tokenized = self.tokenize_batch(list(missing.values()), num_proc=num_proc)
+            for key, tokens in zip(list(missing), tokenized):
+                missing[key] = token_cache.put(key, tokens)
+            results = [
+                missing[key] if tokens is None else tokens
+                for key, tokens in zip(keys, results)
+            ]
+        return [list(tokens) for tokens in results]
+
+    @property
+    def cache_namespace(self) -> str:
+        return type(self).__name__
+
+    @abc.abstractmethod
+    def tokenize(self, text: str) -> list[str]:
         """
-        virtual base class of tokenizer
+        tokenize a text, without caching
         """
         ...
 
+    def tokenize_batch(self, texts: List[str], num_proc: int = 1) -> list[list[str]]:
+        """
+        tokenize a batch of texts without caching, tokenizers with a faster
+        batched (or parallel) implementation override it
+        """
+        return [self.tokenize(text) for text in texts]
+
 
 @register_tokenizer("SingleSpaceTokenizer")
 class SingleSpaceTokenizer(Tokenizer):
@@ -60,18 +174,49 @@ class SingleSpaceTokenizer(Tokenizer):
     Tokenize a string based on the space
     """
 
-    @lru_cache(maxsize=20)
-    def __call__(self, text: str) -> List[str]:
+    cached = False
+
+    def tokenize(self, text: str) -> List[str]:
         return text.split(" ")
 
 
+def _jieba_cut(texts: List[str]) -> List[List[str]]:
+    import jieba
+
+    return [list(jieba.cut(text, cut_all=False)) for text in texts]
+
+
 @register_tokenizer("JiebaTokenizer")
 class JiebaTokenizer(Tokenizer):
     """
-    Tokenizer a string using Jieba segmentor
+    Tokenizer a string using Jieba segmentor, `batch(texts, num_proc=N)`
+    segments the texts in the shared worker processes of
+    `datalabs.operations.executor`
     """
 
-    @lru_cache(maxsize=20)
-    def __call__(self, text: str) -> List[str]:
-        # TODO(Pengfei): this should be optimized
-        return [w for w in jieba.cut(text, cut_all=False)]
+    # number of texts sent at once to a worker process
+    chunk_size = 256
+
+    def tokenize(self, text: str) -> List[str]:
+        return _jieba_cut([text])[0]
+
+    def tokenize_batch(self, texts: List[str], num_proc: int = 1) -> List[List[str]]:
+        if num_proc <= 1 or len(texts) <= self.chunk_size:
+            return _jieba_cut(texts)
+        import jieba
+
+        from datalabs.operations.executor import get_executor
+
+        # the dictionary is loaded in this process first, so that the workers
+        # forked from now on share it; the workers of an already started pool
+        # load their own copy on their first chunk
+        jieba.initialize()
+        chunks = [
+            texts[start : start + self.chunk_size]
+            for start in range(0, len(texts), self.chunk_size)
+        ]
+        return [
+            tokens
+            for chunk in get_executor(num_proc).imap(_jieba_cut, chunks)
+            for tokens in chunk
+        ]
@@ -1,9 +1,111 @@
+import json
+import os
+import tempfile
 import unittest
 
 from aggregate import get_average_length
-from featurize import get_length
+from featurize import featurizing, get_length
+from featurize.nlp_featurize import nlp_featurizing
 
-from datalabs import load_dataset
+from datalabs import Dataset, load_dataset, load_from_disk, Value
+from datalabs.operations.edit.editing import editing
+from datalabs.utils.profiling import PROFILE_STAT_KEY
+
+
+class Calls:
+    """Texts the counting operations are called on. The operations are hashed
+    with the globals they read, recording a call in a class attribute doesn't
+    change their fingerprint."""
+
+    texts = []
+    variants = []
+
+
+# read by `get_scaled_length`, the cached columns follow its changes
+scale = {"factor": 1}
+
+
+@featurizing(name="get_length_batched", batched=True, batch_size=2)
+def get_length_batched(texts):
+    return {"length": [len(text.split(" ")) for text in texts]}
+
+
+@featurizing(name="get_length_arrow", batched=True, batch_size=2, batch_format="arrow")
+def get_length_arrow(texts):
+    import pyarrow.compute as pc
+
+    return {"length": pc.list_value_length(pc.split_pattern(texts, " "))}
+
+
+@featurizing(name="get_length_counted")
+def get_length_counted(text):
+    Calls.texts.append(text)
+    return {"length": len(text.split(" "))}
+
+
+@featurizing(name="get_scaled_length")
+def get_scaled_length(text):
+    return {"length": len(text.split(" ")) * scale["factor"]}
+
+
+@featurizing(name="get_long_text_length")
+def get_long_text_length(text):
+    length = len(text.split(" "))
+    return {"long_length": length if length > 2 else None, "half": length / 2}
+
+
+@featurizing(
+    name="get_length_typed",
+    outputs={"length": Value("int32"), "half": Value("float32", is_bucket=True)},
+)
+def get_length_typed(text):
+    length = len(text.split(" "))
+    return {"length": length, "half": length / 2}
+
+
+@featurizing(
+    name="get_length_typed_arrow",
+    batched=True,
+    batch_format="arrow",
+    outputs={"length": Value("int32")},
+)
+def get_length_typed_arrow(texts):
+    import pyarrow.compute as pc
+
+    return {"length": pc.list_value_length(pc.split_pattern(texts, " "))}
+
+
+@featurizing(name="get_length_undeclared", outputs={"size": Value("int32")})
+def get_length_undeclared(text):
+    return {"length": len(text.split(" "))}
+
+
+def shout_variants(text, n_variants=1, seed=0):
+    # all the variants of a text in one call
+    Calls.variants.append(text)
+    return [{"text_shout": text + "!" * (seed + i)} for i in range(n_variants)]
+
+
+@editing(name="shout", variants=shout_variants)
+def shout(text, seed=0):
+    Calls.variants.append(text)
+    return {"text_shout": text + "!" * seed}
+
+
+@editing(name="shout_batched", batched=True, batch_size=2)
+def shout_batched(texts, seed=0):
+    Calls.variants.extend(texts)
+    return {"text_shout": [text + "!" * seed for text in texts]}
+
+
+@editing(name="shout_once")
+def shout_once(text):
+    return {"text_shout": text + "!"}
+
+
+@nlp_featurizing(name="get_length_ratio")
+def get_length_ratio(sample: dict):
+    return {"length_ratio": sample["test_length"] / len(sample["text"])}
 
 
 class MyTestCase(unittest.TestCase):
@@ -18,6 +120,194 @@ class MyTestCase(unittest.TestCase):
         self.assertEqual(len(new_dataset_one[0].keys()), 3)
         self.assertEqual(len(new_dataset_two._stat.keys()), 1)
 
+    def test_apply_batched(self):
+        dataset = Dataset.from_dict(
+            {"text": ["I love this movie", "so bad", "just fine", "a b c d e"]}
+        )
+        expected = [item["length"] for item in dataset.apply(get_length)]
+
+        realtime = [item["length"] for item in dataset.apply(get_length_batched)]
+        self.assertEqual(realtime, expected)
+
+        for func in [get_length_batched, get_length_arrow]:
+            new_dataset = dataset.apply(func, mode="memory", prefix="test")
+            self.assertEqual(new_dataset["test_length"], expected)
+
+        selected = dataset.select([3, 0])
+        lengths = [item["length"] for item in selected.apply(get_length_arrow)]
+        self.assertEqual(lengths, [expected[3], expected[0]])
+
+    def test_apply_pipeline(self):
+        dataset = Dataset.from_dict(
+            {"text": ["I love this movie", "so bad", "just fine", "a b c d e"]}
+        )
+        expected = dataset.apply(get_length, mode="memory", prefix="test")
+        expected = expected.apply(get_length_ratio, mode="memory")
+        expected = expected.apply(get_average_length, prefix="avg")
+
+        result = dataset.apply_pipeline(
+            [get_length_arrow, get_length_ratio, get_average_length],
+            prefix=["test", "", "avg"],
+        )
+        self.assertEqual(result.column_names, expected.column_names)
+        self.assertEqual(result["test_length"], expected["test_length"])
+        self.assertEqual(result["length_ratio"], expected["length_ratio"])
+        self.assertEqual(result._stat, expected._stat)
+
+    def test_apply_cache(self):
+        dataset = Dataset.from_dict(
+            {"text": ["I love this movie", "so bad", "just fine", "a b c d e"]}
+        )
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            dataset.save_to_disk(tmp_dir)
+            dataset = load_from_disk(tmp_dir)
+
+            del Calls.texts[:]
+            first = dataset.apply(get_length_counted, mode="memory", prefix="test")
+            first = first.apply(get_average_length, mode="memory", prefix="avg")
+            self.assertEqual(len(Calls.texts), 4)
+            cache_files = [f for f in os.listdir(tmp_dir) if f.startswith("apply-")]
+            self.assertEqual(len(cache_files), 2)
+
+            second = dataset.apply(get_length_counted, mode="memory", prefix="test")
+            second = second.apply(get_average_length, mode="memory", prefix="avg")
+            self.assertEqual(len(Calls.texts), 4)
+            self.assertEqual(second["test_length"], first["test_length"])
+            self.assertEqual(second._fingerprint, first._fingerprint)
+            self.assertEqual(second._stat, first._stat)
+
+            other = dataset.apply(get_length_counted, mode="memory", prefix="other")
+            self.assertEqual(len(Calls.texts), 8)
+            self.assertEqual(other["other_length"], first["test_length"])
+
+            dataset.apply(
+                get_length_counted,
+                mode="memory",
+                prefix="test",
+                load_from_cache_file=False,
+            )
+            self.assertEqual(len(Calls.texts), 12)
+
+            # the globals read by the operation are part of its fingerprint
+            first = dataset.apply(get_scaled_length, mode="memory")
+            try:
+                scale["factor"] = 2
+                second = dataset.apply(get_scaled_length, mode="memory")
+            finally:
+                scale["factor"] = 1
+            self.assertNotEqual(second._fingerprint, first._fingerprint)
+            self.assertEqual(second["length"], [8, 4, 4, 10])
+
+    def test_apply_streaming(self):
+        dataset = Dataset.from_dict(
+            {"text": ["so bad", "just fine", "I love this movie", "a b c d e"]}
+        )
+        # the types of the first chunk (None, int) are widened by the later ones
+        new_dataset = dataset.apply(
+            get_long_text_length, mode="memory", writer_batch_size=2
+        )
+        self.assertEqual(new_dataset["long_length"], [None, None, 4, 5])
+        self.assertEqual(new_dataset["half"], [1.0, 1.0, 2.0, 2.5])
+        self.assertEqual(new_dataset.features["half"].dtype, "float64")
+        # the generated columns are memory-mapped from an Arrow file
+        self.assertEqual(len(new_dataset.cache_files), 1)
+
+    def test_apply_outputs(self):
+        dataset = Dataset.from_dict(
+            {"text": ["I love this movie", "so bad", "just fine", "a b c d e"]}
+        )
+        # the columns are written with the types of the declared outputs
+        new_dataset = dataset.apply(get_length_typed, mode="memory", prefix="test")
+        self.assertEqual(new_dataset["test_length"], [4, 2, 2, 5])
+        self.assertEqual(new_dataset["test_half"], [2.0, 1.0, 1.0, 2.5])
+        self.assertEqual(new_dataset.data.schema.field("test_length").type, "int32")
+        self.assertEqual(new_dataset.features["test_half"].dtype, "float32")
+        self.assertTrue(new_dataset.features["test_half"].is_bucket)
+
+        new_dataset = dataset.apply_pipeline([get_length_typed_arrow])
+        self.assertEqual(new_dataset["length"], [4, 2, 2, 5])
+        self.assertEqual(new_dataset.features["length"].dtype, "int32")
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            dataset.save_to_disk(tmp_dir)
+            new_dataset = load_from_disk(tmp_dir).apply(get_length_typed, mode="local")
+            self.assertEqual(new_dataset.features["length"].dtype, "int32")
+            self.assertTrue(new_dataset.features["half"].is_bucket)
+
+        with self.assertRaises(ValueError):
+            dataset.apply(get_length_undeclared, mode="memory")
+
+    def test_augment(self):
+        dataset = Dataset.from_dict({"text": ["a", "b", "c"], "label": [0, 1, 0]})
+        expected = {
+            "source_index": [0, 0, 1, 1, 2, 2],
+            "variant_id": [0, 1, 0, 1, 0, 1],
+            "text_shout": ["a!", "a!!", "b!", "b!!", "c!", "c!!"],
+        }
+        # the variants hook is called once per sample
+        Calls.variants.clear()
+        variants = dataset.augment(shout, n_variants=2, seed=1)
+        self.assertEqual(variants[:], expected)
+        self.assertEqual(Calls.variants, ["a", "b", "c"])
+        self.assertEqual(variants.features["source_index"].dtype, "int64")
+
+        # without a hook, the operation is called once per seed
+        Calls.variants.clear()
+        variants = dataset.augment(shout_batched, n_variants=2, seed=1)
+        self.assertEqual(variants[:], expected)
+        self.assertEqual(len(Calls.variants), 6)
+        variants = dataset.augment(shout_batched, n_variants=2, seed=1, num_proc=2)
+        self.assertEqual(variants[:], expected)
+        variants = dataset.select([2, 0]).augment(shout, n_variants=1, prefix="p")
+        self.assertEqual(variants["source_index"], [0, 1])
+        self.assertEqual(variants["p_text_shout"], ["c", "a"])
+
+        with self.assertRaises(ValueError):
+            dataset.augment(shout_once, n_variants=2)
+        with self.assertRaises(ValueError):
+            dataset.augment(get_average_length, n_variants=2)
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            dataset.save_to_disk(tmp_dir)
+            dataset = load_from_disk(tmp_dir)
+            dataset.augment(shout, n_variants=2, seed=1)
+            # the variants are reloaded from the cache
+            Calls.variants.clear()
+            variants = dataset.augment(shout, n_variants=2, seed=1)
+            self.assertEqual(variants[:], expected)
+            self.assertEqual(Calls.variants, [])
+
+    def test_apply_profile(self):
+        dataset = Dataset.from_dict(
+            {"text": ["I love this movie", "so bad", "just fine", "a b c d e"]}
+        )
+        new_dataset = dataset.apply(get_length, mode="memory", profile=True)
+        new_dataset = new_dataset.apply(get_average_length, profile=True)
+        new_dataset = new_dataset.map(lambda x: x, profile=True)
+        self.assertNotIn(PROFILE_STAT_KEY, dataset._stat)
+
+        records = new_dataset._stat[PROFILE_STAT_KEY]
+        self.assertEqual(
+            [record["operation"] for record in records],
+            ["get_length", "get_average_length", "<lambda>"],
+        )
+        self.assertEqual([record["num_rows"] for record in records], [4, 4, 4])
+        self.assertGreater(records[0]["phases"]["operation"], 0)
+        self.assertGreater(records[0]["phases"]["attach"], 0)
+        self.assertLessEqual(
+            sum(records[0]["phases"].values()), records[0]["wall_time"]
+        )
+
+        lengths = [x["length"] for x in dataset.apply(get_length, profile=True)]
+        self.assertEqual(lengths, new_dataset["length"])
+        self.assertEqual(dataset._stat[PROFILE_STAT_KEY][0]["mode"], "realtime")
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = os.path.join(tmp_dir, "profile.jsonl")
+            self.assertEqual(new_dataset.export_profile(path), 3)
+            with open(path) as f:
+                self.assertEqual([json.loads(line) for line in f], records)
+
 
 if __name__ == "__main__":
     unittest.main()
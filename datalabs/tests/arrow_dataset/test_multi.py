@@ -1,9 +1,33 @@
+import os
 from time import perf_counter
 import unittest
 
-from featurize import get_text_length
+from aggregate import get_average_length
+from featurize import featurizing, get_length, get_text_length
 
-from datalabs import load_dataset
+from datalabs import Dataset, DatasetDict, load_dataset
+from datalabs.operations.executor import get_executor
+
+preloads = []
+
+
+def load_offset():
+    preloads.append(os.getpid())
+    return {"offset": 1}
+
+
+@featurizing(name="get_shifted_length", preload=load_offset)
+def get_shifted_length(text, offset):
+    return {"shifted_length": len(text.split(" ")) + offset, "pid": os.getpid()}
+
+
+def square(number):
+    return number * number
+
+
+def nested_squares(numbers):
+    # run in a worker, which can't start its own pool
+    return list(get_executor(2).imap(square, numbers))
 
 
 class MyTestCase(unittest.TestCase):
@@ -21,6 +45,48 @@ class MyTestCase(unittest.TestCase):
         # two_end = perf_counter()
         # print("Two proc: " + str(two_end - two_start))
 
+    def test_apply_parallel(self):
+        dataset = Dataset.from_dict(
+            {"text": ["I love this movie", "so bad", "just fine", "a b c d e"] * 5}
+        )
+        expected = dataset.apply(get_length, mode="memory")["length"]
+        self.assertEqual(
+            dataset.apply(get_length, mode="memory", num_proc=2)["length"], expected
+        )
+
+        del preloads[:]
+        realtime = [
+            item["shifted_length"] for item in dataset.apply(get_shifted_length)
+        ]
+        self.assertEqual(realtime, [length + 1 for length in expected])
+        self.assertEqual(preloads, [os.getpid()])
+
+        # the worker processes are reused by the later calls and the splits
+        first = dataset.apply(get_shifted_length, mode="memory", num_proc=2)
+        splits = DatasetDict({"train": dataset, "test": dataset.select([0, 1])})
+        second = splits.apply(get_shifted_length, mode="memory", num_proc=2)
+        self.assertIs(get_executor(2), get_executor(2))
+        self.assertEqual(first["shifted_length"], realtime)
+        self.assertEqual(second["test"]["shifted_length"], realtime[:2])
+        pids = set(first["pid"]) | set(second["train"]["pid"])
+        self.assertLessEqual(len(pids | set(second["test"]["pid"])), 2)
+        self.assertNotIn(os.getpid(), pids)
+
+    def test_dataset_dict_apply(self):
+        dataset = Dataset.from_dict({"text": ["I love this movie", "so bad"]})
+        splits = DatasetDict({"train": dataset, "test": dataset.select([1])})
+        # lazy by default, as `Dataset.apply`
+        lengths = splits.apply(get_length)
+        self.assertEqual(list(lengths["test"]), [{"length": 2}])
+
+        stats = splits.apply(get_average_length, mode="memory")
+        self.assertNotIsInstance(stats, DatasetDict)
+        self.assertEqual(stats["test"]._stat, {"average_length": 2.0})
+
+    def test_nested_executor(self):
+        squares = get_executor(2).imap(nested_squares, [[1, 2], [3]], chunksize=1)
+        self.assertEqual(list(squares), [[1, 4], [9]])
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -1,8 +1,10 @@
+import os
+import tempfile
 import unittest
 
 from featurize import get_length
 
-from datalabs import load_dataset
+from datalabs import Dataset, load_dataset, load_from_disk
 
 
 class MyTestCase(unittest.TestCase):
@@ -21,6 +23,42 @@ class MyTestCase(unittest.TestCase):
         # dataset_train_new2 = dataset['train'].apply_local(get_length, "length")
         # save new features into local arrow
 
+    def test_apply_local(self):
+        dataset = Dataset.from_dict(
+            {"text": ["I love this movie", "so bad", "just fine", "a b c d e"]}
+        )
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            dataset.save_to_disk(tmp_dir)
+            table_file = os.path.join(tmp_dir, "dataset.arrow")
+            table_size = os.path.getsize(table_file)
+
+            dataset = load_from_disk(tmp_dir)
+            new_dataset = dataset.apply(get_length, mode="local", prefix="test")
+            self.assertEqual(new_dataset["test_length"], [4, 2, 2, 5])
+            declared = new_dataset.features["test_length"]
+            self.assertTrue(declared.is_bucket)
+            self.assertFalse(declared.raw_feature)
+            # the new column is stored on its own, the table file is untouched
+            self.assertEqual(os.path.getsize(table_file), table_size)
+            self.assertTrue(
+                os.path.exists(
+                    os.path.join(tmp_dir, "dataset-column-test_length.arrow")
+                )
+            )
+
+            reloaded = load_from_disk(tmp_dir)
+            self.assertEqual(reloaded.column_names, ["text", "test_length"])
+            self.assertEqual(reloaded["test_length"], [4, 2, 2, 5])
+            # the declared feature is stored with the column
+            self.assertEqual(reloaded.features["test_length"], declared)
+
+            # applying again replaces the stored column
+            new_dataset = reloaded.apply(get_length, mode="local", prefix="test")
+            self.assertEqual(new_dataset.column_names, ["text", "test_length"])
+            reloaded = load_from_disk(tmp_dir)
+            self.assertEqual(reloaded["test_length"], [4, 2, 2, 5])
+            self.assertEqual(reloaded.features["test_length"], declared)
+
 
 if __name__ == "__main__":
     unittest.main()
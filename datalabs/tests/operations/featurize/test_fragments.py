@@ -0,0 +1,74 @@
+import random
+import unittest
+from unittest import mock
+
+from datalabs.operations.featurize.plugins.summarization.fragments import (
+    greedy_fragments,
+    longest_prefix_matches,
+)
+from datalabs.operations.featurize.summarization import (
+    _attributes_cache,
+    get_copy_len,
+    get_density,
+)
+
+
+def quadratic_fragments(a, b):
+    # the former `SUMAttribute.overlap`
+    matches = []
+    a_start = b_start = 0
+    while a_start < len(a):
+        best_match, best_match_length = None, 0
+        while b_start < len(b):
+            if a[a_start] == b[b_start]:
+                a_end, b_end = a_start, b_start
+                while a_end < len(a) and b_end < len(b) and b[b_end] == a[a_end]:
+                    b_end += 1
+                    a_end += 1
+                length = a_end - a_start
+                if length > best_match_length:
+                    best_match, best_match_length = (a_start, b_start, length), length
+                b_start = b_end
+            else:
+                b_start += 1
+        b_start = 0
+        if best_match:
+            matches.append(best_match)
+            a_start += best_match_length
+        else:
+            a_start += 1
+    return matches
+
+
+class MyTestCase(unittest.TestCase):
+    def test_greedy_fragments(self):
+        # the scan skips the tokens of a match, missing the longer one at 1
+        a, b = list("xxxy"), list("xxxxy")
+        self.assertEqual(greedy_fragments(a, b), [(0, 0, 3), (3, 4, 1)])
+        self.assertEqual(longest_prefix_matches(a, b), [4, 3, 2, 1])
+
+        rng = random.Random(0)
+        for _ in range(2000):
+            vocab = range(rng.randint(1, 5))
+            a = [rng.choice(vocab) for _ in range(rng.randint(0, 20))]
+            b = [rng.choice(vocab) for _ in range(rng.randint(0, 30))]
+            self.assertEqual(greedy_fragments(a, b), quadratic_fragments(a, b))
+
+    def test_shared_attributes(self):
+        sample = {"text": "a b c d . e f", "summary": "a b c . x"}
+        _attributes_cache.clear()
+        with mock.patch(
+            "nltk.word_tokenize", side_effect=lambda text: text.split()
+        ), mock.patch(
+            "nltk.sent_tokenize", side_effect=lambda text: [text]
+        ), mock.patch(
+            "datalabs.operations.featurize.utils.text_analysis._ensure_punkt"
+        ):
+            self.assertEqual(get_density.func(sample), {"density": (9 + 1) / 5})
+            self.assertEqual(len(_attributes_cache), 1)
+            self.assertEqual(get_copy_len.func(sample), {"copy_len": 2.0})
+        self.assertEqual(len(_attributes_cache), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
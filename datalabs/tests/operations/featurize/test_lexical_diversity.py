@@ -0,0 +1,61 @@
+import math
+import random
+import unittest
+
+from lexicalrichness import LexicalRichness
+import numpy as np
+
+from datalabs import Dataset
+from datalabs.operations.featurize.general import get_lexical_diversity
+from datalabs.utils import lexical_diversity
+from datalabs.utils.lexicon import lexical_richness_tokens, tokenize_lexical_richness
+
+
+def random_text(rng):
+    words = "the cat sat on a mat Dog ran far away big 42 well-known it's —".split()
+    vocab = words[: rng.randint(1, len(words))]
+    return " ".join(rng.choice(vocab) for _ in range(rng.randint(0, 100)))
+
+
+class MyTestCase(unittest.TestCase):
+    def test_lexical_richness_tokens(self):
+        rng = random.Random(0)
+        for _ in range(200):
+            text = random_text(rng) + " Ünïcode, (x)y!"
+            self.assertEqual(
+                lexical_richness_tokens(text), LexicalRichness(text).wordlist
+            )
+
+    def test_lexical_diversity(self):
+        rng = random.Random(1)
+        texts = [random_text(rng) for _ in range(300)] + ["", "42 -"]
+        tokens = tokenize_lexical_richness(texts)
+        ttr = lexical_diversity.ttr(tokens)
+        rttr = lexical_diversity.root_ttr(tokens)
+        mtld = lexical_diversity.mtld(tokens)
+        hdd = lexical_diversity.hdd(tokens)
+        for i, text in enumerate(texts):
+            expected = LexicalRichness(text)
+            if expected.words == 0:
+                self.assertEqual([ttr[i], rttr[i], mtld[i]], [0, 0, 0])
+                continue
+            self.assertEqual(ttr[i], expected.ttr)
+            self.assertEqual(rttr[i], expected.rttr)
+            self.assertEqual(mtld[i], expected.mtld())
+            if expected.words < 42:
+                self.assertTrue(math.isnan(hdd[i]))
+            else:
+                self.assertAlmostEqual(hdd[i], expected.hdd(), places=9)
+
+    def test_get_lexical_diversity(self):
+        texts = ["a b a c " * 20, "", "a b"]
+        dataset = Dataset.from_dict({"text": texts})
+        res = dataset.apply(get_lexical_diversity, mode="memory")
+        # the measures are declared as float32
+        self.assertEqual(res["ttr"], np.float32([3 / 80, 0, 1]).tolist())
+        self.assertEqual(res["mtld"][1:], [0, 2])
+        self.assertEqual(res["hdd"][1:], [None, None])
+
+
+if __name__ == "__main__":
+    unittest.main()
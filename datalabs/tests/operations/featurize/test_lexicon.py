@@ -0,0 +1,83 @@
+import unittest
+
+from lexicalrichness import LexicalRichness
+import numpy as np
+
+from datalabs import Dataset
+from datalabs.operations.featurize.general import (
+    get_basic_words,
+    get_basic_words_batched,
+    get_features_sample_level,
+    get_features_sample_level_batched,
+    get_gender_bias,
+)
+from datalabs.utils.lexicon import (
+    BASIC_WORDS,
+    BASIC_WORDS_INDEX,
+    count_types,
+    split_lower,
+    tokenize_lexical_richness,
+)
+
+
+class MyTestCase(unittest.TestCase):
+    texts = [
+        "I love this movie .",
+        "Apple is looking at buying U.K. startup for $1 billion",
+        "The  KING and his Wife",
+        "İstanbul is a city",
+        "",
+        " 1990s: the x-ray \u2014 (X-RAY)\u3000scan, the SCAN! ",
+        "42 --",
+    ]
+
+    def test_count(self):
+        self.assertIn("apple", BASIC_WORDS_INDEX)
+        self.assertNotIn("knee,knife", BASIC_WORDS_INDEX)
+        self.assertEqual(len(BASIC_WORDS_INDEX), len(set(BASIC_WORDS)))
+
+        tokens = split_lower(self.texts)
+        self.assertEqual(tokens.to_pylist(), [t.lower().split(" ") for t in self.texts])
+        self.assertEqual(
+            BASIC_WORDS_INDEX.count_batch(tokens).tolist(),
+            [BASIC_WORDS_INDEX.count(t.lower().split(" ")) for t in self.texts],
+        )
+        self.assertEqual(
+            BASIC_WORDS_INDEX.count_batch(tokens.slice(2)).tolist(),
+            BASIC_WORDS_INDEX.count_batch(split_lower(self.texts[2:])).tolist(),
+        )
+
+    def test_operations(self):
+        dataset = Dataset.from_dict({"text": self.texts[:4]})
+        expected = []
+        for text in self.texts[:4]:
+            words = text.split(" ")
+            n_basic_words = len([w for w in words if w.lower() in BASIC_WORDS])
+            expected.append(n_basic_words / len(words))
+        for op in [get_basic_words, get_basic_words_batched]:
+            res = dataset.apply(op, mode="memory")
+            # the ratios are declared as float32
+            self.assertEqual(res["basic_word_ratio"], np.float32(expected).tolist())
+        self.assertEqual(
+            get_basic_words(self.texts[0]), {"basic_word_ratio": expected[0]}
+        )
+
+        res = dataset.apply(get_gender_bias, mode="memory")
+        self.assertEqual(res["gender_bias_info"][2]["word"], {"male": 2, "female": 1})
+
+    def test_lexical_richness(self):
+        tokens = tokenize_lexical_richness(self.texts)
+        lexes = [LexicalRichness(text) for text in self.texts]
+        self.assertEqual(tokens.to_pylist(), [lex.wordlist for lex in lexes])
+        self.assertEqual(count_types(tokens).tolist(), [lex.terms for lex in lexes])
+
+        dataset = Dataset.from_dict({"text": self.texts})
+        res = dataset.apply(get_features_sample_level_batched, mode="memory")
+        expected = dataset.apply(get_features_sample_level, mode="memory")
+        self.assertEqual(res.features, expected.features)
+        for name in get_features_sample_level.outputs:
+            self.assertEqual(res[name], expected[name])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,72 @@
+import random
+import unittest
+from unittest import mock
+
+from nltk.tokenize.punkt import PunktSentenceTokenizer
+
+from datalabs import Dataset
+from datalabs.operations.featurize.plugins.summarization import extractive_methods
+from datalabs.operations.featurize.plugins.summarization.extractive_methods import (
+    _compute_rouge,
+    _ext_oracle,
+    _lead_k,
+    compute_rouge,
+)
+from datalabs.operations.featurize.summarization import get_oracle_labels
+
+# stands for nltk's sent_tokenize, whose punkt model isn't needed by the tests
+sent_tokenize = PunktSentenceTokenizer().tokenize
+
+
+def random_sentence(rng):
+    words = "the cat sat on mats running runs dogs a of , 42 U.S. don't".split()
+    n_words = rng.randint(0, 10)
+    return " ".join(rng.choice(words) for _ in range(n_words)) + rng.choice(".?")
+
+
+class MyTestCase(unittest.TestCase):
+    def setUp(self):
+        patches = [
+            mock.patch.object(extractive_methods, "sent_tokenize", sent_tokenize),
+            mock.patch(
+                "datalabs.operations.featurize.summarization.sent_tokenize",
+                sent_tokenize,
+            ),
+            mock.patch("datalabs.operations.featurize.summarization._ensure_punkt"),
+        ]
+        for patch in patches:
+            patch.start()
+            self.addCleanup(patch.stop)
+
+    def test_incremental_rouge(self):
+        rng = random.Random(0)
+        for _ in range(200):
+            src = [random_sentence(rng) for _ in range(rng.randint(0, 6))]
+            ref = " ".join(random_sentence(rng) for _ in range(rng.randint(0, 3)))
+            for sim_fn in [_compute_rouge, compute_rouge]:
+                # a wrapped similarity is rescored from scratch for each candidate
+                def rescored(cand, ref, sim_fn=sim_fn):
+                    return sim_fn(cand, ref)
+
+                expected = _ext_oracle(src, ref, rescored, max_sent=-1)
+                expected["oracle_score"] = float(expected["oracle_score"])
+                self.assertEqual(_ext_oracle(src, ref, sim_fn, max_sent=-1), expected)
+                self.assertEqual(
+                    _lead_k(src, ref, sim_fn, k=2), _lead_k(src, ref, rescored, k=2)
+                )
+
+    def test_oracle_labels(self):
+        rng = random.Random(1)
+        texts = [" ".join(random_sentence(rng) for _ in range(5)) for _ in range(6)]
+        summaries = [random_sentence(rng) for _ in range(6)]
+        dataset = Dataset.from_dict({"text": texts, "summary": summaries})
+
+        res = dataset.apply(get_oracle_labels, mode="memory")
+        for i, (text, summary) in enumerate(zip(texts, summaries)):
+            oracle_info = _ext_oracle(sent_tokenize(text), summary, _compute_rouge)
+            self.assertEqual(res["oracle_labels"][i], oracle_info["oracle_labels"])
+            self.assertEqual(res["oracle_score"][i], oracle_info["oracle_score"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,75 @@
+import unittest
+from unittest import mock
+
+from nltk.util import ngrams
+
+from datalabs.operations.featurize.general import get_features_sample_level
+from datalabs.operations.featurize.plugins.summarization.sum_attribute import (
+    SUMAttribute,
+)
+from datalabs.operations.featurize.summarization import (
+    get_features_sample_level as get_summarization_features,
+)
+from datalabs.operations.featurize.utils.text_analysis import TextAnalysis
+
+
+def sent_tokenize(text):
+    return [sent + "." for sent in text.split(".") if sent.strip()]
+
+
+def word_tokenize(text):
+    return text.replace(".", " .").split()
+
+
+class MyTestCase(unittest.TestCase):
+    text = "The King met the queen. The queen met the King. They talked."
+    summary = "The king met the queen. The king met the queen."
+
+    def setUp(self):
+        # stand for the nltk tokenizers, whose punkt model isn't needed by the tests
+        self.sent_tokenize = mock.Mock(side_effect=sent_tokenize)
+        self.word_tokenize = mock.Mock(side_effect=word_tokenize)
+        patches = [
+            mock.patch("nltk.sent_tokenize", self.sent_tokenize),
+            mock.patch("nltk.word_tokenize", self.word_tokenize),
+            mock.patch(
+                "datalabs.operations.featurize.utils.text_analysis._ensure_punkt"
+            ),
+        ]
+        for patch in patches:
+            patch.start()
+            self.addCleanup(patch.stop)
+
+    def test_memoized(self):
+        analysis = TextAnalysis(self.summary)
+        self.assertIs(TextAnalysis.of(analysis), analysis)
+        self.assertEqual(analysis.lower_words, self.summary.lower().split(" "))
+
+        expected = []
+        for sent in sent_tokenize(self.summary.lower()):
+            expected.extend(ngrams(word_tokenize(sent), n=2))
+        self.assertEqual(analysis.ngrams(2), expected)
+        self.assertEqual(analysis.ngram_counts(2)[("the", "king")], 2)
+        analysis.ngrams(3)
+        self.assertIs(analysis.word_tokens, analysis.word_tokens)
+        self.assertEqual(self.sent_tokenize.call_count, 1)
+        self.assertEqual(self.word_tokenize.call_count, 3)
+
+    def test_shared_analysis(self):
+        expected = SUMAttribute().cal_attributes_each(self.text, self.summary)
+        self.sent_tokenize.reset_mock()
+        self.word_tokenize.reset_mock()
+        res = get_summarization_features.func(
+            {"text": self.text, "summary": self.summary}
+        )
+        # each text is split into sentences and words once
+        self.assertEqual(self.sent_tokenize.call_count, 2)
+        self.assertEqual(self.word_tokenize.call_count, 2 + 3 + 2)
+        for name in ["density", "coverage", "compression", "repetition", "novelty"]:
+            self.assertEqual(res[name], expected["attr_" + name])
+        for name, value in get_features_sample_level.func(self.summary).items():
+            self.assertEqual(res["summary_" + name], value)
+
+
+if __name__ == "__main__":
+    unittest.main()
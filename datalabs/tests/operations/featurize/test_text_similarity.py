@@ -0,0 +1,100 @@
+import random
+import unittest
+from unittest import mock
+
+import numpy as np
+import sacrebleu
+
+from datalabs import Dataset
+from datalabs.operations.aggregate import text_matching
+from datalabs.operations.aggregate.text_matching import (
+    get_similarity_by_sacrebleu,
+    get_statistics,
+)
+from datalabs.operations.featurize.text_matching import get_similarity
+from datalabs.utils import text_similarity
+from datalabs.utils.text_similarity import pair_similarities, tokenize_bleu
+
+
+def random_text(rng):
+    words = "the cat sat on a mat . , dog ran ! 42 1.5 well-known it's (x) &amp; Über"
+    vocab = words.split()[: rng.randint(1, 20)]
+    text = " ".join(rng.choice(vocab) for _ in range(rng.randint(0, 30)))
+    return text + rng.choice(["", " ", " .", "-\n"])
+
+
+class MyTestCase(unittest.TestCase):
+    def test_tokenize_bleu(self):
+        tokenizer = sacrebleu.tokenizers.tokenizer_13a.Tokenizer13a()
+        rng = random.Random(0)
+        chars = list("ab1.,-&;<>\n\t\x1c {}[]`~@/:()+\"'İ") + ["&quot;", "<skipped>"]
+        texts = [
+            "".join(rng.choice(chars) for _ in range(rng.randint(0, 15)))
+            for _ in range(1000)
+        ]
+        for text, tokens in zip(texts, tokenize_bleu(texts).to_pylist()):
+            self.assertEqual(tokens, tokenizer(text.rstrip()).split())
+
+    def test_pair_similarities(self):
+        rng = random.Random(1)
+        texts1 = [random_text(rng) for _ in range(500)] + ["", "a"]
+        texts2 = [random_text(rng) for _ in range(500)] + ["", ""]
+        similarities = pair_similarities(texts1, texts2)
+        # n-gram ids are ranked when their base-n numbers don't fit in int64
+        with mock.patch.object(text_similarity, "_MAX_KEY", 1000):
+            ranked = pair_similarities(texts1, texts2)
+        for i, (text1, text2) in enumerate(zip(texts1, texts2)):
+            self.assertAlmostEqual(
+                similarities["bleu"][i],
+                sacrebleu.sentence_bleu(text2, [text1]).score,
+                places=10,
+            )
+            self.assertEqual(
+                similarities["chrf"][i], sacrebleu.sentence_chrf(text2, [text1]).score
+            )
+            words1 = set(tokenize_bleu([text1])[0].as_py())
+            words2 = set(tokenize_bleu([text2])[0].as_py())
+            common = len(words1 & words2)
+            self.assertEqual(
+                similarities["jaccard"][i],
+                common / len(words1 | words2) if words1 | words2 else 0,
+            )
+            self.assertEqual(
+                similarities["overlap"][i],
+                common / min(len(words1), len(words2)) if words1 and words2 else 0,
+            )
+            for name in similarities:
+                self.assertEqual(ranked[name][i], similarities[name][i])
+
+    def test_similarity_operations(self):
+        rng = random.Random(2)
+        texts1 = [random_text(rng) + " a" for _ in range(20)]
+        texts2 = [random_text(rng) + " b" for _ in range(20)]
+        dataset = Dataset.from_dict(
+            {"text1": texts1, "text2": texts2, "label": [0, 1] * 10}
+        )
+
+        res = dataset.apply(get_similarity, mode="memory")
+        # the similarities are declared as float32
+        self.assertEqual(
+            res["bleu"],
+            pair_similarities(texts1, texts2)["bleu"].astype(np.float32).tolist(),
+        )
+
+        # the similarities are computed by chunks of samples as they are read
+        with mock.patch.object(text_matching, "SIMILARITY_BATCH_SIZE", 3):
+            statistics = dataset.apply(get_statistics)._stat
+        expected = [get_similarity_by_sacrebleu(*pair) for pair in zip(texts1, texts2)]
+        for i, sample in enumerate(statistics["sample-level"]):
+            self.assertAlmostEqual(
+                sample["similarity_of_text_pair"], expected[i], places=10
+            )
+        dataset_level = statistics["dataset-level"]
+        self.assertEqual(dataset_level["number_of_samples"], 20)
+        self.assertAlmostEqual(
+            dataset_level["average_similarity"], np.average(expected), places=10
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,73 @@
+from concurrent.futures import ThreadPoolExecutor
+import unittest
+
+from datalabs import Dataset
+from datalabs.operations.featurize.featurizing import featurizing
+from datalabs.operations.operation import (
+    FIELD_OPERATION,
+    OperationFunction,
+    PROMPT_OPERATION,
+)
+from datalabs.operations.prompt.topic_classification import template_tc2
+
+
+class Counter:
+    def __init__(self, offset):
+        self.offset = offset
+
+    def count(self, text, unit=" "):
+        return {"count": len(text.split(unit)) + self.offset}
+
+
+@featurizing(name="get_num_chars", resources={"unit": "char"})
+def get_num_chars(text, unit=None):
+    return {"num_" + unit + "s": len(text)}
+
+
+class MyTestCase(unittest.TestCase):
+    def test_plan(self):
+        self.assertEqual(get_num_chars.kind, FIELD_OPERATION)
+        self.assertEqual(template_tc2.kind, PROMPT_OPERATION)
+        plan = get_num_chars.plan()
+        self.assertIs(get_num_chars.plan(), plan)
+        self.assertEqual(plan.field, "text")
+        self.assertEqual(get_num_chars.run({"text": "abc"}), {"num_chars": 3})
+        self.assertEqual(get_num_chars("abcd"), {"num_chars": 4})
+
+        # setting the resources recompiles the plan
+        get_num_chars.resources = {"unit": "character"}
+        self.assertIsNot(get_num_chars.plan(), plan)
+        self.assertEqual(get_num_chars("ab"), {"num_characters": 2})
+        get_num_chars.resources = {"unit": "char"}
+
+        # workers compile their own plan
+        self.assertIsNone(get_num_chars.__getstate__()["_plan"])
+
+    def test_set(self):
+        operation = get_num_chars.set("title")
+        self.assertIs(type(operation), type(get_num_chars))
+        self.assertEqual(operation.processed_fields, ["title"])
+        self.assertEqual(get_num_chars.processed_fields, ["text"])
+        self.assertEqual(operation.run({"title": "abc"}), {"num_chars": 3})
+
+    def test_method_operation(self):
+        count = OperationFunction(
+            name="count", func=Counter.count, resources={"cls": Counter(1)}
+        )
+        texts = ["a b", "c d e", "f"] * 100
+        # the instance isn't consumed by the first call
+        self.assertEqual(count("a b"), {"count": 3})
+        self.assertEqual(count("a b"), {"count": 3})
+        self.assertIn("cls", count.resources)
+
+        with ThreadPoolExecutor(4) as executor:
+            outputs = list(executor.map(count, texts))
+        self.assertEqual(outputs, [count(text) for text in texts])
+
+        dataset = Dataset.from_dict({"text": texts[:3]})
+        self.assertEqual(list(dataset.apply(count)), [{"count": c} for c in [3, 4, 2]])
+        self.assertEqual(dataset.apply(count, mode="memory")["count"], [3, 4, 2])
+
+
+if __name__ == "__main__":
+    unittest.main()
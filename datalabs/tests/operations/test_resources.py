@@ -0,0 +1,99 @@
+from pathlib import Path
+import tempfile
+import unittest
+from unittest import mock
+
+from datalabs import Dataset
+from datalabs.operations import operation, resources
+from datalabs.operations.edit.plugins.general.add_typo.transformation import add_typo
+from datalabs.operations.edit.plugins.general.britishize_americanize.transformation import (  # noqa: E501
+    britishize_americanize,
+)
+from datalabs.operations.edit.plugins.general.insert_abbreviation import (
+    grammaire,
+    transformation,
+)
+from datalabs.operations.resources import (
+    freeze,
+    load_resource,
+    preload_resources,
+    register_resource,
+)
+
+
+class MyTestCase(unittest.TestCase):
+    def test_freeze(self):
+        frozen = freeze({"a": [1, {"b": [2]}], "c": {3}})
+        self.assertEqual(frozen["a"], (1, {"b": (2,)}))
+        self.assertEqual(frozen["c"], frozenset({3}))
+        with self.assertRaises(TypeError):
+            frozen["a"] = 1
+        with self.assertRaises(TypeError):
+            frozen["a"][1]["b"] = 1
+
+    def test_load_resource(self):
+        loads = []
+
+        def load_numbers():
+            loads.append(1)
+            return {"one": [1]}
+
+        register_resource("test_numbers", load_numbers)
+        with self.assertRaises(ValueError):
+            register_resource("test_numbers", lambda: {})
+        numbers = load_resource("test_numbers")
+        self.assertEqual(numbers["one"], (1,))
+        self.assertIs(load_resource("test_numbers"), numbers)
+        self.assertEqual(preload_resources("test_numbers")(), {"test_numbers": numbers})
+        self.assertEqual(len(loads), 1)
+        with self.assertRaises(KeyError):
+            load_resource("test_unknown")
+
+    def test_edit_resources(self):
+        spell_errors = load_resource("spell_errors")
+        self.assertIsInstance(next(iter(spell_errors.values())), tuple)
+        self.assertEqual(
+            britishize_americanize("the colour of my trousers"),
+            {"text_britishize_americanize": "the color of my pants"},
+        )
+
+        # the resource files are parsed once for the whole dataset
+        loads = []
+
+        def load_spell_errors():
+            loads.append(1)
+            return {"recieve": ["receive"]}
+
+        dataset = Dataset.from_dict({"text": ["I recieve the letter"] * 10})
+        with mock.patch.dict(operation._preloaded_resources, clear=True):
+            with mock.patch.dict(resources._resources, clear=True):
+                with mock.patch.dict(
+                    resources._loaders, {"spell_errors": load_spell_errors}
+                ):
+                    add_typo.resources = {}
+                    res = dataset.apply(add_typo, mode="memory")
+        add_typo.resources = {}
+        self.assertEqual(len(loads), 1)
+        self.assertEqual(len(res["text_add_typo"]), 10)
+
+    def test_grammar_cache(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            with mock.patch.object(transformation, "GRAMMARS_CACHE", Path(tmp_dir)):
+                with mock.patch.object(
+                    grammaire, "compile", wraps=grammaire.compile
+                ) as compile:
+                    grammar = transformation._load_grammar("replacement_rules_en.txt")
+                    # the second load reads the compiled grammar saved on disk
+                    cached = transformation._load_grammar("replacement_rules_en.txt")
+                self.assertEqual(compile.call_count, 1)
+                self.assertEqual(len(list(Path(tmp_dir).iterdir())), 1)
+        text = "Are you serious? Thank you for your help"
+        self.assertEqual(grammaire.parse(text, cached), grammaire.parse(text, grammar))
+        self.assertEqual(
+            transformation.insert_abbreviation(text),
+            {"text_insert_abbreviation": "Ays 10q 4 ya halp"},
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,41 @@
+import os
+import tempfile
+import unittest
+
+from datalabs.operations.edit.substitutions import (
+    SubstitutionTable,
+    write_substitution_table,
+)
+
+
+class MyTestCase(unittest.TestCase):
+    def test_substitution_table(self):
+        rows = [
+            ("dog", "n", {"hypernyms": ("canine", "domestic animal")}),
+            ("dog", "v", {"synonyms": ("chase",)}),
+            ("ice_cream", "n", {"hyponyms": ("sundae",)}),
+            ("cat", "n", {"hypernyms": ("feline",), "hyponyms": ("kitty",)}),
+        ]
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = os.path.join(tmp_dir, "substitutions.arrow")
+            write_substitution_table(rows, path)
+            table = SubstitutionTable(path, cache_size=2)
+            self.assertEqual(len(table), 4)
+            self.assertEqual(
+                table.get("Dog", "n", "hypernyms"), ("canine", "domestic animal")
+            )
+            self.assertEqual(table.get("dog", "n", "synonyms"), ())
+            self.assertEqual(table.get("dog", "v", "synonyms"), ("chase",))
+            self.assertEqual(table.get("ice cream", "n", "hyponyms"), ("sundae",))
+            self.assertEqual(table.get("cat", "n", "hyponyms"), ("kitty",))
+            self.assertEqual(table.get("bird", "n", "hypernyms"), ())
+            # the rows are decoded once while they stay in the LRU cache
+            hits = table.lookup.cache_info().hits
+            table.get("bird", "n", "hyponyms")
+            self.assertEqual(table.lookup.cache_info().hits, hits + 1)
+            self.assertEqual(table.lookup.cache_info().currsize, 2)
+            del table
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,6 +1,7 @@
 import unittest
 
 from datalabs.operations.data import Data, TextData
+from datalabs.operations.operation import OperationFunction, STATISTICS_OPERATION
 
 """
 from datalab.operations.edit.core import add_typos_checklist
@@ -19,6 +20,10 @@ res = dataset["test"].apply(get_length)
 """
 
 
+class CountTexts(OperationFunction):
+    kind = STATISTICS_OPERATION
+
+
 class MyTestCase(unittest.TestCase):
     def test_Data(self):
         a = ["I love this movie", "do you love this movie"]
@@ -34,6 +39,11 @@ class MyTestCase(unittest.TestCase):
 
         self.assertEqual(A.data, [{"text": text} for text in a])
 
+    def test_apply_statistics(self):
+        count = CountTexts(name="count", func=lambda texts: {"count": len(texts)})
+        A = TextData(["I love this movie", "do you love this movie"])
+        self.assertEqual(list(A.apply(count)), [{"count": 2}])
+
 
 if __name__ == "__main__":
     unittest.main()
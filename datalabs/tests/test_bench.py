@@ -0,0 +1,45 @@
+import unittest
+
+from datalabs.utils.benchmark import (
+    collect_operations,
+    make_dataset,
+    run_benchmarks,
+    synthetic_corpus,
+)
+
+
+class MyTestCase(unittest.TestCase):
+    def test_synthetic_corpus(self):
+        corpus = synthetic_corpus(10)
+        self.assertEqual(corpus, synthetic_corpus(10))
+        dataset = make_dataset(corpus)
+        self.assertEqual(dataset.num_rows, 10)
+        self.assertEqual(dataset.features["label"].names, ["negative", "positive"])
+
+    def test_run_benchmarks(self):
+        records = []
+        results = run_benchmarks(
+            suites=["dataset", "operations"],
+            sizes=[20],
+            pattern="featurize.get_length",
+            callback=records.append,
+        )
+        self.assertEqual(results["results"], records)
+        names = {(record["suite"], record["name"]) for record in records}
+        self.assertIn(("dataset", "map"), names)
+        self.assertIn(("dataset", "save_to_disk"), names)
+        self.assertIn(("operations", "featurize.get_length"), names)
+
+        record = next(r for r in records if r["name"] == "featurize.get_length")
+        self.assertIsNone(record["error"])
+        self.assertEqual(record["num_rows"], 20)
+        self.assertGreater(record["phases"]["operation"], 0)
+
+    def test_collect_operations(self):
+        operations, _ = collect_operations("aggregate.*")
+        self.assertIn("aggregate.general.get_average_length", operations)
+        self.assertTrue(all(name.startswith("aggregate.") for name in operations))
+
+
+if __name__ == "__main__":
+    unittest.main()
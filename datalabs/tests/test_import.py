@@ -0,0 +1,53 @@
+import subprocess
+import sys
+import unittest
+
+HEAVY_MODULES = [
+    "checklist",
+    "compare_mt",
+    "jieba",
+    "lexicalrichness",
+    "nltk",
+    "sacrebleu",
+    "scipy",
+    "sklearn",
+    "spacy",
+]
+
+
+def imported_heavy_modules(code):
+    script = (
+        f"import sys\n{code}\n"
+        f"print(','.join(m for m in {HEAVY_MODULES!r} if m in sys.modules))"
+    )
+    output = subprocess.check_output([sys.executable, "-c", script], text=True)
+    return [m for m in output.strip().split(",") if m]
+
+
+class MyTestCase(unittest.TestCase):
+    def test_import_datalabs(self):
+        self.assertEqual(imported_heavy_modules("import datalabs"), [])
+
+    def test_import_operations(self):
+        code = (
+            "from datalabs.operations import edit, featurize, preprocess\n"
+            "from datalabs.operations.featurize import get_length"
+        )
+        self.assertEqual(imported_heavy_modules(code), [])
+
+    def test_lazy_exports(self):
+        from datalabs.operations import featurize
+        from datalabs.operations.registry import list_operations
+
+        self.assertIn("get_length", dir(featurize))
+        self.assertEqual(featurize.get_length.name, "get_length")
+        self.assertEqual(
+            list_operations(featurize.__name__)[f"{featurize.__name__}.get_length"],
+            "datalabs.operations.featurize.general",
+        )
+        with self.assertRaises(AttributeError):
+            featurize.not_an_operation
+
+
+if __name__ == "__main__":
+    unittest.main()
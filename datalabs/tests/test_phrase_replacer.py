@@ -0,0 +1,66 @@
+import unittest
+from unittest import mock
+
+from datalabs.operations.edit.plugins.general.replace_acronyms.transformation import (  # noqa: E501
+    transformation,
+)
+from datalabs.operations.resources import load_resource
+from datalabs.utils import phrase_replacer
+from datalabs.utils.phrase_replacer import get_phrase_replacer, PhraseReplacer
+
+
+class MyTestCase(unittest.TestCase):
+    def test_replace(self):
+        replacer = PhraseReplacer(
+            {"New York": "NY", "New York City": "NYC", "NY": "New York", "ork": "x"}
+        )
+        # the longest phrase wins, replaced text isn't scanned again
+        self.assertEqual(
+            replacer.replace("New York City is in New York, NY"),
+            "NYC is in NY, New York",
+        )
+        self.assertEqual(replacer.replace("new york"), "new yx")
+        self.assertEqual(
+            replacer.replace("New York", replacement=str.upper), "NEW YORK"
+        )
+        self.assertEqual(PhraseReplacer({}).replace("New York"), "New York")
+
+    def test_ignore_case(self):
+        replacer = PhraseReplacer({"New York": "NY", "new york": "ny"}, True)
+        self.assertEqual(replacer.replace("I love NEW YORK"), "I love NY")
+
+    def test_replace_selected(self):
+        replacer = PhraseReplacer({"ab": "1", "abc": "2", "bcd": "3"})
+        self.assertEqual(replacer.replace_selected("abcd", {"ab", "abc"}), "2d")
+        self.assertEqual(replacer.replace_selected("abcd", {"ab"}), "1cd")
+        # a selected phrase starting inside the longest match
+        self.assertEqual(replacer.replace_selected("abcd", {"bcd"}), "a3")
+        self.assertEqual(replacer.replace_selected("abcd", set()), "abcd")
+
+    def test_get_phrase_replacer(self):
+        acronyms = load_resource("acronyms")
+        replacer = get_phrase_replacer(acronyms)
+        self.assertIs(get_phrase_replacer(acronyms), replacer)
+        self.assertIsNot(get_phrase_replacer(acronyms, ignore_case=True), replacer)
+        self.assertEqual(
+            transformation(
+                "the National Aeronautics and Space Administration", False, acronyms
+            ),
+            "the NASA",
+        )
+
+    def test_get_phrase_replacer_bounded(self):
+        mappings = [{"a": str(i)} for i in range(3)]
+        with mock.patch.object(phrase_replacer, "MAX_CACHED_REPLACERS", 2):
+            first = get_phrase_replacer(mappings[0])
+            get_phrase_replacer(mappings[1])
+            # the least recently used replacer is dropped
+            self.assertIs(get_phrase_replacer(mappings[0]), first)
+            get_phrase_replacer(mappings[2])
+            self.assertLessEqual(len(phrase_replacer._replacers), 2)
+            self.assertIs(get_phrase_replacer(mappings[0]), first)
+            self.assertEqual(get_phrase_replacer(mappings[1]).replace("a"), "1")
+
+
+if __name__ == "__main__":
+    unittest.main()
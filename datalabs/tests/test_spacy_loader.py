@@ -0,0 +1,65 @@
+import unittest
+from unittest import mock
+
+import spacy
+
+from datalabs import Dataset
+from datalabs.operations.edit.plugins.general.correct_typo.transformation import (
+    correct_typo,
+    correct_typo_batched,
+)
+from datalabs.operations.featurize import (
+    get_entities_spacy,
+    get_entities_spacy_batched,
+)
+from datalabs.utils.spacy_loader import DEFAULT_SPACY_MODEL, spacy_loader, SpacyLoader
+
+
+def blank_model():
+    nlp = spacy.blank("en")
+    ruler = nlp.add_pipe("entity_ruler", name="ner")
+    ruler.add_patterns([{"label": "GPE", "pattern": "London"}])
+    nlp.add_pipe("sentencizer")
+    return nlp
+
+
+class MyTestCase(unittest.TestCase):
+    def setUp(self):
+        # stands for en_core_web_sm, which isn't needed by the tests
+        patches = [
+            mock.patch.dict(SpacyLoader._models, {DEFAULT_SPACY_MODEL: blank_model()}),
+            mock.patch.dict(SpacyLoader._disabled, clear=True),
+        ]
+        for patch in patches:
+            patch.start()
+            self.addCleanup(patch.stop)
+
+    def test_disabled_pipes(self):
+        self.assertEqual(spacy_loader.disabled_pipes(pipes=None), [])
+        self.assertEqual(spacy_loader.disabled_pipes(pipes=("ner",)), ["sentencizer"])
+        self.assertEqual(spacy_loader.disabled_pipes(pipes=()), ["ner", "sentencizer"])
+
+        doc = spacy_loader.parse("I live in London.", pipes=("ner",))
+        self.assertEqual([ent.text for ent in doc.ents], ["London"])
+        self.assertFalse(doc.has_annotation("SENT_START"))
+        docs = list(spacy_loader.pipe(["London", "Paris"], pipes=(), batch_size=1))
+        self.assertEqual([len(doc.ents) for doc in docs], [0, 0])
+
+    def test_operations(self):
+        dataset = Dataset.from_dict({"text": ["I live in London.", "Hello there"]})
+        for op in [get_entities_spacy, get_entities_spacy_batched]:
+            res = dataset.apply(op, mode="memory")
+            self.assertEqual(res["entities"], [[["London", "GPE"]], []])
+        # the per-text operations can be called on a text directly
+        self.assertEqual(
+            get_entities_spacy("I live in London."), {"entities": [("London", "GPE")]}
+        )
+
+        dataset = Dataset.from_dict({"text": ["I beleive it .", "acheive"]})
+        for op in [correct_typo, correct_typo_batched]:
+            res = dataset.apply(op, mode="memory")
+            self.assertEqual(res["text_correct_typo"], ["I believe it .", "achieve"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,12 +1,18 @@
+import copy
 import unittest
+from unittest import mock
 
-from datalabs import load_dataset
-from datalabs.operations.preprocess.general import tokenize
+from datalabs import DatasetInfo, load_dataset
+from datalabs.operations.preprocess.general import tokenize, tokenize_batched
 from datalabs.operations.tokenizer import (
     get_default_tokenizer,
     get_tokenizer,
+    JiebaTokenizer,
+    token_cache,
+    TokenCache,
     tokenizer_registry,
 )
+from datalabs.tasks.text_classification import TextClassification
 
 
 class MyTestCase(unittest.TestCase):
@@ -25,6 +31,49 @@ class MyTestCase(unittest.TestCase):
         text_en = "I love this movie"
         print(my_tokenizer2(text_en))
 
+    def test_token_cache(self):
+        cache = TokenCache(max_size=2000)
+        for i in range(100):
+            cache.put(cache.key("SingleSpaceTokenizer", str(i)), ["token"] * 10)
+        self.assertLessEqual(cache.size, 2000)
+        self.assertEqual(cache.get(cache.key("SingleSpaceTokenizer", "0")), None)
+        self.assertEqual(
+            cache.get(cache.key("SingleSpaceTokenizer", "99")), ("token",) * 10
+        )
+
+    def test_jieba_batch(self):
+        texts = ["我喜欢这一部电影", "今天天气很好", "我喜欢这一部电影", "送餐太慢了"]
+        tokenizer = JiebaTokenizer()
+        expected = [tokenizer.tokenize(text) for text in texts]
+
+        token_cache.clear()
+        with mock.patch.object(JiebaTokenizer, "chunk_size", 1):
+            self.assertEqual(tokenizer.batch(texts, num_proc=2), expected)
+        self.assertEqual(len(token_cache), 3)
+        with mock.patch.object(tokenizer, "tokenize_batch") as tokenize_batch:
+            self.assertEqual(tokenizer.batch(texts), expected)
+            self.assertEqual(tokenizer(texts[1]), expected[1])
+        tokenize_batch.assert_not_called()
+
+        res = tokenize_batched.func(texts, language="zh", task_type="text")
+        self.assertEqual(
+            res["text_tokenized"],
+            [
+                tokenize.func(text, language="zh", task_type="text")["text_tokenized"]
+                for text in texts
+            ],
+        )
+
+    def test_prepare(self):
+        info = DatasetInfo(languages=["zh"], task_templates=[TextClassification()])
+        operation = copy.copy(tokenize_batched)
+        operation.resources = {"num_proc": 2}
+        operation.prepare(info)
+        self.assertEqual(
+            operation.resources,
+            {"num_proc": 2, "task_type": "text-classification", "language": "zh"},
+        )
+
     def test_tokenizer_operation(self):
 
         dataset = load_dataset("waimai")
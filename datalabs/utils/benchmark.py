@@ -0,0 +1,427 @@
+# Lint as: python3
+"""Benchmarks of the operations and of the core ``Dataset`` code paths.
+
+Run with ``datalabs-cli bench``. Each benchmark produces a record::
+
+    {"suite": "operations", "name": "featurize.get_length", "corpus": "synthetic",
+     "num_rows": 1000, "num_proc": 1, "wall_time": 0.01, "rows_per_second": 1e5,
+     "times": [...], "phases": {...}, "error": None}
+
+``wall_time`` is the best of the ``repeat`` runs, ``phases`` come from the
+profile record of the call (see `datalabs.utils.profiling`) for the operations,
+and ``error`` holds the exception raised by a benchmark that failed, the other
+benchmarks still run.
+"""
+from fnmatch import fnmatch
+from functools import partial
+import importlib
+import json
+import os
+import pkgutil
+import platform
+import random
+import subprocess
+import sys
+import tempfile
+import time
+import traceback
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+import pyarrow as pa
+
+from datalabs.utils.logging import get_logger
+from datalabs.utils.profiling import PROFILE_STAT_KEY
+
+logger = get_logger(__name__)
+
+SUITES = ["import", "dataset", "operations", "tokenizers"]
+
+_LABELS = ["negative", "positive"]
+_WORDS = (
+    "the a of and to in is was it for on that with as this movie film story "
+    "good bad great terrible fine acting plot I you we they he she love hate "
+    "New York Monday January color red blue doctor teacher city country"
+).split()
+
+
+def synthetic_corpus(num_rows: int, seed: int = 0) -> Dict[str, List]:
+    """Columns of a deterministic corpus with the fields read by the
+    operations: ``text``, ``text1``, ``text2``, ``summary`` and ``label``."""
+    rng = random.Random(seed)
+
+    def sentence(min_len, max_len):
+        words = rng.choices(_WORDS, k=rng.randint(min_len, max_len))
+        return " ".join(words).capitalize() + "."
+
+    corpus = {name: [] for name in ["text", "text1", "text2", "summary", "label"]}
+    for _ in range(num_rows):
+        text = " ".join(sentence(5, 25) for _ in range(rng.randint(1, 4)))
+        corpus["text"].append(text)
+        corpus["text1"].append(sentence(5, 20))
+        corpus["text2"].append(sentence(5, 20))
+        corpus["summary"].append(sentence(3, 10))
+        corpus["label"].append(rng.choice(_LABELS))
+    return corpus
+
+
+def load_corpus(path: str) -> Dict[str, List]:
+    """Columns of a fixture corpus (json, json lines or csv file)."""
+    from datalabs import load_dataset
+
+    extension = os.path.splitext(path)[1].lstrip(".")
+    builder = "csv" if extension == "csv" else "json"
+    return load_dataset(builder, data_files=path, split="train").to_dict()
+
+
+def resize_corpus(corpus: Dict[str, List], num_rows: int) -> Dict[str, List]:
+    """Repeat or truncate the columns of ``corpus`` to ``num_rows`` rows."""
+    size = len(next(iter(corpus.values())))
+    return {
+        name: [column[i % size] for i in range(num_rows)]
+        for name, column in corpus.items()
+    }
+
+
+def make_dataset(corpus: Dict[str, List]):
+    """An in-memory dataset of ``corpus``, with the metadata (task template,
+    language) the preprocessing and prompting operations read. The ``label``
+    column, if any, is encoded as a class label."""
+    from datalabs import Dataset, DatasetInfo
+    from datalabs.features import ClassLabel, Features
+    from datalabs.tasks.text_classification import TextClassification
+
+    corpus = dict(corpus)
+    names = None
+    if "label" in corpus:
+        names = sorted({str(label) for label in corpus["label"]})
+        label_ids = {name: i for i, name in enumerate(names)}
+        corpus["label"] = [label_ids[str(label)] for label in corpus["label"]]
+    features = Features.from_arrow_schema(pa.Table.from_pydict(corpus).schema)
+    if names is not None:
+        features["label"] = ClassLabel(names=names)
+    info = DatasetInfo(
+        features=features,
+        languages=["en"],
+        task_templates=[TextClassification()],
+    )
+    return Dataset.from_dict(corpus, features=features, info=info)
+
+
+def collect_operations(
+    pattern: Optional[str] = None,
+) -> Tuple[Dict[str, Any], Dict[str, str]]:
+    """Find the operations exported by the featurize, edit and preprocess
+    packages, named ``<package>.<operation>``, and the ones defined in the
+    modules of the aggregate and prompt packages, named
+    ``<package>.<module>.<operation>``.
+
+    Returns:
+        the operations whose name matches ``pattern`` (a glob), and the
+        errors raised while importing the modules defining the others.
+    """
+    from datalabs.operations.registry import list_operations
+
+    candidates: Dict[str, Callable[[], Any]] = {}
+    for package in ["featurize", "edit", "preprocess"]:
+        module = importlib.import_module(f"datalabs.operations.{package}")
+        for name in list_operations(module.__name__):
+            attr_name = name.rsplit(".", 1)[1]
+            # the module is imported when the operation is selected
+            candidates[f"{package}.{attr_name}"] = partial(getattr, module, attr_name)
+
+    errors: Dict[str, str] = {}
+    for package in ["aggregate", "prompt"]:
+        package_module = importlib.import_module(f"datalabs.operations.{package}")
+        for module_info in pkgutil.iter_modules(package_module.__path__):
+            module_name = f"{package_module.__name__}.{module_info.name}"
+            try:
+                module = importlib.import_module(module_name)
+            except Exception as e:
+                errors[f"{package}.{module_info.name}"] = repr(e)
+                continue
+            for attr_name, value in vars(module).items():
+                if (
+                    _is_operation(value)
+                    and getattr(value.func, "__module__", None) == module_name
+                ):
+                    candidates[f"{package}.{module_info.name}.{attr_name}"] = partial(
+                        getattr, module, attr_name
+                    )
+
+    operations = {}
+    for name, get_operation in sorted(candidates.items()):
+        if pattern is not None and not fnmatch(name, pattern):
+            continue
+        try:
+            operation = get_operation()
+        except Exception as e:
+            errors[name] = repr(e)
+            continue
+        if _is_operation(operation):
+            operations[name] = operation
+    return operations, errors
+
+
+def _is_operation(value) -> bool:
+    # not isinstance(value, OperationFunction): some operation modules import
+    # `operation` through a sys.path entry, which makes a second class object
+    return (
+        not isinstance(value, type)
+        and hasattr(value, "_type")
+        and callable(getattr(value, "func", None))
+    )
+
+
+def _timed(function: Callable[[], Any], repeat: int) -> Tuple[List[float], Any]:
+    times, result = [], None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = function()
+        times.append(time.perf_counter() - start)
+    return times, result
+
+
+def _record(suite, name, corpus, num_rows, num_proc, times=None, **fields) -> dict:
+    wall_time = min(times) if times else None
+    return {
+        "suite": suite,
+        "name": name,
+        "corpus": corpus,
+        "num_rows": num_rows,
+        "num_proc": num_proc,
+        "wall_time": wall_time,
+        "rows_per_second": num_rows / wall_time if wall_time else None,
+        "times": times,
+        "error": None,
+        **fields,
+    }
+
+
+def _run(
+    suite, name, corpus, num_rows, num_proc, function, repeat, get_fields=None
+) -> dict:
+    try:
+        times, result = _timed(function, repeat)
+        fields = get_fields(result) if get_fields is not None else {}
+    except Exception as e:
+        logger.debug(traceback.format_exc())
+        return _record(suite, name, corpus, num_rows, num_proc, error=repr(e))
+    return _record(suite, name, corpus, num_rows, num_proc, times, **fields)
+
+
+def bench_import(repeat: int = 1) -> Iterator[dict]:
+    """Time ``import datalabs`` in a fresh interpreter."""
+    code = (
+        "import time; start = time.perf_counter(); import datalabs; "
+        "print(time.perf_counter() - start)"
+    )
+    times = []
+    try:
+        for _ in range(repeat):
+            output = subprocess.check_output([sys.executable, "-c", code], text=True)
+            times.append(float(output.strip().splitlines()[-1]))
+    except (subprocess.CalledProcessError, ValueError) as e:
+        yield _record("import", "import datalabs", None, 0, 1, error=repr(e))
+        return
+    yield _record("import", "import datalabs", None, 0, 1, times)
+
+
+def bench_dataset(
+    corpus: Dict[str, List], corpus_name: str, repeat: int = 1
+) -> Iterator[dict]:
+    """Time the core ``Dataset`` code paths."""
+    from datalabs import Dataset, load_dataset, load_from_disk
+
+    dataset = Dataset.from_dict(corpus)
+    num_rows = dataset.num_rows
+
+    def iterate():
+        for _ in dataset:
+            pass
+
+    def map_batched():
+        return dataset.map(
+            lambda batch: {"length": [len(text) for text in batch["text"]]},
+            batched=True,
+        )
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        saved_path = os.path.join(tmp_dir, "saved")
+        json_path = os.path.join(tmp_dir, "corpus.jsonl")
+        csv_path = os.path.join(tmp_dir, "corpus.csv")
+
+        def packaged(builder, path):
+            def load():
+                cache_dir = tempfile.mkdtemp(dir=tmp_dir)
+                load_dataset(
+                    builder, data_files=path, split="train", cache_dir=cache_dir
+                )
+
+            return load
+
+        benchmarks = [
+            ("__iter__", iterate),
+            ("select", lambda: dataset.select(range(0, num_rows, 2))),
+            ("filter", lambda: dataset.filter(lambda x: len(x["text"]) > 100)),
+            ("map", lambda: dataset.map(lambda x: {"length": len(x["text"])})),
+            ("map_batched", map_batched),
+            ("save_to_disk", lambda: dataset.save_to_disk(saved_path)),
+            ("load_from_disk", lambda: load_from_disk(saved_path)),
+            ("to_json", lambda: dataset.to_json(json_path)),
+            ("load_dataset_json", packaged("json", json_path)),
+            ("to_csv", lambda: dataset.to_csv(csv_path, index=False)),
+            ("load_dataset_csv", packaged("csv", csv_path)),
+        ]
+        for name, function in benchmarks:
+            yield _run("dataset", name, corpus_name, num_rows, 1, function, repeat)
+
+
+def bench_operations(
+    operations: Dict[str, Any],
+    corpus: Dict[str, List],
+    corpus_name: str,
+    num_procs: Sequence[int] = (1,),
+    repeat: int = 1,
+) -> Iterator[dict]:
+    """Time ``Dataset.apply`` of each operation, in memory mode for the
+    per-sample operations."""
+    dataset = make_dataset(corpus)
+
+    def get_fields(result):
+        return {"phases": result._stat[PROFILE_STAT_KEY][-1]["phases"]}
+
+    for name, operation in operations.items():
+        for num_proc in num_procs:
+            yield _run(
+                "operations",
+                name,
+                corpus_name,
+                dataset.num_rows,
+                num_proc,
+                partial(
+                    dataset.apply,
+                    operation,
+                    mode="memory",
+                    num_proc=num_proc,
+                    load_from_cache_file=False,
+                    profile=True,
+                ),
+                repeat,
+                get_fields,
+            )
+
+
+def bench_tokenizers(
+    corpus: Dict[str, List], corpus_name: str, repeat: int = 1
+) -> Iterator[dict]:
+    """Time the registered tokenizers on the ``text`` column."""
+    from datalabs.operations.tokenizer import token_cache, tokenizer_registry
+
+    texts = corpus["text"]
+    for name, tokenizer_cls in sorted(tokenizer_registry.items()):
+
+        def tokenize(tokenizer_cls=tokenizer_cls):
+            # each run tokenizes the texts, rather than reading cached tokens
+            token_cache.clear()
+            tokenizer = tokenizer_cls()
+            for text in texts:
+                tokenizer(text)
+
+        yield _run("tokenizers", name, corpus_name, len(texts), 1, tokenize, repeat)
+
+
+def environment() -> Dict[str, Any]:
+    from datalabs import __version__
+
+    return {
+        "datalabs_version": __version__,
+        "python_version": platform.python_version(),
+        "pyarrow_version": pa.__version__,
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "timestamp": time.time(),
+    }
+
+
+def run_benchmarks(
+    suites: Sequence[str] = SUITES,
+    sizes: Sequence[int] = (100, 1000),
+    num_procs: Sequence[int] = (1,),
+    corpus_path: Optional[str] = None,
+    pattern: Optional[str] = None,
+    repeat: int = 1,
+    callback: Optional[Callable[[dict], None]] = None,
+) -> Dict[str, Any]:
+    """Run the benchmark suites.
+
+    Args:
+        suites (`Sequence[str]`): subset of :data:`SUITES`.
+        sizes (`Sequence[int]`): numbers of rows of the corpora.
+        num_procs (`Sequence[int]`): numbers of processes the operations are
+            run with.
+        corpus_path (`Optional[str]`): fixture corpus (json or csv), repeated or
+            truncated to each size. A synthetic corpus is used if `None`.
+        pattern (`Optional[str]`): glob on the operation names, e.g.
+            `"featurize.*"`.
+        repeat (`int`): number of runs of each benchmark, the best is kept.
+        callback (`Optional[Callable]`): called with each record as it's made.
+
+    Returns:
+        `dict` with the ``environment`` and the ``results`` records.
+    """
+    from datalabs.utils import is_progress_bar_enabled, set_progress_bar_enabled
+
+    unknown = set(suites) - set(SUITES)
+    if unknown:
+        raise ValueError(f"Unknown benchmark suites {sorted(unknown)}, use {SUITES}")
+
+    results = []
+
+    def add(record):
+        results.append(record)
+        if callback is not None:
+            callback(record)
+
+    progress_bar_enabled = is_progress_bar_enabled()
+    set_progress_bar_enabled(False)
+    try:
+        if "import" in suites:
+            for record in bench_import(repeat):
+                add(record)
+
+        operations = {}
+        if "operations" in suites:
+            operations, errors = collect_operations(pattern)
+            for name, error in errors.items():
+                add(_record("operations", name, None, 0, 1, error=error))
+
+        if corpus_path is None:
+            base_corpus, corpus_name = None, "synthetic"
+        else:
+            base_corpus, corpus_name = load_corpus(corpus_path), corpus_path
+
+        for size in sizes:
+            if base_corpus is None:
+                corpus = synthetic_corpus(size)
+            else:
+                corpus = resize_corpus(base_corpus, size)
+            if "dataset" in suites:
+                for record in bench_dataset(corpus, corpus_name, repeat):
+                    add(record)
+            if "operations" in suites:
+                for record in bench_operations(
+                    operations, corpus, corpus_name, num_procs, repeat
+                ):
+                    add(record)
+            if "tokenizers" in suites:
+                for record in bench_tokenizers(corpus, corpus_name, repeat):
+                    add(record)
+    finally:
+        set_progress_bar_enabled(progress_bar_enabled)
+
+    return {"environment": environment(), "results": results}
+
+
+def write_results(results: Dict[str, Any], path: str):
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(results, f, indent=2)
@@ -0,0 +1,166 @@
+"""Lexical diversity of batches of tokenized texts, computed with NumPy.
+
+The measures of ``lexicalrichness.LexicalRichness`` (type-token ratio, root
+TTR, MTLD and HD-D), computed for a whole batch of token lists at once (e.g.
+the output of :func:`datalabs.utils.lexicon.tokenize_lexical_richness`)::
+
+    tokens = tokenize_lexical_richness(texts)
+    mtld(tokens)  # one value per text
+
+Tokens are mapped to integer ids, so that the frequency of each type in each
+text is given by ``np.unique``. The measures of empty texts are 0.
+"""
+from typing import Tuple, Union
+
+import numpy as np
+import pyarrow as pa
+import pyarrow.compute as pc
+
+Tokens = Union[pa.ListArray, pa.ChunkedArray, list]
+
+
+def _as_list_array(tokens: Tokens) -> pa.ListArray:
+    if isinstance(tokens, pa.ChunkedArray):
+        return tokens.combine_chunks()
+    if not isinstance(tokens, pa.Array):
+        return pa.array(tokens, type=pa.list_(pa.string()))
+    return tokens
+
+
+def token_ids(tokens: Tokens) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """The tokens of a batch as integer ids.
+
+    Returns:
+        ``(ids, parents, n_tokens)``: the id of each token (ids are shared by the
+        texts of the batch), the index of its text, and the number of tokens of
+        each text.
+    """
+    tokens = _as_list_array(tokens)
+    encoded = pc.dictionary_encode(tokens.flatten())
+    ids = encoded.indices.to_numpy(zero_copy_only=False).astype(np.int64)
+    parents = pc.list_parent_indices(tokens).to_numpy().astype(np.int64)
+    return ids, parents, np.bincount(parents, minlength=len(tokens))
+
+
+def _type_frequencies(
+    ids: np.ndarray, parents: np.ndarray
+) -> Tuple[np.ndarray, np.ndarray]:
+    n_ids = int(ids.max()) + 1 if len(ids) > 0 else 1
+    keys, frequencies = np.unique(parents * n_ids + ids, return_counts=True)
+    return keys // n_ids, frequencies
+
+
+def type_frequencies(tokens: Tokens) -> Tuple[np.ndarray, np.ndarray]:
+    """The frequency of each type of each text, as ``(texts, frequencies)``:
+    the index of the text of each (text, type) pair and its number of tokens."""
+    ids, parents, _ = token_ids(tokens)
+    return _type_frequencies(ids, parents)
+
+
+def _n_types(tokens: Tokens) -> Tuple[np.ndarray, np.ndarray]:
+    ids, parents, n_tokens = token_ids(tokens)
+    texts, _ = _type_frequencies(ids, parents)
+    return np.bincount(texts, minlength=len(n_tokens)), n_tokens
+
+
+def ttr(tokens: Tokens) -> np.ndarray:
+    """Type-token ratio: number of types / number of tokens."""
+    n_types, n_tokens = _n_types(tokens)
+    return np.divide(n_types, n_tokens, out=np.zeros(len(n_tokens)), where=n_tokens > 0)
+
+
+def root_ttr(tokens: Tokens) -> np.ndarray:
+    """Root TTR (Guiraud's index): number of types / sqrt(number of tokens)."""
+    n_types, n_tokens = _n_types(tokens)
+    return np.divide(
+        n_types, np.sqrt(n_tokens), out=np.zeros(len(n_tokens)), where=n_tokens > 0
+    )
+
+
+def _previous_occurrences(ids: np.ndarray, parents: np.ndarray) -> np.ndarray:
+    # index of the previous occurrence of each token in its text, -1 for first
+    # occurrences
+    order = np.lexsort((np.arange(len(ids)), ids, parents))
+    same = np.zeros(len(ids), dtype=bool)
+    same[1:] = (ids[order][1:] == ids[order][:-1]) & (
+        parents[order][1:] == parents[order][:-1]
+    )
+    previous = np.full(len(ids), -1, dtype=np.int64)
+    previous[order[1:][same[1:]]] = order[:-1][same[1:]]
+    return previous
+
+
+def _sub_mtld(
+    ids: np.ndarray, parents: np.ndarray, n_tokens: np.ndarray, threshold: float
+) -> np.ndarray:
+    # forward MTLD of each text, the texts are processed position by position
+    n_texts = len(n_tokens)
+    starts = np.zeros(n_texts + 1, dtype=np.int64)
+    np.cumsum(n_tokens, out=starts[1:])
+    previous = _previous_occurrences(ids, parents)
+
+    segment_start = starts[:-1].copy()
+    n_terms = np.zeros(n_texts, dtype=np.int64)
+    word_counter = np.zeros(n_texts, dtype=np.int64)
+    factor_count = np.zeros(n_texts)
+    last_ttr = np.ones(n_texts)
+    for position in range(int(n_tokens.max()) if n_texts > 0 else 0):
+        active = np.nonzero(n_tokens > position)[0]
+        index = starts[active] + position
+        word_counter[active] += 1
+        # a type is new in the segment if it didn't occur since its start
+        n_terms[active] += previous[index] < segment_start[active]
+        ttr = n_terms[active] / word_counter[active]
+        last_ttr[active] = ttr
+        ended = active[ttr <= threshold]
+        factor_count[ended] += 1
+        word_counter[ended] = 0
+        n_terms[ended] = 0
+        segment_start[ended] = starts[ended] + position + 1
+
+    # partial factor for the last segment
+    partial = word_counter > 0
+    factor_count[partial] += (1 - last_ttr[partial]) / (1 - threshold)
+
+    # TTR never drops below the threshold (i.e. all tokens are distinct)
+    factor_count[factor_count == 0] = 1
+    return np.divide(n_tokens, factor_count, out=np.zeros(n_texts), where=n_tokens > 0)
+
+
+def mtld(tokens: Tokens, threshold: float = 0.72) -> np.ndarray:
+    """Measure of textual lexical diversity (McCarthy and Jarvis, 2010): the
+    mean length of the segments of a text keeping a TTR above ``threshold``,
+    averaged over the text read forward and backward."""
+    ids, parents, n_tokens = token_ids(tokens)
+    forward = _sub_mtld(ids, parents, n_tokens, threshold)
+
+    # the tokens of each text in reverse order
+    starts = np.zeros(len(n_tokens) + 1, dtype=np.int64)
+    np.cumsum(n_tokens, out=starts[1:])
+    reverse = (starts[parents] + starts[parents + 1] - 1) - np.arange(len(ids))
+    backward = _sub_mtld(ids[reverse], parents, n_tokens, threshold)
+    return (forward + backward) / 2
+
+
+def hdd(tokens: Tokens, draws: int = 42) -> np.ndarray:
+    """Hypergeometric distribution diversity (McCarthy and Jarvis, 2007): the
+    sum over the types of a text of the probability to draw it at least once
+    in ``draws`` tokens, divided by ``draws``. NaN for texts with fewer than
+    ``draws`` tokens."""
+    if draws < 1:
+        raise ValueError(f"Number of draws must be a positive integer, got {draws}")
+    ids, parents, n_tokens = token_ids(tokens)
+    texts, frequencies = _type_frequencies(ids, parents)
+
+    # P(0 occurrence in the draws) = C(N - K, n) / C(N, n)
+    #                              = prod_i (N - K - i) / (N - i)
+    drawn = n_tokens[texts] >= draws
+    texts, frequencies = texts[drawn], frequencies[drawn]
+    totals = n_tokens[texts][:, None]
+    steps = np.arange(draws)
+    absent = np.clip(totals - frequencies[:, None] - steps, 0, None) / (totals - steps)
+    contributions = (1 - np.prod(absent, axis=1)) / draws
+
+    scores = np.bincount(texts, weights=contributions, minlength=len(n_tokens))
+    scores[n_tokens < draws] = np.nan
+    return scores
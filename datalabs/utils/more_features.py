@@ -1,6 +1,14 @@
 from datalabs.features.features import Features, Value
 
 
+def sample_level_feature(dtype: str) -> Value:
+    """Feature of a value computed for each sample, as declared in the ``outputs``
+    of the operations (and inferred by `get_feature_arguments`)."""
+    return Value(
+        dtype=dtype, is_bucket=True, feature_level="sample_level", raw_feature=False
+    )
+
+
 def get_feature_schemas(features_sample, get_schema_of_sample_level_features):
     features_dataset = {}
 
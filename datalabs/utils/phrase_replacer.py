@@ -0,0 +1,164 @@
+"""Replacement of the phrases of a dictionary in texts, in one pass.
+
+A :class:`PhraseReplacer` compiles the phrases of a dictionary into a trie,
+itself compiled into a regular expression in which the phrases sharing a
+prefix share their branch. Scanning a text then costs at most the depth of the
+trie per position, whatever the size of the dictionary, and the replacements
+are made from left to right in one pass, the longest phrase winning at each
+position::
+
+    replacer = get_phrase_replacer(acronyms)  # compiled once per dictionary
+    replacer.replace("the National Aeronautics and Space Administration")
+
+Replaced text isn't scanned again, so the replacement of a phrase never
+triggers the replacement of another one.
+"""
+from collections import OrderedDict
+import re
+from typing import Callable, Container, Dict, Iterable, Mapping, Optional, Tuple
+
+# key of the trie nodes ending a phrase
+_TERMINAL = ""
+
+
+def _trie(phrases: Iterable[str]) -> dict:
+    root = {}
+    for phrase in phrases:
+        node = root
+        for char in phrase:
+            node = node.setdefault(char, {})
+        node[_TERMINAL] = {}
+    return root
+
+
+def _trie_pattern(node: dict) -> str:
+    # the phrases of a subtree, greedy so that longer phrases are tried first
+    # (and the shorter ones only when they don't match)
+    branches = [
+        re.escape(char) + _trie_pattern(child)
+        for char, child in sorted(node.items())
+        if char != _TERMINAL
+    ]
+    if len(branches) == 0:
+        return ""
+    pattern = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+    if _TERMINAL in node:
+        return "(?:" + pattern + ")?"
+    return pattern
+
+
+class PhraseReplacer:
+    """The phrases of a dictionary compiled for replacements in one pass.
+
+    Args:
+        mapping (`Mapping[str, str]`): phrases and their replacements, matched
+            anywhere in the texts (not only on word boundaries).
+        ignore_case (`bool`, default `False`): match the phrases whatever
+            their case. Phrases differing only by their case are replaced by
+            the replacement of the first of them.
+    """
+
+    def __init__(self, mapping: Mapping[str, str], ignore_case: bool = False):
+        self.ignore_case = ignore_case
+        self.mapping: Dict[str, str] = {}
+        for phrase, replacement in mapping.items():
+            key = phrase.lower() if ignore_case else phrase
+            if len(key) > 0:
+                self.mapping.setdefault(key, replacement)
+        flags = re.IGNORECASE if ignore_case else 0
+        pattern = _trie_pattern(_trie(self.mapping))
+        # `(?!)` never matches: empty dictionary
+        self.regex = re.compile(pattern if pattern else "(?!)", flags)
+        self._prefixes: Dict[str, Tuple[str, ...]] = {}
+
+    def _key(self, phrase: str) -> str:
+        return phrase.lower() if self.ignore_case else phrase
+
+    def replace(self, text: str, replacement: Optional[Callable] = None) -> str:
+        """Replace the phrases found in ``text``, the longest phrase at each
+        position. ``replacement(phrase)`` (the phrase as a key of the mapping)
+        overrides the replacements of the mapping."""
+        mapping = self.mapping
+        key = self._key
+
+        def replace_match(match):
+            phrase = key(match.group())
+            if phrase not in mapping:
+                # case-insensitive matches whose lower case differs
+                return match.group()
+            if replacement is None:
+                return mapping[phrase]
+            return replacement(phrase)
+
+        return self.regex.sub(replace_match, text)
+
+    def prefixes(self, phrase: str) -> Tuple[str, ...]:
+        """The phrases that are prefixes of ``phrase`` (itself included),
+        longest first."""
+        if phrase not in self._prefixes:
+            self._prefixes[phrase] = tuple(
+                phrase[:end]
+                for end in range(len(phrase), 0, -1)
+                if phrase[:end] in self.mapping
+            )
+        return self._prefixes[phrase]
+
+    def replace_selected(
+        self,
+        text: str,
+        selected: Container[str],
+        replacement: Optional[Callable] = None,
+    ) -> str:
+        """Replace the ``selected`` phrases of the mapping found in ``text``
+        (as keys of the mapping), in one pass, the longest selected phrase at
+        each position."""
+        mapping = self.mapping
+        parts = []
+        start = 0
+        search = self.regex.search
+        match = search(text)
+        while match is not None:
+            position = match.start()
+            # the phrases matching at this position are the prefixes of the
+            # longest one
+            found = self._key(match.group())
+            candidates = self.prefixes(found) if found in mapping else ()
+            phrase = next((p for p in candidates if p in selected), None)
+            if phrase is None:
+                # a selected phrase may start inside the match
+                match = search(text, position + 1)
+                continue
+            parts.append(text[start:position])
+            parts.append(
+                mapping[phrase] if replacement is None else replacement(phrase)
+            )
+            start = position + len(phrase)
+            match = search(text, start)
+        parts.append(text[start:])
+        return "".join(parts)
+
+
+# number of compiled replacers kept by `get_phrase_replacer`
+MAX_CACHED_REPLACERS = 32
+
+# least recently used compiled replacers of the dictionaries (typically the
+# resources of `datalabs.operations.resources`), the dictionaries are kept
+# alive with them so that their ids aren't reused
+_replacers: "OrderedDict[Tuple[int, bool], Tuple[Mapping[str, str], PhraseReplacer]]"
+_replacers = OrderedDict()
+
+
+def get_phrase_replacer(
+    mapping: Mapping[str, str], ignore_case: bool = False
+) -> PhraseReplacer:
+    """The :class:`PhraseReplacer` of ``mapping``, compiled once per dictionary
+    object (dictionaries mustn't be modified once compiled). The
+    ``MAX_CACHED_REPLACERS`` most recently used replacers are kept."""
+    key = (id(mapping), ignore_case)
+    if key in _replacers:
+        _replacers.move_to_end(key)
+    else:
+        _replacers[key] = (mapping, PhraseReplacer(mapping, ignore_case))
+        while len(_replacers) > MAX_CACHED_REPLACERS:
+            _replacers.popitem(last=False)
+    return _replacers[key][1]
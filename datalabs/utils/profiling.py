@@ -0,0 +1,182 @@
+# Lint as: python3
+"""Profiling of the operations applied to a dataset.
+
+``Dataset.apply``, ``Dataset.apply_pipeline`` and ``Dataset.map`` take a
+``profile`` argument. When it's set, the call runs under an
+:class:`OperationProfiler` and its record is appended to the ``_stat`` of the
+resulting dataset, under :data:`PROFILE_STAT_KEY`. A record holds:
+
+- ``wall_time`` and ``rows_per_second`` of the whole call,
+- ``phases``: seconds spent reading and decoding the table (``decode``),
+  running the operation (``operation``), converting its outputs to Arrow and
+  writing them (``convert``) and adding the columns to the dataset
+  (``attach``),
+- ``peak_rss_bytes``: high-water mark of the resident memory of the process,
+- ``arrow_allocated_bytes_delta`` and ``arrow_peak_allocated_bytes_delta``:
+  growth of the memory allocated by Arrow (``pyarrow.total_allocated_bytes``).
+
+The code paths mark their phases with :func:`profile_phase` and
+:func:`profile_iter`, which do nothing when no profiler is running. With
+``num_proc > 1``, the ``operation`` phase is the time spent waiting for the
+worker processes.
+"""
+import json
+import sys
+import threading
+import time
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+import pyarrow as pa
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+PROFILE_STAT_KEY = "__profile__"
+PHASES = ("decode", "operation", "convert", "attach")
+
+_active_profiler: Optional["OperationProfiler"] = None
+
+
+def _peak_rss_bytes() -> Optional[int]:
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # kilobytes on Linux, bytes on macOS
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+class _NullPhase:
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NULL_PHASE = _NullPhase()
+
+
+class _Phase:
+    def __init__(self, profiler: "OperationProfiler", name: str):
+        self.profiler = profiler
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.profiler.add(self.name, time.perf_counter() - self.start)
+        return False
+
+
+class OperationProfiler:
+    """Record the time and memory used by one operation call.
+
+    Args:
+        operation (`str`): name of the operation.
+        **attributes: other fields of the record (method, mode, num_proc...).
+
+    The profiler can be entered several times, e.g. around each step of a lazy
+    generator; the times add up.
+
+    Usage::
+
+        with OperationProfiler("get_length", method="apply") as profiler:
+            ...
+        record = profiler.record(num_rows=len(dataset))
+    """
+
+    def __init__(self, operation: str, **attributes):
+        self.operation = operation
+        self.attributes = attributes
+        self.phases = {phase: 0.0 for phase in PHASES}
+        self._lock = threading.Lock()
+        self._previous = None
+        self._start_time = None
+        self.wall_time = None
+
+    def __enter__(self):
+        global _active_profiler
+        self._previous = _active_profiler
+        _active_profiler = self
+        if self._start_time is None:
+            self._start_time = time.time()
+            self._arrow_start = self._arrow_peak = pa.total_allocated_bytes()
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        global _active_profiler
+        self.wall_time = (self.wall_time or 0.0) + time.perf_counter() - self._start
+        self._arrow_end = pa.total_allocated_bytes()
+        self._arrow_peak = max(self._arrow_peak, self._arrow_end)
+        self._peak_rss = _peak_rss_bytes()
+        _active_profiler = self._previous
+        return False
+
+    def add(self, phase: str, seconds: float):
+        """Add ``seconds`` to the time spent in ``phase``."""
+        allocated = pa.total_allocated_bytes()
+        # the table may be decoded in the task feeder thread of a worker pool
+        with self._lock:
+            self.phases[phase] = self.phases.get(phase, 0.0) + seconds
+            self._arrow_peak = max(self._arrow_peak, allocated)
+
+    def iter_phase(self, phase: str, iterable: Iterable) -> Iterator:
+        """Iterate over ``iterable``, counting the time spent producing each
+        item in ``phase``."""
+        iterator = iter(iterable)
+        while True:
+            start = time.perf_counter()
+            try:
+                item = next(iterator)
+            except StopIteration:
+                self.add(phase, time.perf_counter() - start)
+                return
+            self.add(phase, time.perf_counter() - start)
+            yield item
+
+    def record(self, num_rows: int) -> Dict[str, Any]:
+        """The JSON-serializable record of the profiled call."""
+        if self.wall_time is None:
+            raise ValueError("The profiler hasn't run yet.")
+        return {
+            "operation": self.operation,
+            **self.attributes,
+            "timestamp": self._start_time,
+            "num_rows": num_rows,
+            "wall_time": self.wall_time,
+            "rows_per_second": num_rows / self.wall_time if self.wall_time else None,
+            "phases": dict(self.phases),
+            "peak_rss_bytes": self._peak_rss,
+            "arrow_allocated_bytes_delta": self._arrow_end - self._arrow_start,
+            "arrow_peak_allocated_bytes_delta": self._arrow_peak - self._arrow_start,
+        }
+
+
+def profile_phase(phase: str):
+    """Context manager counting the time spent in its block in ``phase`` of the
+    running profiler, if any."""
+    if _active_profiler is None:
+        return _NULL_PHASE
+    return _Phase(_active_profiler, phase)
+
+
+def profile_iter(phase: str, iterable: Iterable) -> Iterable:
+    """Count the time spent producing the items of ``iterable`` in ``phase`` of
+    the running profiler, if any. The profiler is bound when this is called, so
+    the iterable can be consumed later."""
+    if _active_profiler is None:
+        return iterable
+    return _active_profiler.iter_phase(phase, iterable)
+
+
+def write_profile_records(records: List[Dict[str, Any]], path: str) -> int:
+    """Write profile records to ``path`` as JSON lines, return their number."""
+    with open(path, "w", encoding="utf-8") as f:
+        for record in records:
+            f.write(json.dumps(record) + "\n")
+    return len(records)
@@ -518,6 +518,21 @@ class _CloudPickleTypeHintFix:
         )
 
 
+# module attributes of dill._dill removed in dill 0.3.5
+_DILL_PY3 = getattr(dill._dill, "PY3", True)
+_DILL_OLDER = getattr(dill._dill, "OLDER", False)
+
+
+def _dill_stack(pickler) -> dict:
+    """The functions being pickled: a global of older dill versions, kept on
+    the pickler otherwise."""
+    if hasattr(dill._dill, "stack"):
+        return dill._dill.stack
+    if not hasattr(pickler, "_function_stack"):
+        pickler._function_stack = {}
+    return pickler._function_stack
+
+
 @pklregister(CodeType)
 def _save_code(pickler, obj):
     """
@@ -547,7 +562,7 @@ def _save_code(pickler, obj):
     )
     co_firstlineno = 1
     # The rest is the same as in the original dill implementation
-    if dill._dill.PY3:
+    if _DILL_PY3:
         if hasattr(obj, "co_posonlyargcount"):
             args = (
                 obj.co_argcount,
@@ -607,6 +622,20 @@ def _save_code(pickler, obj):
     return
 
 
+@pklregister(set)
+def _save_set(pickler, obj):
+    """Sets are pickled sorted (if their items can be), so that their pickle and
+    their hash don't depend on the order of iteration, i.e. on the hash seed."""
+    try:
+        items = sorted(obj)
+    except TypeError:
+        items = list(obj)
+    pickler.save_reduce(type(obj), (items,), obj=obj)
+
+
+pklregister(frozenset)(_save_set)
+
+
 @pklregister(FunctionType)
 def save_function(pickler, obj):
     """
@@ -616,14 +645,15 @@ def save_function(pickler, obj):
     """
     if not dill._dill._locate_function(obj):
         dill._dill.log.info(f"F1: {obj}")
+        stack = _dill_stack(pickler)
         if getattr(pickler, "_recurse", False):
             # recurse to get all globals referred to by obj
             globalvars = dill.detect.globalvars
             globs = globalvars(obj, recurse=True, builtin=True)
-            if id(obj) in dill._dill.stack:
-                globs = obj.__globals__ if dill._dill.PY3 else obj.func_globals
+            if id(obj) in stack:
+                globs = obj.__globals__ if _DILL_PY3 else obj.func_globals
         else:
-            globs = obj.__globals__ if dill._dill.PY3 else obj.func_globals
+            globs = obj.__globals__ if _DILL_PY3 else obj.func_globals
         # globs is a dictionary with keys = var names (str) and values = python objects
         # however the dictionary is not always loaded in the same order
         # therefore we have to sort the keys to make deterministic.
@@ -633,9 +663,9 @@ def save_function(pickler, obj):
         # The rest is the same as in the original dill implementation
         _byref = getattr(pickler, "_byref", None)
         _recurse = getattr(pickler, "_recurse", None)
-        _memo = (id(obj) in dill._dill.stack) and (_recurse is not None)
-        dill._dill.stack[id(obj)] = len(dill._dill.stack), obj
-        if dill._dill.PY3:
+        _memo = (id(obj) in stack) and (_recurse is not None)
+        stack[id(obj)] = len(stack), obj
+        if _DILL_PY3:
             _super = ("super" in getattr(obj.__code__, "co_names", ())) and (
                 _byref is not None
             )
@@ -684,7 +714,7 @@ def save_function(pickler, obj):
         if _memo:
             pickler._recurse = _recurse
         if (
-            dill._dill.OLDER
+            _DILL_OLDER
             and not _byref
             and (
                 _super
@@ -1,18 +1,31 @@
-from typing import Dict
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple, TYPE_CHECKING
 
-import spacy
-from spacy.language import Language
+if TYPE_CHECKING:
+    from spacy.language import Language
+    from spacy.tokens import Doc
+
+DEFAULT_SPACY_MODEL = "en_core_web_sm"
+
+# layers shared by the other pipes of a model, kept whenever one pipe is needed
+EMBEDDING_PIPES = ("tok2vec", "transformer")
 
 
 class SpacyLoader:
     """Loader for spacy models. This should be used in a singleton fashion to
     ensure that we don't load the same spacy model multiple times. It also
     encapsulates `spacy.load()` so we don't load big spacy models unless it's
-    necessary."""
+    necessary.
 
-    _models: Dict[str, Language] = {}
+    The operations backed by spaCy parse their texts with :meth:`parse` or
+    :meth:`pipe`, passing the pipes they read (e.g. ``("ner",)`` for
+    ``doc.ents``) so that the other pipes of the model are skipped. Models are
+    loaded at most once per process.
+    """
 
-    def get_model(self, name: str) -> Language:
+    _models: Dict[str, "Language"] = {}
+    _disabled: Dict[Tuple[str, Optional[Tuple[str, ...]]], List[str]] = {}
+
+    def get_model(self, name: str = DEFAULT_SPACY_MODEL) -> "Language":
         """
         loads a spacy model if it's not in memory and returns it
         Parameter:
@@ -22,9 +35,57 @@ class SpacyLoader:
           - a spacy `Language` object
         """
         if name not in self._models:
+            import spacy
+
             self._models[name] = spacy.load(name)
         return self._models[name]
 
+    def disabled_pipes(
+        self, name: str = DEFAULT_SPACY_MODEL, pipes: Optional[Iterable[str]] = None
+    ) -> List[str]:
+        """Names of the pipes of the model that aren't needed to compute
+        ``pipes`` (all of them are needed if ``pipes`` is None)."""
+        key = (name, None if pipes is None else tuple(sorted(pipes)))
+        if key not in self._disabled:
+            pipe_names = self.get_model(name).pipe_names
+            if pipes is None:
+                disabled = []
+            else:
+                needed = set(pipes)
+                if len(needed) > 0:
+                    needed.update(EMBEDDING_PIPES)
+                disabled = [pipe for pipe in pipe_names if pipe not in needed]
+            self._disabled[key] = disabled
+        return self._disabled[key]
+
+    def parse(
+        self,
+        text: str,
+        pipes: Optional[Iterable[str]] = None,
+        name: str = DEFAULT_SPACY_MODEL,
+    ) -> "Doc":
+        """Parse one text, running only the pipes in ``pipes`` (and the
+        embedding layers they share); an empty ``pipes`` only tokenizes."""
+        return self.get_model(name)(text, disable=self.disabled_pipes(name, pipes))
+
+    def pipe(
+        self,
+        texts: Iterable[str],
+        pipes: Optional[Iterable[str]] = None,
+        name: str = DEFAULT_SPACY_MODEL,
+        batch_size: Optional[int] = None,
+        n_process: int = 1,
+    ) -> Iterator["Doc"]:
+        """Parse texts in batches with ``nlp.pipe``, running only the pipes in
+        ``pipes``. ``n_process > 1`` can't be used inside the worker processes
+        of ``Dataset.apply(num_proc > 1)``."""
+        return self.get_model(name).pipe(
+            texts,
+            disable=self.disabled_pipes(name, pipes),
+            batch_size=batch_size,
+            n_process=n_process,
+        )
+
 
 # singleton spacy loader to keep one copy of each model in memory
 spacy_loader = SpacyLoader()
@@ -0,0 +1,233 @@
+"""Similarity of the two texts of text pairs, computed over batches with NumPy.
+
+Sentence-level BLEU and chrF of ``sacrebleu`` (default settings) and the
+Jaccard and overlap coefficients of the sets of words of the texts, for whole
+columns of text pairs at once::
+
+    scores = pair_similarities(dataset["text1"], dataset["text2"])
+    scores["bleu"]  # sacrebleu.sentence_bleu(text2, [text1]).score of each pair
+
+The tokens (words or characters) of a batch are mapped to integer ids, and the
+n-grams of each order to ids of the (n-1)-gram and next token pairs, so that
+the clipped n-gram matches of all the pairs are counted with ``np.unique``.
+"""
+from typing import Callable, Dict, Sequence, Tuple
+
+import numpy as np
+import pyarrow as pa
+import pyarrow.compute as pc
+
+BLEU_MAX_ORDER = 4
+CHRF_CHAR_ORDER = 6
+CHRF_BETA = 2
+
+
+# `sacrebleu`'s 13a tokenizer (mteval-v13a): replacements of its language
+# independent part, then the regular expressions of its post-tokenizer
+_BLEU_REPLACEMENTS = [("<skipped>", ""), ("-\n", ""), ("\n", " ")]
+_BLEU_ENTITIES = [("&quot;", '"'), ("&amp;", "&"), ("&lt;", "<"), ("&gt;", ">")]
+_BLEU_REGEXES = [
+    (r"([\{-\~\[-\` -\&\(-\+\:-\@\/])", r" \1 "),
+    # tokenize period and comma unless preceded by a digit
+    (r"([^0-9])([\.,])", r"\1 \2 "),
+    # tokenize period and comma unless followed by a digit
+    (r"([\.,])([^0-9])", r" \1 \2"),
+    # tokenize dash when preceded by a digit
+    (r"([0-9])(-)", r"\1 \2 "),
+]
+
+
+def tokenize_bleu(texts: Sequence[str]) -> pa.ListArray:
+    """The words ``sacrebleu.sentence_bleu`` counts the n-grams of, for a batch
+    of texts."""
+    texts = pa.array([f" {text.rstrip()} " for text in texts], type=pa.string())
+    for pattern, replacement in _BLEU_REPLACEMENTS + _BLEU_ENTITIES:
+        texts = pc.replace_substring(texts, pattern, replacement)
+    for pattern, replacement in _BLEU_REGEXES:
+        texts = pc.replace_substring_regex(texts, pattern, replacement)
+    # split as `str.split` does, Arrow's whitespaces are not quite Python's
+    return pa.array(
+        [text.split() for text in texts.to_pylist()], type=pa.list_(pa.string())
+    )
+
+
+def _chars(texts: Sequence[str]) -> pa.ListArray:
+    # the characters chrF counts the n-grams of (whitespaces removed), as code
+    # points
+    texts = ["".join(text.split()) for text in texts]
+    offsets = np.zeros(len(texts) + 1, dtype=np.int32)
+    np.cumsum([len(text) for text in texts], out=offsets[1:])
+    code_points = np.frombuffer("".join(texts).encode("utf-32-le"), dtype=np.uint32)
+    return pa.ListArray.from_arrays(pa.array(offsets), pa.array(code_points))
+
+
+# bound of the keys of the n-grams of the pairs
+_MAX_KEY = 2**62
+
+
+class _Batch:
+    # the tokens of the first texts of the pairs followed by the tokens of the
+    # second texts, as integer ids
+    def __init__(self, tokens: pa.ListArray):
+        self.n_pairs = len(tokens) // 2
+        self.ids = (
+            pc.dictionary_encode(tokens.flatten())
+            .indices.to_numpy(zero_copy_only=False)
+            .astype(np.int64)
+        )
+        self.parents = pc.list_parent_indices(tokens).to_numpy().astype(np.int64)
+        self.lengths = np.bincount(self.parents, minlength=len(tokens))
+        starts = np.zeros(len(tokens), dtype=np.int64)
+        np.cumsum(self.lengths[:-1], out=starts[1:])
+        self.positions = np.arange(len(self.ids)) - starts[self.parents]
+
+    @classmethod
+    def of(cls, texts1: Sequence[str], texts2: Sequence[str], tokenize: Callable):
+        return cls(tokenize(list(texts1) + list(texts2)))
+
+    def ngrams(self, max_order: int):
+        """Yield the n-grams of each order as ``(ids, texts, n_ids)``, ``n_ids``
+        bounding their ids."""
+        n_tokens = int(self.ids.max()) + 1 if len(self.ids) > 0 else 1
+        ids, n_ids = self.ids, n_tokens
+        starts = np.arange(len(self.ids))
+        for n in range(1, max_order + 1):
+            if n > 1:
+                # the ids of n-grams are the base `n_tokens` numbers of their
+                # (n-1)-gram and last token, kept within int64 with the pairs
+                if n_ids * n_tokens * (self.n_pairs + 1) >= _MAX_KEY:
+                    distinct, ids = np.unique(ids, return_inverse=True)
+                    ids, n_ids = ids.ravel(), max(len(distinct), 1)
+                fits = self.positions[starts] + n <= self.lengths[self.parents[starts]]
+                starts = starts[fits]
+                ids = ids[fits] * n_tokens + self.ids[starts + n - 1]
+                n_ids *= n_tokens
+            yield ids, self.parents[starts], n_ids
+
+    def matches(self, max_order: int) -> np.ndarray:
+        """The clipped n-gram matches of each pair, for each order."""
+        matches = np.zeros((self.n_pairs, max_order), dtype=np.int64)
+        for n, (ids, texts, n_ids) in enumerate(self.ngrams(max_order)):
+            first = texts < self.n_pairs
+            keys1, counts1 = np.unique(
+                texts[first] * n_ids + ids[first], return_counts=True
+            )
+            keys2, counts2 = np.unique(
+                (texts[~first] - self.n_pairs) * n_ids + ids[~first],
+                return_counts=True,
+            )
+            index = np.minimum(np.searchsorted(keys1, keys2), max(len(keys1) - 1, 0))
+            common = keys1[index] == keys2 if len(keys1) > 0 else index < 0
+            matches[:, n] = np.bincount(
+                keys2[common] // n_ids,
+                weights=np.minimum(counts1[index[common]], counts2[common]),
+                minlength=self.n_pairs,
+            )
+        return matches
+
+    def totals(self, max_order: int) -> Tuple[np.ndarray, np.ndarray]:
+        """The number of n-grams of each text of the pairs, for each order."""
+        orders = np.arange(max_order)
+        totals = np.maximum(self.lengths[:, None] - orders, 0)
+        return totals[: self.n_pairs], totals[self.n_pairs :]
+
+    def types(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """The number of types of each text of the pairs, and of both texts."""
+        pairs = self.parents % max(self.n_pairs, 1)
+        n_ids = int(self.ids.max()) + 1 if len(self.ids) > 0 else 1
+        texts = np.unique(self.parents * n_ids + self.ids) // n_ids
+        n_types = np.bincount(texts, minlength=2 * self.n_pairs)
+        both = np.unique(pairs * n_ids + self.ids) // n_ids
+        return (
+            n_types[: self.n_pairs],
+            n_types[self.n_pairs :],
+            np.bincount(both, minlength=self.n_pairs),
+        )
+
+
+def _bleu(batch: _Batch) -> np.ndarray:
+    # `sacrebleu.BLEU.compute_bleu` with exp smoothing and effective order,
+    # the second texts are the hypotheses
+    correct = batch.matches(BLEU_MAX_ORDER)
+    _, total = batch.totals(BLEU_MAX_ORDER)
+    ref_len, sys_len = batch.lengths[: batch.n_pairs], batch.lengths[batch.n_pairs :]
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        bp = np.where(
+            sys_len < ref_len,
+            np.where(sys_len > 0, np.exp(1 - ref_len / sys_len), 0.0),
+            1.0,
+        )
+        # orders without matches are smoothed by 1 / 2^k, k-th one of them
+        smooth_mteval = 2.0 ** np.cumsum(correct == 0, axis=1)
+        precisions = np.where(
+            correct == 0, 100.0 / (smooth_mteval * total), 100.0 * correct / total
+        )
+        log_precisions = np.where(total > 0, np.log(precisions), 0.0)
+    eff_order = np.clip(sys_len, 1, BLEU_MAX_ORDER)
+    scores = bp * np.exp(log_precisions.sum(axis=1) / eff_order)
+    return np.where(correct.any(axis=1), scores, 0.0)
+
+
+def _chrf(batch: _Batch) -> np.ndarray:
+    # `sacrebleu.CHRF._compute_f_score` with effective order smoothing, the
+    # second texts are the hypotheses
+    eps = 1e-16
+    n_match = batch.matches(CHRF_CHAR_ORDER)
+    n_ref, n_hyp = batch.totals(CHRF_CHAR_ORDER)
+    factor = CHRF_BETA**2
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        prec = np.where(n_hyp > 0, n_match / n_hyp, eps)
+        rec = np.where(n_ref > 0, n_match / n_ref, eps)
+    effective = (n_hyp > 0) & (n_ref > 0)
+    effective_order = effective.sum(axis=1)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        avg_prec = np.where(effective, prec, 0.0).sum(axis=1) / effective_order
+        avg_rec = np.where(effective, rec, 0.0).sum(axis=1) / effective_order
+        score = (1 + factor) * avg_prec * avg_rec
+        score /= (factor * avg_prec) + avg_rec
+    return np.where((effective_order > 0) & (avg_prec + avg_rec > 0), 100 * score, 0)
+
+
+def _word_overlaps(batch: _Batch) -> Dict[str, np.ndarray]:
+    n_types1, n_types2, n_types = batch.types()
+    n_common = n_types1 + n_types2 - n_types
+    smallest = np.minimum(n_types1, n_types2)
+    return {
+        "jaccard": np.divide(
+            n_common, n_types, out=np.zeros(batch.n_pairs), where=n_types > 0
+        ),
+        "overlap": np.divide(
+            n_common, smallest, out=np.zeros(batch.n_pairs), where=smallest > 0
+        ),
+    }
+
+
+def sentence_bleu(texts1: Sequence[str], texts2: Sequence[str]) -> np.ndarray:
+    """``sacrebleu.sentence_bleu(text2, [text1]).score`` of each pair."""
+    return _bleu(_Batch.of(texts1, texts2, tokenize_bleu))
+
+
+def sentence_chrf(texts1: Sequence[str], texts2: Sequence[str]) -> np.ndarray:
+    """``sacrebleu.sentence_chrf(text2, [text1]).score`` of each pair."""
+    return _chrf(_Batch.of(texts1, texts2, _chars))
+
+
+def word_overlap(texts1: Sequence[str], texts2: Sequence[str]) -> Dict[str, np.ndarray]:
+    """The Jaccard (|A & B| / |A | B|) and overlap (|A & B| / min(|A|, |B|))
+    coefficients of the sets of words (as tokenized by BLEU) of each pair."""
+    return _word_overlaps(_Batch.of(texts1, texts2, tokenize_bleu))
+
+
+def pair_similarities(
+    texts1: Sequence[str], texts2: Sequence[str]
+) -> Dict[str, np.ndarray]:
+    """The BLEU, chrF, Jaccard and overlap similarities of each pair, the
+    texts being tokenized once for BLEU and the word overlaps."""
+    words = _Batch.of(texts1, texts2, tokenize_bleu)
+    return {
+        "bleu": _bleu(words),
+        "chrf": _chrf(_Batch.of(texts1, texts2, _chars)),
+        **_word_overlaps(words),
+    }